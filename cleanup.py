@@ -2,3 +2,4 @@ import os
 
 # Delete output files
 os.system("rm -r test_suite/*/*/output")
+os.system("rm -r microbenchmarks/output")
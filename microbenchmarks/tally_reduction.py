@@ -0,0 +1,200 @@
+import argparse
+import resource
+import time
+import numpy as np
+import yaml
+
+from mpi4py import MPI
+
+
+# ======================================================================================
+# End-of-run tally reduction microbenchmark
+# ======================================================================================
+# Every rank holds a float64 tally of --size elements that is summed to the first rank
+# (or to all ranks), --chunk elements at a time, with one of the operations:
+#
+#   reduce             Reduce into a separate result buffer on the root
+#   reduce_inplace     Reduce with MPI.IN_PLACE on the root (no result buffer)
+#   allreduce          Allreduce into a separate result buffer on every rank
+#   allreduce_inplace  Allreduce with MPI.IN_PLACE
+#   ireduce            In-place Ireduce pipeline, --depth chunks in flight
+#   node_reduce        Sum the ranks of a node through shared memory first, then
+#                      reduce in place across the node leaders
+#
+# Run with, e.g.:
+#
+#   mpiexec -n 4 python tally_reduction.py --size=1e8 --chunk=1e7 --op=reduce_inplace
+#
+# The result buffers of the out-of-place operations are allocated and touched before the
+# timed repetitions, as the tally itself is, so that no operation is charged for its
+# allocation. The wall time (slowest rank) of each repetition and the peak resident
+# memory of the ranks are written to <OUTPUT>.yaml.
+
+OPERATIONS = [
+    "reduce",
+    "reduce_inplace",
+    "allreduce",
+    "allreduce_inplace",
+    "ireduce",
+    "node_reduce",
+]
+
+
+def chunks(N, chunk_size):
+    """Start and end indices of the chunks"""
+    for start in range(0, N, chunk_size):
+        yield start, min(start + chunk_size, N)
+
+
+def reduce(comm, data, chunk_size, buff):
+    """buff: the result buffer on the root (None on the other ranks)"""
+    for start, end in chunks(len(data), chunk_size):
+        recv = buff[start:end] if buff is not None else None
+        comm.Reduce(data[start:end], recv, MPI.SUM, 0)
+
+
+def reduce_inplace(comm, data, chunk_size):
+    for start, end in chunks(len(data), chunk_size):
+        if comm.Get_rank() == 0:
+            comm.Reduce(MPI.IN_PLACE, data[start:end], MPI.SUM, 0)
+        else:
+            comm.Reduce(data[start:end], None, MPI.SUM, 0)
+
+
+def allreduce(comm, data, chunk_size, buff):
+    for start, end in chunks(len(data), chunk_size):
+        comm.Allreduce(data[start:end], buff[start:end], MPI.SUM)
+
+
+def allreduce_inplace(comm, data, chunk_size):
+    for start, end in chunks(len(data), chunk_size):
+        comm.Allreduce(MPI.IN_PLACE, data[start:end], MPI.SUM)
+
+
+def ireduce(comm, data, chunk_size, depth):
+    requests = []
+    for start, end in chunks(len(data), chunk_size):
+        if len(requests) == depth:
+            requests.pop(0).Wait()
+        if comm.Get_rank() == 0:
+            requests.append(comm.Ireduce(MPI.IN_PLACE, data[start:end], MPI.SUM, 0))
+        else:
+            requests.append(comm.Ireduce(data[start:end], None, MPI.SUM, 0))
+    MPI.Request.Waitall(requests)
+
+
+def node_reduce(comm, data, chunk_size, node):
+    """data is this rank's view of the node shared-memory window (see shared_tally)"""
+    node_comm, leader_comm, segments = node
+    node_rank = node_comm.Get_rank()
+    node_size = node_comm.Get_size()
+
+    # Each rank of the node sums a slice of all the node tallies into the leader's
+    node_comm.Barrier()
+    N = len(data)
+    start = N * node_rank // node_size
+    end = N * (node_rank + 1) // node_size
+    for segment in segments[1:]:
+        segments[0][start:end] += segment[start:end]
+    node_comm.Barrier()
+
+    # Node leaders reduce across the nodes
+    if leader_comm != MPI.COMM_NULL:
+        reduce_inplace(leader_comm, data, chunk_size)
+
+
+def shared_tally(comm, N):
+    """Tallies of the ranks of a node, allocated contiguously in node shared memory"""
+    node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED)
+    node_rank = node_comm.Get_rank()
+    leader_comm = comm.Split(0 if node_rank == 0 else MPI.UNDEFINED, comm.Get_rank())
+
+    itemsize = MPI.DOUBLE.Get_size()
+    window = MPI.Win.Allocate_shared(N * itemsize, itemsize, comm=node_comm)
+    segments = []
+    for i in range(node_comm.Get_size()):
+        buffer, _ = window.Shared_query(i)
+        segments.append(np.ndarray(buffer=buffer, dtype=np.float64, shape=(N,)))
+    return window, (node_comm, leader_comm, segments), segments[node_rank]
+
+
+# ======================================================================================
+# Main
+# ======================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MPI tally-reduction microbenchmark")
+    parser.add_argument("--size", type=float, default=1e8, help="tally elements per rank")
+    parser.add_argument("--chunk", type=float, default=1e7, help="elements per message")
+    parser.add_argument("--op", type=str, default="reduce", choices=OPERATIONS)
+    parser.add_argument("--depth", type=int, default=4, help="ireduce chunks in flight")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=str, default="output")
+    args = parser.parse_args()
+
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    N = int(args.size)
+    chunk_size = int(args.chunk)
+
+    # The tally (touched, so that it is resident)
+    window = None
+    if args.op == "node_reduce":
+        window, node, data = shared_tally(comm, N)
+    else:
+        data = np.empty(N, dtype=np.float64)
+
+    # The result buffer of the out-of-place operations (touched, too)
+    buff = None
+    if args.op == "allreduce" or (args.op == "reduce" and rank == 0):
+        buff = np.zeros(N, dtype=np.float64)
+
+    # Run
+    times = []
+    for i in range(args.repeat):
+        data[:] = 1.0
+        comm.Barrier()
+        time_start = time.perf_counter()
+        if args.op == "reduce":
+            reduce(comm, data, chunk_size, buff)
+        elif args.op == "reduce_inplace":
+            reduce_inplace(comm, data, chunk_size)
+        elif args.op == "allreduce":
+            allreduce(comm, data, chunk_size, buff)
+        elif args.op == "allreduce_inplace":
+            allreduce_inplace(comm, data, chunk_size)
+        elif args.op == "ireduce":
+            ireduce(comm, data, chunk_size, args.depth)
+        elif args.op == "node_reduce":
+            node_reduce(comm, data, chunk_size, node)
+        times.append(comm.allreduce(time.perf_counter() - time_start, op=MPI.MAX))
+
+    # Check the result on the root (in the result buffer of the out-of-place operations)
+    if rank == 0:
+        result = buff if buff is not None else data
+        assert result[0] == comm.Get_size() and result[-1] == comm.Get_size()
+
+    # Record
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    memories = comm.gather(memory, root=0)
+    N_node = len(set(comm.gather(MPI.Get_processor_name(), root=0) or []))
+    if window is not None:
+        window.Free()
+    if rank > 0:
+        exit()
+
+    record = {}
+    record["op"] = args.op
+    record["size"] = N
+    record["chunk"] = chunk_size
+    record["N_rank"] = comm.Get_size()
+    record["N_node"] = N_node
+    if args.op == "ireduce":
+        record["depth"] = args.depth
+    record["time"] = times
+    record["time_min"] = min(times)
+    record["bandwidth"] = N * 8 / min(times) / 1e9  # GB/s of tally per rank
+    record["peak_memory"] = max(memories)
+    record["peak_memory_total"] = sum(memories)
+    with open("%s.yaml" % args.output, "w") as f:
+        yaml.dump(record, f)
@@ -0,0 +1,191 @@
+import argparse
+import glob
+import h5py
+import importlib.metadata
+import numpy as np
+import os
+import yaml
+
+from suite.platforms import platforms, hybrid, hybrid_tag, load as load_platform
+from suite.tasks import methods, variants, variant_tag, input_variant
+from suite.scaling import fit, predict
+from suite.timing import outliers
+from suite.noise import update, load as load_noisy_nodes
+
+
+# Supported compute platforms (see platforms/*.yaml)
+PLATFORMS = platforms()
+
+# Node counts of the weak-scaling runs (see run-parallel.py)
+NODES = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+# ======================================================================================
+# Run options
+# ======================================================================================
+# Finds the anomalously slow runs of a parallel campaign and the nodes they share:
+#
+# - The expected runtime of every run is that of the scaling model of its configuration
+#   (see suite/scaling.py), fitted to all the runs of the configuration. A run is
+#   anomalous if it is slower than expected by a modified z-score of its log residual
+#   above suite.timing.OUTLIER_Z.
+# - The anomalous runs are listed in <version>/parallel/<platform>/anomalies.yaml and
+#   left out of the headline numbers by process-parallel.py. The per-node throughput
+#   (tracking rate per node relative to the expected one, median over the runs) of
+#   every node is listed there too.
+# - The nodes of every run are added to noisy_nodes.yaml, at the suite root, which
+#   builds up over campaigns; the drivers exclude the suspicious nodes from their
+#   submissions (see suite/noise.py).
+
+parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Noisy Nodes")
+parser.add_argument("--platform", type=str, required="True", choices=PLATFORMS)
+args, unargs = parser.parse_known_args()
+
+platform = args.platform
+profile = load_platform(platform)
+
+# ======================================================================================
+# Preparation
+# ======================================================================================
+
+version = importlib.metadata.version("mcdc")
+
+# Read the tasks
+with open("tasks/parallel.yaml", "r") as file:
+    tasks = yaml.safe_load(file)
+
+
+def configuration_runs(pattern, N_base, runtime_key):
+    """The completed runs of a weak-scaling sweep that recorded their nodes"""
+    runs = []
+    for N_node in NODES:
+        dir_output = pattern % N_node
+        for file_name in glob.glob("%s/output_*-runtime.h5" % dir_output):
+            power = int(os.path.basename(file_name)[len("output_") : -len("-runtime.h5")])
+            run_name = "%s/output_%i-run.yaml" % (dir_output, power)
+            if not os.path.isfile(run_name):
+                continue
+            with open(run_name, "r") as f:
+                hosts = yaml.safe_load(f).get("hosts")
+            if not hosts:
+                continue
+            with h5py.File(file_name, "r") as f:
+                runtime = float(f[runtime_key][()])
+            runs.append(
+                {
+                    "directory": dir_output,
+                    "power": power,
+                    "N_node": N_node,
+                    "N_particle": 2**power * N_node * N_base,
+                    "runtime": runtime,
+                    "hosts": hosts,
+                }
+            )
+    return runs
+
+
+# ======================================================================================
+# Find the anomalous runs
+# ======================================================================================
+
+# Anomalous runs: <problem>/<run folder> -> [power]
+anomalies = {}
+
+# Runs of the campaign: run -> (hosts, anomalous), and relative throughput per node
+campaign = {}
+throughput = {}
+
+os.chdir("test_suite")
+for problem in tasks:
+    os.chdir(problem)
+    task = tasks[problem]
+
+    # The weak-scaling sweeps of the problem: (label, pattern, N_base, runtime key)
+    sweeps = []
+    for variant in variants(task):
+        tag = variant_tag(variant)
+        for method in methods(task):
+            for mode in task[method].get(platform, {}):
+                if mode in ["openmc", "gpu"]:
+                    continue
+                sweeps.append(
+                    (
+                        "%s%s MC/DC %s %s" % (problem, tag, method, mode),
+                        "mcdc/output/parallel-%s-%s-%s-node_%%i%s" % (platform, method, mode, tag),
+                        task[method][platform][mode],
+                        "simulation",
+                    )
+                )
+        if os.path.isdir("openmc") and "openmc" in task["analog"].get(platform, {}):
+            tag = variant_tag(input_variant(variant))
+            for N_rank_node, N_thread in hybrid(profile):
+                layout = hybrid_tag(N_rank_node, N_thread)
+                sweeps.append(
+                    (
+                        "%s%s OpenMC %ix%i" % (problem, tag, N_rank_node, N_thread),
+                        "openmc/output/parallel-%s-node_%%i%s%s" % (platform, layout, tag),
+                        task["analog"][platform]["openmc"],
+                        "runtime/simulation",
+                    )
+                )
+
+    for label, pattern, N_base, runtime_key in sweeps:
+        runs = configuration_runs(pattern, N_base, runtime_key)
+        points = {
+            "N_node": np.array([run["N_node"] for run in runs], dtype=float),
+            "N_particle": np.array([run["N_particle"] for run in runs], dtype=float),
+            "runtime": np.array([run["runtime"] for run in runs], dtype=float),
+        }
+        model = fit(points) if len(runs) > 0 else None
+        if model is None:
+            print("[NO MODEL] %s: %i runs with recorded nodes" % (label, len(runs)))
+            continue
+
+        # Log residuals about the model; only the slow outliers are anomalous
+        expected, _ = predict(model, points["N_node"], points["N_particle"])
+        residual = np.log(points["runtime"] / expected)
+        anomalous = outliers(residual) & (residual > np.median(residual))
+
+        for run, slow, r in zip(runs, anomalous, residual):
+            run_id = "%s/%s/%s/output_%i" % (version, problem, run["directory"], run["power"])
+            campaign[run_id] = (sorted(run["hosts"]), bool(slow))
+            for host in run["hosts"]:
+                throughput.setdefault(host, []).append(float(np.exp(-r)))
+            if slow:
+                anomalies.setdefault("%s/%s" % (problem, run["directory"]), []).append(
+                    run["power"]
+                )
+                print(
+                    "[ANOMALOUS] %s, %i nodes, power %i: %.2fx the expected runtime"
+                    % (label, run["N_node"], run["power"], np.exp(r))
+                )
+
+    os.chdir("..")
+os.chdir("..")
+
+# ======================================================================================
+# Noisy nodes
+# ======================================================================================
+
+noisy = update(platform, campaign)
+record = load_noisy_nodes()[platform]
+nodes = {
+    host: {
+        "runs": len(record[host]["runs"]),
+        "anomalous_runs": len(record[host]["anomalous"]),
+        "relative_throughput": float(np.median(throughput[host])),
+        "suspicious": host in noisy,
+    }
+    for host in throughput
+}
+
+with open("%s/parallel/%s/anomalies.yaml" % (version, platform), "w") as f:
+    yaml.dump({"runs": anomalies, "nodes": nodes}, f)
+
+print(
+    "%i of %i runs anomalous; suspicious nodes: %s"
+    % (
+        sum(anomalous for hosts, anomalous in campaign.values()),
+        len(campaign),
+        ", ".join(noisy) if len(noisy) > 0 else "none",
+    )
+)
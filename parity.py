@@ -0,0 +1,143 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import yaml
+
+from suite.parity import MCDC_MODEL_FILE, compare, openmc_model
+from suite.staging import stage
+from suite.tasks import input_variants, variant_tag, variant_args, data_libraries
+from suite.xsdata import provision
+
+
+# ======================================================================================
+# Workload parity
+# ======================================================================================
+# Checks that the MC/DC and OpenMC models of every problem with both do the same work:
+# the run mode and batches, the source, the boundary conditions, the time cutoff, the
+# cross-section sets, and the tallies and their bins (see suite/parity.py):
+#
+#   python parity.py [--problem kobayashi pincell] [--matched]
+#
+# Every input variant of the serial and parallel tasks is checked, with the analog
+# method. The mismatches are printed and written to parity.yaml, at the suite root,
+# along with the extracted models; the exit code is 1 if there are any (or if a model
+# cannot be built).
+#
+# With --matched, the models are built in their matched-workload mode, the input
+# parameter --tallies=matched: the hand-written OpenMC models of pincell and
+# pincell_nuclides then score on the time grid of their MC/DC models, and kobayashi
+# (see its problem.yaml) scores only its mesh tally. The other problems score the same
+# tallies in every mode. Add
+#
+#   parameters:
+#       tallies: [matched]
+#
+# to a problem task to run its throughput comparisons that way.
+
+PARITY_FILE = "parity.yaml"
+
+TIERS = ["serial", "parallel"]
+
+
+def run(directory, command):
+    """Run a command in a directory; returns the error message or None"""
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [os.getcwd()] + [path for path in [os.environ.get("PYTHONPATH")] if path]
+    )
+    result = subprocess.run(
+        command, shell=True, cwd=directory, env=environment, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        lines = (result.stderr or result.stdout).strip().splitlines()
+        return "exit code %i: %s" % (result.returncode, lines[-1] if len(lines) > 0 else command)
+    return None
+
+
+# ======================================================================================
+# Run options
+# ======================================================================================
+
+parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Workload Parity")
+parser.add_argument("--problem", type=str, nargs="+", default=None, help="problems to check")
+parser.add_argument(
+    "--matched", default=False, action="store_true", help="check the matched-workload models"
+)
+args, unargs = parser.parse_known_args()
+
+# ======================================================================================
+# Preparation
+# ======================================================================================
+
+# Problems with both models, and their input variants over the tiers
+tasks = {}
+for tier in TIERS:
+    with open("tasks/%s.yaml" % tier, "r") as file:
+        for problem, task in yaml.safe_load(file).items():
+            tasks.setdefault(problem, []).append(task)
+points = []
+for problem in sorted(tasks):
+    if args.problem is not None and problem not in args.problem:
+        continue
+    if not os.path.isfile("test_suite/%s/openmc/build-xml.py" % problem):
+        continue
+    variants = []
+    for task in tasks[problem]:
+        for variant in input_variants(task):
+            if args.matched:
+                variant = dict(variant, tallies="matched")
+            if variant not in variants:
+                variants.append(variant)
+                points.append((problem, task, variant))
+
+# ======================================================================================
+# Check
+# ======================================================================================
+
+record = {}
+N_mismatch = 0
+N_error = 0
+for problem, task, variant in points:
+    name = problem + variant_tag(variant)
+    entry = record[name] = {}
+
+    if len(provision(data_libraries(task, variant))) > 0:
+        entry["error"] = "missing cross-section data"
+        N_error += 1
+        print("  [ERROR] %s: %s" % (name, entry["error"]))
+        continue
+
+    with tempfile.TemporaryDirectory() as dir_mcdc, tempfile.TemporaryDirectory() as dir_openmc:
+        stage("test_suite/%s/mcdc" % problem, dir_mcdc)
+        stage("test_suite/%s/openmc" % problem, dir_openmc)
+        error = run(dir_mcdc, "python -m suite.parity input.py analog%s" % variant_args(variant))
+        if error is None:
+            error = run(dir_openmc, "python build-xml.py 1000%s" % variant_args(variant))
+        if error is not None:
+            entry["error"] = error
+            N_error += 1
+            print("  [ERROR] %s: %s" % (name, error))
+            continue
+        with open(os.path.join(dir_mcdc, MCDC_MODEL_FILE), "r") as f:
+            entry["mcdc"] = yaml.safe_load(f)
+        entry["openmc"] = openmc_model(dir_openmc)
+
+    entry["mismatches"] = compare(entry["mcdc"], entry["openmc"])
+    N_mismatch += len(entry["mismatches"])
+    print(
+        "  [%s] %s"
+        % ("MATCH" if len(entry["mismatches"]) == 0 else "%i MISMATCHES" % len(entry["mismatches"]), name)
+    )
+    for mismatch in entry["mismatches"]:
+        print("      %s: MC/DC %s, OpenMC %s" % (mismatch["item"], mismatch["mcdc"], mismatch["openmc"]))
+
+with open(PARITY_FILE, "w") as f:
+    yaml.dump(record, f)
+
+print(
+    "Parity: %i mismatches in %i models, %i not built (%s)"
+    % (N_mismatch, len(record) - N_error, N_error, PARITY_FILE)
+)
+sys.exit(1 if N_mismatch + N_error > 0 else 0)
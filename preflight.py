@@ -0,0 +1,239 @@
+import argparse
+import concurrent.futures
+import glob
+import h5py
+import os
+import subprocess
+import time
+import yaml
+
+from pathlib import Path
+
+from suite.preflight import PREFLIGHT_FILE, load, mcdc_mode
+from suite.staging import stage
+from suite.tasks import methods, run_variants, variant_tag, variant_args, wrapper_args, input_variant
+from suite.tasks import cycle_args, data_libraries, histories, snapshot_args, timing_args
+from suite.xsdata import provision
+
+
+# ======================================================================================
+# Pre-flight runs
+# ======================================================================================
+# Runs every (problem, variant, method, mode) configuration of the drivers at a tiny
+# particle count, in parallel on the local machine, before anything is submitted:
+#
+#   python preflight.py [--tier serial parallel] [--problem smr_k] [--N 100] [--jobs 4]
+#
+# The runs are single-process, so variants that differ only in their rank placement
+# share a configuration. A configuration passes if its run exits cleanly and writes
+# its output and runtime files. The per-particle cost of the passing ones is recorded
+# for job sizing. At such particle counts a Numba-mode runtime is mostly JIT
+# compilation, so Numba-mode configurations are rerun, with the compiled code cached,
+# at N and SLOPE_FACTOR * N particles, and their cost is the slope between the two.
+# The results go to preflight.yaml (see suite/preflight.py); the drivers skip the
+# configurations that failed.
+
+TIERS = ["serial", "parallel"]
+
+# Modes the parallel driver does not run (yet) as MC/DC runs
+SKIPPED_MODES = ["gpu", "openmc"]
+
+# Particle-count ratio of the two cached runs of a Numba-mode cost fit
+SLOPE_FACTOR = 10
+
+
+def configurations(tier, tasks):
+    """(problem, tag, method, mode) -> (variant, largest particle count of the tier or None)"""
+    result = {}
+    for problem, task in tasks.items():
+        for variant in run_variants(task):
+            for method in methods(task):
+                if tier == "serial":
+                    for mode, (start, stop, num) in task[method].items():
+                        result[(problem, variant_tag(variant), method, mode)] = (variant, int(10**stop))
+                else:
+                    for platform_modes in task[method].values():
+                        for mode in platform_modes:
+                            if mode in SKIPPED_MODES:
+                                continue
+                            key = (problem, variant_tag(variant), method, mcdc_mode(mode))
+                            result.setdefault(key, (variant, None))
+
+            # OpenMC model (analog)
+            if os.path.isdir("test_suite/%s/openmc" % problem):
+                N_max = None
+                if tier == "serial" and "numba" in task["analog"]:
+                    N_max = int(10 ** task["analog"]["numba"][1])
+                key = (problem, variant_tag(input_variant(variant)), "analog", "openmc")
+                result.setdefault(key, (input_variant(variant), N_max))
+    return result
+
+
+def run(directory, commands, timeout):
+    """Run the commands of a configuration; returns (error or None, wall time [s])"""
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [os.getcwd()] + [path for path in [os.environ.get("PYTHONPATH")] if path]
+    )
+    time_start = time.perf_counter()
+    for command in commands:
+        try:
+            result = subprocess.run(
+                command,
+                shell=True,
+                cwd=directory,
+                env=environment,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return "timed out after %i s: %s" % (timeout, command), time.perf_counter() - time_start
+        if result.returncode != 0:
+            lines = (result.stderr or result.stdout).strip().splitlines()
+            message = lines[-1] if len(lines) > 0 else command
+            return "exit code %i: %s" % (result.returncode, message), time.perf_counter() - time_start
+    return None, time.perf_counter() - time_start
+
+
+# ======================================================================================
+# Run options
+# ======================================================================================
+
+parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Pre-flight")
+parser.add_argument("--tier", type=str, nargs="+", default=TIERS, choices=TIERS)
+parser.add_argument("--problem", type=str, nargs="+", default=None, help="problems to check")
+parser.add_argument("--N", type=int, default=100, help="number of particles")
+parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="concurrent runs")
+parser.add_argument("--timeout", type=int, default=900, help="time limit of a run [s]")
+args, unargs = parser.parse_known_args()
+
+N = args.N
+
+# ======================================================================================
+# Preparation
+# ======================================================================================
+
+# Configurations (and their problem tasks) of the requested tiers
+tasks = {}
+points = {}
+for tier in args.tier:
+    with open("tasks/%s.yaml" % tier, "r") as file:
+        tier_tasks = yaml.safe_load(file)
+    if args.problem is not None:
+        tier_tasks = {problem: tier_tasks[problem] for problem in args.problem if problem in tier_tasks}
+    for key, (variant, N_max) in configurations(tier, tier_tasks).items():
+        tasks.setdefault(key[0], tier_tasks[key[0]])
+        if key not in points or points[key][1] is None:
+            points[key] = (variant, N_max)
+
+# Stage the run directories and build their commands
+record = load()
+jobs = {}
+for (problem, tag, method, mode), (variant, N_max) in points.items():
+    task = tasks[problem]
+    name = problem + tag
+    code = "openmc" if mode == "openmc" else "mcdc"
+
+    directory = "test_suite/%s/%s/output/preflight-%s-%s%s" % (problem, code, method, mode, tag)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    stage("test_suite/%s/%s" % (problem, code), directory)
+
+    entry = {"passed": False, "error": None, "N_particle": N}
+    record.setdefault(name, {}).setdefault(method, {})[mode] = entry
+    if len(provision(data_libraries(task, variant))) > 0:
+        entry["error"] = "missing cross-section data"
+        continue
+
+    cycles = cycle_args(task)
+    if code == "mcdc":
+        timing = timing_args(task)
+        command = (
+            "python -m suite.run%s%s%s input.py %s%s%s --mode=%s --N_particle=%%i --output=output_%%i --no-progress_bar --caching --runtime_output"
+            % (timing, snapshot_args(task), wrapper_args(variant), method, variant_args(variant), cycles, mode)
+        )
+        commands = [command % (N, N)]
+        # Cost fit: the first run compiles (and caches) the Numba code
+        if mode == "numba":
+            commands += [command % (N, N), command % (SLOPE_FACTOR * N, SLOPE_FACTOR * N)]
+    else:
+        commands = [
+            "python build-xml.py %i%s%s" % (N, variant_args(variant), cycles),
+            "python -m suite.run --record output_%i openmc -s 1" % N,
+            "mv statepoint.*.h5 output_%i.h5" % N,
+            "python get_runtime.py output_%i.h5" % N,
+        ]
+    jobs[(name, method, mode)] = (directory, commands, task, N_max)
+
+# ======================================================================================
+# Run
+# ======================================================================================
+
+print("Pre-flight: %i configurations, %i runnable" % (len(points), len(jobs)))
+with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as executor:
+    futures = {
+        executor.submit(run, directory, commands, args.timeout): key
+        for key, (directory, commands, task, N_max) in jobs.items()
+    }
+    for future in concurrent.futures.as_completed(futures):
+        name, method, mode = futures[future]
+        directory, commands, task, N_max = jobs[(name, method, mode)]
+        entry = record[name][method][mode]
+        entry["error"], entry["wall_time"] = future.result()
+
+        # Output and runtime files
+        runtime_name = "%s/output_%i-runtime.h5" % (directory, N)
+        file_names = ["%s/output_%i.h5" % (directory, N), runtime_name]
+        if mode == "numba":
+            file_names.append("%s/output_%i-runtime.h5" % (directory, SLOPE_FACTOR * N))
+        if entry["error"] is None:
+            missing = [
+                os.path.basename(file_name)
+                for file_name in file_names
+                if not os.path.isfile(file_name)
+            ]
+            if len(missing) > 0:
+                entry["error"] = "no %s" % ", ".join(missing)
+
+        # Per-particle cost [s] and the estimated time of the largest serial run
+        if entry["error"] is None:
+            with h5py.File(runtime_name, "r") as f:
+                runtime = f["runtime/simulation" if mode == "openmc" else "simulation"][()]
+            entry["passed"] = True
+            entry["cost"] = float(runtime) / histories(task, N)
+            if mode == "numba":
+                N_fit = SLOPE_FACTOR * N
+                with h5py.File(file_names[-1], "r") as f:
+                    runtime_fit = f["simulation"][()]
+                slope = float(runtime_fit - runtime) / (histories(task, N_fit) - histories(task, N))
+                # Timing noise can swamp the difference; the larger run then bounds it
+                entry["cost"] = slope if slope > 0.0 else float(runtime_fit) / histories(task, N_fit)
+                entry["cost_fit"] = [N, N_fit]
+            if N_max is not None:
+                entry["estimated_time_largest"] = entry["cost"] * histories(task, N_max)
+
+        print(
+            "  [%s] %s %s %s%s"
+            % (
+                "PASS" if entry["passed"] else "FAIL",
+                name,
+                method,
+                mode,
+                " (%.2e s/particle)" % entry["cost"] if entry["passed"] else ": %s" % entry["error"],
+            )
+        )
+
+        # Outputs are not kept
+        for file_name in glob.glob("%s/output_*.h5" % directory):
+            os.remove(file_name)
+
+with open(PREFLIGHT_FILE, "w") as f:
+    yaml.dump(record, f)
+
+N_failed = sum(
+    not entry["passed"]
+    for methods_ in record.values()
+    for modes in methods_.values()
+    for entry in modes.values()
+)
+print("Pre-flight: %i failed configurations blocked (%s)" % (N_failed, PREFLIGHT_FILE))
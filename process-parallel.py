@@ -0,0 +1,400 @@
+import argparse
+import glob
+import importlib.metadata
+import matplotlib.pyplot as plt
+import h5py
+import numpy as np
+import os
+import yaml
+
+from suite.platforms import platforms, hybrid, hybrid_tag, load as load_platform
+from suite.tasks import methods, variants, variant_tag, input_variant, histories, is_eigenvalue
+from suite.tasks import run_variant, placement
+from suite.timing import batch_summary, cycle_summary
+from suite.watchdog import skipped_sweep
+
+
+# Supported compute platforms (see platforms/*.yaml)
+PLATFORMS = platforms()
+
+# Line styles
+STYLE = {"cpu": "bo--", "gpu": "g^-", "openmc": "rs:"}
+
+# Node counts of the weak-scaling runs (see run-parallel.py)
+NODES = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+# Metrics plotted against the number of nodes
+PARALLEL_METRICS = {
+    "tracking_rate": "Tracking rate [kparticles/s]",
+    "efficiency": "Weak-scaling efficiency",
+    "tracking_rate_steady": "Steady-state tracking rate [kparticles/s]",
+    "batch_time_cv": "Batch-time coefficient of variation",
+    "cycle_time_active": "Active cycle time [s]",
+    "bank_sync_time": "Fission-bank sync. time [s]",
+    "bank_imbalance": "Fission-bank imbalance (max/mean)",
+    "output_write_time": "Output writing time [s]",
+}
+
+# OpenMC runtime entries of the k-eigenvalue cycle phases
+CYCLE_PHASES_OPENMC = [
+    "inactive batches",
+    "active batches",
+    "synchronizing fission bank",
+    "sampling source sites",
+    "SEND-RECV source sites",
+]
+
+
+def relative_rates(rates):
+    """
+    Tracking rates of the configurations of a sweep, {configuration: {N_node: rate}},
+    relative to the best configuration at the same node count; returns {configuration:
+    ({N_node: relative rate}, mean relative rate or None if it has no runs)}
+    """
+    result = {}
+    for configuration, rate in rates.items():
+        relative = {
+            N_node: value / max(other[N_node] for other in rates.values() if N_node in other)
+            for N_node, value in rate.items()
+        }
+        mean = float(np.mean(list(relative.values()))) if len(relative) > 0 else None
+        result[configuration] = (relative, mean)
+    return result
+
+
+def largest_power(dir_output, excluded=()):
+    """The largest particle-count power completed in a run folder (None if none)"""
+    powers = [
+        int(os.path.basename(file_name)[len("output_") : -len("-runtime.h5")])
+        for file_name in glob.glob("%s/output_*-runtime.h5" % dir_output)
+    ]
+    powers = [power for power in powers if power not in excluded]
+    return max(powers) if len(powers) > 0 else None
+
+
+# ======================================================================================
+# Run options
+# ======================================================================================
+
+# Option parser
+parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Parallel, Post Processor")
+parser.add_argument("--platform", type=str, required="True", choices=PLATFORMS)
+args, unargs = parser.parse_known_args()
+
+platform = args.platform
+profile = load_platform(platform)
+
+# ======================================================================================
+# Preparation
+# ======================================================================================
+
+version = importlib.metadata.version("mcdc")
+
+# Read the tasks
+with open("tasks/parallel.yaml", "r") as file:
+    tasks = yaml.safe_load(file)
+
+# Anomalously slow runs, left out (see noisy-nodes.py): <problem>/<run folder> -> [power]
+anomalies = {}
+file_name = "%s/parallel/%s/anomalies.yaml" % (version, platform)
+if os.path.isfile(file_name):
+    with open(file_name, "r") as f:
+        anomalies = yaml.safe_load(f)["runs"]
+
+
+# ======================================================================================
+# Process the test results
+# ======================================================================================
+
+# Records
+record = {}
+
+# Tracking rates of the rank placement policies (see tasks/parallel.yaml):
+# <problem><tag without the placement> -> "<method> <mode>" -> policy -> N_node -> rate
+placement_rates = {}
+
+# Loop over the test suite problems
+os.chdir("test_suite")
+for problem in tasks:
+    os.chdir(problem)
+    task = tasks[problem]
+    eigenvalue = is_eigenvalue(task)
+    if eigenvalue:
+        N_inactive = task["eigenvalue"]["N_inactive"]
+
+    # Loop over problem variants
+    for variant in variants(task):
+        tag = variant_tag(variant)
+        name = problem + tag
+        record[name] = {}
+
+        # Scaling curves: label -> (style, nodes, entries)
+        curves = {}
+
+        # ==============================================================================
+        # MC/DC
+        # ==============================================================================
+
+        record[name]["MC/DC"] = {}
+
+        # Loop over methods and modes
+        for method in methods(task):
+            record[name]["MC/DC"][method] = {}
+            for mode in task[method].get(platform, {}):
+                # OpenMC and GPU runs are not (yet) MC/DC runs of this folder
+                if mode in ["openmc", "gpu"]:
+                    continue
+                record[name]["MC/DC"][method][mode] = {}
+
+                # Run parameter
+                N_base = task[method][platform][mode]
+
+                nodes = []
+                entries = []
+                for N_node in NODES:
+                    # The largest completed run of the node count
+                    dir_output = "mcdc/output/parallel-%s-%s-%s-node_%i%s" % (
+                        platform,
+                        method,
+                        mode,
+                        N_node,
+                        tag,
+                    )
+                    if skipped_sweep(dir_output) is not None:
+                        print("[SKIPPED] %s: %s" % (dir_output, skipped_sweep(dir_output)))
+                        continue
+                    power = largest_power(dir_output, anomalies.get("%s/%s" % (problem, dir_output), []))
+                    if power is None:
+                        continue
+                    N = int(2**power * N_node * N_base)
+
+                    entry = {}
+                    entry["power"] = power
+                    entry["N_particle"] = N
+                    with h5py.File("%s/output_%i-runtime.h5" % (dir_output, power), "r") as f:
+                        entry["runtime"] = float(f["simulation"][()])
+                    entry["tracking_rate"] = histories(task, N) / entry["runtime"] * 1e-3
+
+                    # Output writing, memory, and model snapshot
+                    file_name = "%s/output_%i-run.yaml" % (dir_output, power)
+                    if os.path.isfile(file_name):
+                        with open(file_name, "r") as f:
+                            run = yaml.safe_load(f)
+                        for key in ["output_write_time", "output_size", "peak_memory"]:
+                            if key in run:
+                                entry[key] = run[key]
+                        # Compute nodes (see noisy-nodes.py)
+                        if run.get("hosts"):
+                            entry["hosts"] = sorted(run["hosts"])
+                        # Software and node configurations (see suite/provenance.py)
+                        if "provenance" in run:
+                            entry["provenance"] = run["provenance"]
+                        # Model snapshot (see suite/snapshot.py)
+                        for key in ["status", "load_time", "size"]:
+                            if key in run.get("snapshot", {}):
+                                entry["snapshot_%s" % key] = run["snapshot"][key]
+
+                    # Cycle times and fission-bank synchronization (k-eigenvalue)
+                    file_name = "%s/output_%i-cycles.h5" % (dir_output, power)
+                    if eigenvalue and os.path.isfile(file_name):
+                        entry.update(cycle_summary(file_name, N, N_inactive))
+
+                    # Batch times: warm-up, jitter, and steady-state throughput (fixed source)
+                    file_name = "%s/output_%i-batches.h5" % (dir_output, power)
+                    if not eigenvalue and os.path.isfile(file_name):
+                        entry.update(batch_summary(file_name, N))
+
+                    nodes.append(N_node)
+                    entries.append(entry)
+
+                curves["MC/DC-%s (%s)" % (mode, method)] = (STYLE[mode], nodes, entries)
+                for N_node, entry in zip(nodes, entries):
+                    record[name]["MC/DC"][method][mode][N_node] = entry
+
+                if placement(variant) is not None:
+                    base = problem + variant_tag(run_variant(variant))
+                    configuration = "%s %s" % (method, mode)
+                    placement_rates.setdefault(base, {}).setdefault(configuration, {})[
+                        placement(variant)
+                    ] = {N_node: entry["tracking_rate"] for N_node, entry in zip(nodes, entries)}
+
+        # ==============================================================================
+        # OpenMC (analog)
+        # ==============================================================================
+
+        if os.path.isdir("openmc") and "openmc" in task["analog"].get(platform, {}):
+            # Run parameter
+            N_base = task["analog"][platform]["openmc"]
+
+            # Runs of every hybrid MPI x OpenMP configuration: layout -> (nodes, entries)
+            layouts = {}
+            for N_rank_node, N_thread in hybrid(profile):
+                layout = "%ix%i" % (N_rank_node, N_thread)
+                nodes = []
+                entries = []
+                for N_node in NODES:
+                    # The largest completed run of the node count
+                    dir_output = "openmc/output/parallel-%s-node_%i%s%s" % (
+                        platform,
+                        N_node,
+                        hybrid_tag(N_rank_node, N_thread),
+                        variant_tag(input_variant(variant)),
+                    )
+                    if skipped_sweep(dir_output) is not None:
+                        print("[SKIPPED] %s: %s" % (dir_output, skipped_sweep(dir_output)))
+                        continue
+                    power = largest_power(dir_output, anomalies.get("%s/%s" % (problem, dir_output), []))
+                    if power is None:
+                        continue
+                    N = int(2**power * N_node * N_base)
+
+                    entry = {}
+                    entry["power"] = power
+                    entry["N_particle"] = N
+                    entry["ranks_per_node"] = N_rank_node
+                    entry["threads"] = N_thread
+                    with h5py.File("%s/output_%i-runtime.h5" % (dir_output, power), "r") as f:
+                        entry["runtime"] = float(f["runtime/simulation"][()])
+                        if eigenvalue:
+                            for phase in CYCLE_PHASES_OPENMC:
+                                entry["%s_time" % phase.replace(" ", "_")] = float(
+                                    f["runtime/%s" % phase][()]
+                                )
+                    entry["tracking_rate"] = histories(task, N) / entry["runtime"] * 1e-3
+                    if eigenvalue:
+                        entry["bank_sync_time"] = entry["synchronizing_fission_bank_time"]
+
+                    nodes.append(N_node)
+                    entries.append(entry)
+                if len(entries) > 0:
+                    layouts[layout] = (nodes, entries)
+
+            # The best configuration is the reference
+            relative = relative_rates(
+                {
+                    layout: {N_node: entry["tracking_rate"] for N_node, entry in zip(nodes, entries)}
+                    for layout, (nodes, entries) in layouts.items()
+                }
+            )
+            if len(layouts) > 0:
+                best = max(layouts, key=lambda layout: relative[layout][1])
+                nodes, entries = layouts[best]
+                curves["OpenMC (%s)" % best] = (STYLE["openmc"], nodes, entries)
+                record[name]["OpenMC"] = {N_node: entry for N_node, entry in zip(nodes, entries)}
+                record[name]["OpenMC hybrid"] = {
+                    layout: {"relative": relative[layout][0], "mean_relative": relative[layout][1]}
+                    for layout in layouts
+                }
+                print(
+                    "OpenMC hybrid, %s: %s (best %s)"
+                    % (
+                        name,
+                        ", ".join("%s %.3f" % (layout, relative[layout][1]) for layout in layouts),
+                        best,
+                    )
+                )
+
+        # Weak-scaling efficiency: tracking rate per node relative to the smallest run
+        for style, nodes, entries in curves.values():
+            if len(entries) == 0:
+                continue
+            reference = entries[0]["tracking_rate"] / nodes[0]
+            for N_node, entry in zip(nodes, entries):
+                entry["efficiency"] = entry["tracking_rate"] / N_node / reference
+
+        # ==============================================================================
+        # Plot
+        # ==============================================================================
+
+        for metric in PARALLEL_METRICS:
+            fig, ax = plt.subplots(1, 1, figsize=(4, 3))
+            plotted = False
+            for label, (style, nodes, entries) in curves.items():
+                x = [N_node for N_node, entry in zip(nodes, entries) if metric in entry]
+                y = [entry[metric] for entry in entries if metric in entry]
+                if len(x) == 0:
+                    continue
+                ax.plot(x, y, style, fillstyle="none", label=label)
+                plotted = True
+            if not plotted:
+                plt.close(fig)
+                continue
+            ax.set_xscale("log", base=2)
+            if metric != "efficiency":
+                ax.set_yscale("log")
+            ax.set_xlabel("Number of nodes")
+            ax.set_ylabel(PARALLEL_METRICS[metric])
+            ax.grid()
+            ax.legend()
+            ax.figure.savefig(
+                "mcdc/%s-parallel-%s.png" % (name, metric),
+                bbox_inches="tight",
+                pad_inches=0,
+                dpi=600,
+            )
+            plt.close(ax.figure)
+
+    os.chdir("..")
+
+# ======================================================================================
+# Rank placement
+# ======================================================================================
+# Throughput of every placement policy relative to the best one at the same node count,
+# and the best policy overall (the highest mean relative throughput)
+
+placement_record = {}
+for base, configurations in placement_rates.items():
+    for configuration, rates in configurations.items():
+        relative = relative_rates(rates)
+        entry = {
+            policy: {
+                "tracking_rate": rates[policy],
+                "relative": relative[policy][0],
+                "mean_relative": relative[policy][1],
+            }
+            for policy in rates
+        }
+        measured = [policy for policy in entry if entry[policy]["mean_relative"] is not None]
+        if len(measured) == 0:
+            continue
+        best = max(measured, key=lambda policy: entry[policy]["mean_relative"])
+        placement_record.setdefault(base, {})[configuration] = {"best": best, "policies": entry}
+        print(
+            "Placement, %s %s: %s"
+            % (
+                base,
+                configuration,
+                ", ".join(
+                    "%s %.3f" % (policy, entry[policy]["mean_relative"]) for policy in measured
+                ),
+            )
+        )
+
+        # Tracking rate per node of every policy
+        fig, ax = plt.subplots(1, 1, figsize=(4, 3))
+        for policy in measured:
+            nodes = sorted(entry[policy]["tracking_rate"])
+            rate = [entry[policy]["tracking_rate"][N_node] / N_node for N_node in nodes]
+            ax.plot(nodes, rate, "o-" if policy == best else "o--", fillstyle="none", label=policy)
+        ax.set_xscale("log", base=2)
+        ax.set_xlabel("Number of nodes")
+        ax.set_ylabel("Tracking rate per node [kparticles/s]")
+        ax.set_title("%s (%s)" % (base, configuration), fontsize=8)
+        ax.grid()
+        ax.legend()
+        ax.figure.savefig(
+            "../%s/parallel/%s/%s-parallel-placement-%s.png"
+            % (version, platform, base, configuration.replace(" ", "-")),
+            bbox_inches="tight",
+            pad_inches=0,
+            dpi=600,
+        )
+        plt.close(ax.figure)
+
+# Save record
+with open("../%s/parallel/%s/record.yaml" % (version, platform), "w") as f:
+    yaml.dump(record, f)
+if len(placement_record) > 0:
+    with open("../%s/parallel/%s/placement.yaml" % (version, platform), "w") as f:
+        yaml.dump(placement_record, f)
+os.system("mv */mcdc/*png ../%s/parallel/%s" % (version, platform))
@@ -0,0 +1,84 @@
+import argparse
+import glob
+import matplotlib.pyplot as plt
+import os
+import yaml
+
+from suite.platforms import platforms
+
+
+# Supported compute platforms (see platforms/*.yaml; "local" runs mpiexec directly, see
+# suite.platforms.LOCAL)
+PLATFORMS = platforms() + ["local"]
+
+# Line styles
+STYLE = {
+    "reduce": "bo--",
+    "reduce_inplace": "bs-",
+    "allreduce": "g^--",
+    "allreduce_inplace": "gv-",
+    "ireduce": "rd:",
+    "node_reduce": "kx-",
+}
+
+
+# ======================================================================================
+# Run options
+# ======================================================================================
+
+parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Tally Reduction, Post Processor")
+parser.add_argument("--platform", type=str, required="True", choices=PLATFORMS)
+parser.add_argument("--placement", type=str, default=None, help="rank placement policy")
+args, unargs = parser.parse_known_args()
+
+platform = args.platform
+if args.placement is not None:
+    platform += "-placement_%s" % args.placement
+
+# ======================================================================================
+# Collect the records
+# ======================================================================================
+
+os.chdir("microbenchmarks/output/reduction-%s" % platform)
+
+# Records: op -> size -> N_rank -> the best chunk size
+record = {}
+for file_name in glob.glob("rank_*/*.yaml"):
+    with open(file_name, "r") as f:
+        point = yaml.safe_load(f)
+    entries = record.setdefault(point["op"], {}).setdefault(point["size"], {})
+    best = entries.get(point["N_rank"])
+    if best is None or point["time_min"] < best["time_min"]:
+        entries[point["N_rank"]] = point
+
+# ======================================================================================
+# Plot (time and peak memory vs number of ranks, one figure per tally size)
+# ======================================================================================
+
+sizes = sorted(set(size for op in record for size in record[op]))
+for size in sizes:
+    for metric, label in [("time_min", "Reduction time [s]"), ("peak_memory", "Peak memory per rank [MB]")]:
+        fig, ax = plt.subplots(1, 1, figsize=(4, 3))
+        for op in record:
+            if size not in record[op]:
+                continue
+            N_ranks = sorted(record[op][size])
+            values = [record[op][size][N_rank][metric] for N_rank in N_ranks]
+            ax.plot(N_ranks, values, STYLE[op], fillstyle="none", label=op)
+        ax.set_xscale("log", base=2)
+        ax.set_xlabel("Number of ranks")
+        ax.set_ylabel(label)
+        ax.set_title("%.0e elements per rank" % size)
+        ax.grid()
+        ax.legend(fontsize="small")
+        ax.figure.savefig(
+            "reduction-size_%i-%s.png" % (size, metric),
+            bbox_inches="tight",
+            pad_inches=0,
+            dpi=600,
+        )
+        plt.close(ax.figure)
+
+# Save record
+with open("record.yaml", "w") as f:
+    yaml.dump(record, f)
@@ -7,13 +7,56 @@ import numpy as np
 import os
 import yaml
 
+from suite.tasks import methods, variants, variant_tag, input_variant, histories, is_eigenvalue
+from suite.metrics import fom
+from suite.timing import batch_summary, cycle_summary
+from suite.sweep import sweep_points
+from suite.watchdog import sweep_status
+from suite.platforms import platforms
 
-# Supported compute platforms
-PLATFORMS = ["dane", "lassen", "tioga", "tuolumne"]
+
+# Supported compute platforms (see platforms/*.yaml), and earlier ones with results
+PLATFORMS = platforms() + ["tioga"]
 
 # Line styles
 STYLE = {"python": "g^-", "numba": "bo--", "openmc": "rs:"}
 
+# Metrics plotted against the problem parameters
+SCALING_METRICS = {
+    "tracking_rate": "Tracking rate [kparticles/s]",
+    "xs_loading_time": "Cross-section loading time [s]",
+    "peak_memory": "Peak memory [MB]",
+    "output_write_time": "Output writing time [s]",
+    "output_size": "Output size [MB]",
+}
+
+# OpenMC runtime entries of the k-eigenvalue cycle phases
+CYCLE_PHASES_OPENMC = [
+    "inactive batches",
+    "active batches",
+    "synchronizing fission bank",
+    "sampling source sites",
+    "SEND-RECV source sites",
+]
+
+
+
+def report_sweep(label, dir_output, N_list):
+    """Outcome of the runs of a sweep (see suite/watchdog.py), with the incomplete ones shown"""
+    status = sweep_status(dir_output, ["output_%i" % N for N in N_list])
+    N_of = lambda prefix: int(prefix[len("output_") :])
+    sweep = {
+        "completed": [N_of(prefix) for prefix in status["completed"]],
+        "skipped": {N_of(prefix): reason for prefix, reason in status["skipped"].items()},
+        "failed": {N_of(prefix): error for prefix, error in status["failed"].items()},
+        "missing": [N_of(prefix) for prefix in status["missing"]],
+    }
+    for N, reason in sweep["skipped"].items():
+        print("[SKIPPED] %s N=%i: %s" % (label, N, reason))
+    for N, error in sweep["failed"].items():
+        print("[FAILED] %s N=%i: %s" % (label, N, error))
+    return sweep
+
 
 # ======================================================================================
 # Run options
@@ -33,7 +76,7 @@ platform = args.platform
 version = importlib.metadata.version("mcdc")
 
 # Read the tasks
-with open("task-serial.yaml", "r") as file:
+with open("tasks/serial.yaml", "r") as file:
     tasks = yaml.safe_load(file)
 
 
@@ -47,75 +90,44 @@ record = {}
 # Loop over the test suite problems
 os.chdir("test_suite")
 for problem in tasks:
-    record[problem] = {}
     os.chdir(problem)
+    task = tasks[problem]
+    eigenvalue = is_eigenvalue(task)
+    if eigenvalue:
+        N_inactive = task["eigenvalue"]["N_inactive"]
 
-    # ==================================================================================
-    # OpenMC (analog)
-    # ==================================================================================
+    # Tracking rates of the problem variants
+    scaling = {}
 
-    os.chdir("openmc")
-    record[problem]["OpenMC"] = {}
-
-    # Output directory
-    dir_output = "output/serial"
-
-    # Run parameters
-    task = tasks[problem]["openmc"]
-    logN_min = task["logN_min"]
-    logN_max = task["logN_max"]
-    N_runs = task["N_runs"]
-    N_list = np.logspace(logN_min, logN_max, N_runs, dtype=int)
-
-    # Set runtimes and simulation rates
-    runtime_openmc = np.zeros(N_runs, dtype=float)
-    simrate_openmc = np.zeros(N_runs, dtype=float)
-    imax = N_runs
-    for i in range(N_runs):
-        N = N_list[i]
-        file_name = "%s/output_%i-runtime.h5" % (dir_output, N)
-        if not os.path.isfile(file_name):
-            imax = i
-            break
-        with h5py.File(file_name, "r") as f:
-            runtime_openmc[i] = f["runtime/simulation"][()]
-            simrate_openmc[i] = 10 * N / runtime_openmc[i] * 1e-3
-
-    # Record
-    record[problem]["OpenMC"]["tracking_rate"] = float(simrate_openmc[imax - 1])
-
-    # ==================================================================================
-    # MC/DC
-    # ==================================================================================
+    # Loop over problem variants
+    for variant in variants(tasks[problem]):
+        tag = variant_tag(variant)
+        name = problem + tag
+        record[name] = {}
 
-    os.chdir("../mcdc")
-    record[problem]["MC/DC"] = {}
+        # ==============================================================================
+        # OpenMC (analog)
+        # ==============================================================================
 
-    # Loop over methods
-    for method in tasks[problem]["mcdc"]:
-        record[problem]["MC/DC"][method] = {}
-
-        # Set up the plot figures
-        fig_runtime, ax_runtime = plt.subplots(1, 1, figsize=(4, 3))
-        fig_simrate, ax_simrate = plt.subplots(1, 1, figsize=(4, 3))
-
-        # Loop over modes
-        for mode in tasks[problem]["mcdc"][method]:
-            record[problem]["MC/DC"][method][mode] = {}
+        has_openmc = os.path.isdir("openmc")
+        if has_openmc:
+            os.chdir("openmc")
+            record[name]["OpenMC"] = {}
 
             # Output directory
-            dir_output = "output/serial-%s-%s-%s" % (platform, method, mode)
+            dir_output = "output/serial%s" % variant_tag(input_variant(variant))
 
-            # Run parameters
-            task = tasks[problem]["mcdc"][method][mode]
-            logN_min = task["logN_min"]
-            logN_max = task["logN_max"]
-            N_runs = task["N_runs"]
+            # Run parameters (OpenMC follows the analog MC/DC-numba runs)
+            logN_min, logN_max, N_runs = tasks[problem]["analog"]["numba"]
             N_list = np.logspace(logN_min, logN_max, N_runs, dtype=int)
 
-            # Set runtimes and simulation rates
-            runtime = np.zeros(N_runs, dtype=float)
-            simrate = np.zeros(N_runs, dtype=float)
+            # Set runtimes, simulation rates, cross-section loading times, and memory
+            # (and the cycle phase runtimes of k-eigenvalue problems)
+            runtime_openmc = np.zeros(N_runs, dtype=float)
+            simrate_openmc = np.zeros(N_runs, dtype=float)
+            xs_time = np.full(N_runs, np.nan)
+            memory = np.full(N_runs, np.nan)
+            cycle_runtime = {}
             imax = N_runs
             for i in range(N_runs):
                 N = N_list[i]
@@ -124,101 +136,297 @@ for problem in tasks:
                     imax = i
                     break
                 with h5py.File(file_name, "r") as f:
-                    runtime[i] = f["simulation"][()]
-                    simrate[i] = 10 * N / runtime[i] * 1e-3
+                    runtime_openmc[i] = f["runtime/simulation"][()]
+                    simrate_openmc[i] = histories(task, N) / runtime_openmc[i] * 1e-3
+                    xs_time[i] = f["runtime/reading cross sections"][()]
+                    if eigenvalue:
+                        for phase in CYCLE_PHASES_OPENMC:
+                            cycle_runtime[phase] = float(f["runtime/%s" % phase][()])
+                file_name = "%s/output_%i-run.yaml" % (dir_output, N)
+                if os.path.isfile(file_name):
+                    with open(file_name, "r") as f:
+                        memory[i] = yaml.safe_load(f)["peak_memory"]
+
+            # Completed runs (plotted with the MC/DC runs, which may be an adaptive sweep)
+            N_openmc = N_list[:imax]
 
             # Record
-            record[problem]["MC/DC"][method][mode]["tracking_rate"] = float(simrate[imax-1])
-            if mode == "numba":
-                compile_time = np.min(runtime[:imax])
-                record[problem]["MC/DC"][method][mode]["compile_time"] = compile_time
-                runtime_wo_compilation = runtime - compile_time
-                simrate_wo_compilation = 10 * N_list / runtime_wo_compilation * 1e-3
-                record[problem]["MC/DC"][method][mode]["tracking_rate"] = float(
-                    simrate_wo_compilation[imax-1]
+            record[name]["OpenMC"]["sweep"] = report_sweep("%s OpenMC" % name, dir_output, N_list)
+            record[name]["OpenMC"]["tracking_rate"] = float(simrate_openmc[imax - 1])
+            record[name]["OpenMC"]["xs_loading_time"] = float(xs_time[imax - 1])
+            record[name]["OpenMC"]["peak_memory"] = float(memory[imax - 1])
+            if eigenvalue:
+                for phase, value in cycle_runtime.items():
+                    record[name]["OpenMC"]["%s_time" % phase.replace(" ", "_")] = value
+            os.chdir("..")
+
+        # ==============================================================================
+        # MC/DC
+        # ==============================================================================
+
+        os.chdir("mcdc")
+        record[name]["MC/DC"] = {}
+
+        # Loop over methods
+        for method in methods(tasks[problem]):
+            record[name]["MC/DC"][method] = {}
+
+            # Set up the plot figures
+            fig_runtime, ax_runtime = plt.subplots(1, 1, figsize=(4, 3))
+            fig_simrate, ax_simrate = plt.subplots(1, 1, figsize=(4, 3))
+
+            # Loop over modes
+            for mode in tasks[problem][method]:
+                record[name]["MC/DC"][method][mode] = {}
+
+                # Output directory
+                dir_output = "output/serial-%s-%s-%s%s" % (platform, method, mode, tag)
+
+                # Run parameters (or the particle counts of an adaptive sweep)
+                logN_min, logN_max, N_runs = tasks[problem][method][mode]
+                N_list = np.logspace(logN_min, logN_max, N_runs, dtype=int)
+                if sweep_points(dir_output) is not None:
+                    N_list = np.array(sweep_points(dir_output), dtype=int)
+                    N_runs = len(N_list)
+
+                # Set runtimes, simulation rates, preparation (incl. cross-section
+                # loading) times, and memory
+                runtime = np.zeros(N_runs, dtype=float)
+                simrate = np.zeros(N_runs, dtype=float)
+                xs_time = np.full(N_runs, np.nan)
+                memory = np.full(N_runs, np.nan)
+                tallies = {}
+                output = {}
+                imax = N_runs
+                for i in range(N_runs):
+                    N = N_list[i]
+                    file_name = "%s/output_%i-runtime.h5" % (dir_output, N)
+                    if not os.path.isfile(file_name):
+                        imax = i
+                        break
+                    with h5py.File(file_name, "r") as f:
+                        runtime[i] = f["simulation"][()]
+                        simrate[i] = histories(task, N) / runtime[i] * 1e-3
+                        if "preparation" in f:
+                            xs_time[i] = f["preparation"][()]
+                    file_name = "%s/output_%i-run.yaml" % (dir_output, N)
+                    if os.path.isfile(file_name):
+                        with open(file_name, "r") as f:
+                            run = yaml.safe_load(f)
+                        memory[i] = run["peak_memory"]
+                        tallies = run.get("output", {}).get("tallies", {})
+                        output = {
+                            key: run[key]
+                            for key in ["output_write_time", "output_size"]
+                            if key in run
+                        }
+
+                # Record
+                record[name]["MC/DC"][method][mode]["sweep"] = report_sweep(
+                    "%s MC/DC %s %s" % (name, method, mode), dir_output, N_list
+                )
+                record[name]["MC/DC"][method][mode]["tracking_rate"] = float(simrate[imax-1])
+                record[name]["MC/DC"][method][mode]["xs_loading_time"] = float(xs_time[imax-1])
+                record[name]["MC/DC"][method][mode]["peak_memory"] = float(memory[imax-1])
+                record[name]["MC/DC"][method][mode]["histories"] = int(
+                    histories(task, N_list[imax - 1])
                 )
+                record[name]["MC/DC"][method][mode]["tallies"] = tallies
+                record[name]["MC/DC"][method][mode].update(output)
+
+                # Cycle times and fission-bank synchronization (k-eigenvalue)
+                file_name = "%s/output_%i-cycles.h5" % (dir_output, N_list[imax - 1])
+                if eigenvalue and os.path.isfile(file_name):
+                    record[name]["MC/DC"][method][mode].update(
+                        cycle_summary(file_name, N_list[imax - 1], N_inactive)
+                    )
 
-            # Plot
-            ax_runtime.plot(
-                    N_list[:imax] * 10,
-                    runtime[:imax],
-                STYLE[mode],
-                fillstyle="none",
-                label="MC/DC-%s" % mode,
-            )
-            ax_simrate.plot(
-                N_list[:imax] * 10,
-                simrate[:imax],
-                STYLE[mode],
-                fillstyle="none",
-                label="MC/DC-%s" % mode,
-            )
+                # Batch times: warm-up, jitter, and steady-state throughput (fixed source)
+                file_name = "%s/output_%i-batches.h5" % (dir_output, N_list[imax - 1])
+                if not eigenvalue and os.path.isfile(file_name):
+                    record[name]["MC/DC"][method][mode].update(
+                        batch_summary(file_name, N_list[imax - 1])
+                    )
+
+                if mode == "numba":
+                    compile_time = np.min(runtime[:imax])
+                    record[name]["MC/DC"][method][mode]["compile_time"] = compile_time
+                    runtime_wo_compilation = runtime - compile_time
+                    simrate_wo_compilation = (
+                        histories(task, N_list) / runtime_wo_compilation * 1e-3
+                    )
+                    record[name]["MC/DC"][method][mode]["tracking_rate"] = float(
+                        simrate_wo_compilation[imax-1]
+                    )
 
-            if mode == "numba":
+                    # Tally figures of merit without the compilation: T is the runtime
+                    # of the largest run less the compile time (see suite/metrics.py)
+                    fom_time = float(runtime_wo_compilation[imax - 1])
+                    for entry in tallies.values():
+                        if "relative_error" in entry:
+                            entry["fom"] = fom(entry["relative_error"], fom_time)
+                    record[name]["MC/DC"][method][mode]["fom_time"] = fom_time
+                else:
+                    record[name]["MC/DC"][method][mode]["fom_time"] = float(runtime[imax - 1])
+
+                # Plot
                 ax_runtime.plot(
-                    N_list[:imax] * 10,
-                    runtime_wo_compilation[:imax],
-                    ":ob",
+                        histories(task, N_list[:imax]),
+                        runtime[:imax],
+                    STYLE[mode],
                     fillstyle="none",
-                    label="MC/DC-numba (w/o comp.)",
+                    label="MC/DC-%s" % mode,
                 )
                 ax_simrate.plot(
-                    N_list[:imax] * 10,
-                    simrate_wo_compilation[:imax],
-                    ":ob",
+                    histories(task, N_list[:imax]),
+                    simrate[:imax],
+                    STYLE[mode],
                     fillstyle="none",
-                    label="MC/DC-numba (w/o comp.)",
+                    label="MC/DC-%s" % mode,
                 )
 
-                # Plot OpenMC
-                if method == 'analog':
+                if mode == "numba":
                     ax_runtime.plot(
-                        N_list[:imax] * 10,
-                        runtime_openmc[:imax],
-                        STYLE['openmc'],
+                        histories(task, N_list[:imax]),
+                        runtime_wo_compilation[:imax],
+                        ":ob",
                         fillstyle="none",
-                        label="OpenMC",
+                        label="MC/DC-numba (w/o comp.)",
                     )
                     ax_simrate.plot(
-                        N_list[:imax] * 10,
-                        simrate_openmc[:imax],
-                        STYLE['openmc'],
+                        histories(task, N_list[:imax]),
+                        simrate_wo_compilation[:imax],
+                        ":ob",
                         fillstyle="none",
-                        label="OpenMC",
+                        label="MC/DC-numba (w/o comp.)",
                     )
 
+                    # Plot OpenMC
+                    if method == 'analog' and has_openmc:
+                        ax_runtime.plot(
+                            histories(task, N_openmc),
+                            runtime_openmc[: len(N_openmc)],
+                            STYLE['openmc'],
+                            fillstyle="none",
+                            label="OpenMC",
+                        )
+                        ax_simrate.plot(
+                            histories(task, N_openmc),
+                            simrate_openmc[: len(N_openmc)],
+                            STYLE['openmc'],
+                            fillstyle="none",
+                            label="OpenMC",
+                        )
+
+
+            # Plot settings
+            ax_runtime.set_xscale("log")
+            ax_runtime.set_yscale("log")
+            ax_runtime.set_xlabel("Number of source particles")
+            ax_runtime.set_ylabel("Runtime [s]")
+            ax_runtime.grid()
+            ax_runtime.legend()
+            ax_runtime.figure.savefig(
+                "%s-%s-runtime.png" % (name, method),
+                bbox_inches="tight",
+                pad_inches=0,
+                dpi=600,
+            )
+            plt.close(ax_runtime.figure)
+
+            # Plot settings
+            ax_simrate.set_xscale("log")
+            ax_simrate.set_xlabel("Number of source particles")
+            ax_simrate.set_ylabel("Tracking rate [kparticles/s]")
+            ax_simrate.grid()
+            ax_simrate.legend()
+            ax_simrate.ticklabel_format(axis="y", scilimits=(-2, 3))
+            ax_simrate.figure.savefig(
+                "%s-%s-tracking_rate.png" % (name, method),
+                bbox_inches="tight",
+                pad_inches=0,
+                dpi=600,
+            )
+            plt.close(ax_simrate.figure)
+
+        # ==============================================================================
+        # Technique comparison (tally figures of merit)
+        # ==============================================================================
+
+        for mode in ["python", "numba"]:
+            techniques = [
+                method for method in record[name]["MC/DC"] if mode in record[name]["MC/DC"][method]
+            ]
+            if len(techniques) < 2:
+                continue
+
+            fig, ax = plt.subplots(1, 1, figsize=(4, 3))
+            tally_names = record[name]["MC/DC"][techniques[0]][mode]["tallies"]
+            for tally_name in tally_names:
+                foms = [
+                    record[name]["MC/DC"][method][mode]["tallies"]
+                    .get(tally_name, {})
+                    .get("fom", np.nan)
+                    for method in techniques
+                ]
+                ax.plot(techniques, foms, "o--", fillstyle="none", label=tally_name)
+            ax.set_yscale("log")
+            ax.set_ylabel("Figure of merit [1/s]")
+            ax.tick_params(axis="x", labelrotation=30)
+            ax.grid()
+            ax.legend()
+            ax.figure.savefig(
+                "%s-%s-fom.png" % (name, mode),
+                bbox_inches="tight",
+                pad_inches=0,
+                dpi=600,
+            )
+            plt.close(ax.figure)
+
+        # Collect the metrics for the parameter scaling plots
+        for metric in SCALING_METRICS:
+            scaling.setdefault(metric, {})
+            for method in record[name]["MC/DC"]:
+                for mode in record[name]["MC/DC"][method]:
+                    label = "MC/DC-%s (%s)" % (mode, method)
+                    value = record[name]["MC/DC"][method][mode].get(metric, np.nan)
+                    scaling[metric].setdefault(label, (STYLE[mode], []))[1].append(value)
+            if has_openmc:
+                value = record[name]["OpenMC"].get(metric, np.nan)
+                scaling[metric].setdefault("OpenMC", (STYLE["openmc"], []))[1].append(value)
+
+        os.chdir("..")
+
+    # ==================================================================================
+    # Parameter scaling (e.g. tracking rate vs number of energy groups)
+    # ==================================================================================
+
+    parameters = tasks[problem].get("parameters", {})
+    if len(parameters) == 1:
+        parameter, values = list(parameters.items())[0]
+        record[problem] = {"%s_scaling" % parameter: {"values": values}}
+
+        for metric in SCALING_METRICS:
+            record[problem]["%s_scaling" % parameter][metric] = {}
+            fig, ax = plt.subplots(1, 1, figsize=(4, 3))
+            for label, (style, data) in scaling[metric].items():
+                record[problem]["%s_scaling" % parameter][metric][label] = data
+                ax.plot(values, data, style, fillstyle="none", label=label)
+            if all(isinstance(value, (int, float)) for value in values):
+                ax.set_xscale("log")
+            ax.set_xlabel(parameter.replace("_", " ").capitalize())
+            ax.set_ylabel(SCALING_METRICS[metric])
+            ax.grid()
+            ax.legend()
+            ax.figure.savefig(
+                "mcdc/%s-%s_scaling-%s.png" % (problem, parameter, metric),
+                bbox_inches="tight",
+                pad_inches=0,
+                dpi=600,
+            )
+            plt.close(ax.figure)
 
-        # Plot settings
-        ax_runtime.set_xscale("log")
-        ax_runtime.set_yscale("log")
-        ax_runtime.set_xlabel("Number of source particles")
-        ax_runtime.set_ylabel("Runtime [s]")
-        ax_runtime.grid()
-        ax_runtime.legend()
-        ax_runtime.figure.savefig(
-            "%s-%s-runtime.png" % (problem, method),
-            bbox_inches="tight",
-            pad_inches=0,
-            dpi=600,
-        )
-        plt.close(ax_runtime.figure)
-
-        # Plot settings
-        ax_simrate.set_xscale("log")
-        ax_simrate.set_xlabel("Number of source particles")
-        ax_simrate.set_ylabel("Tracking rate [kparticles/s]")
-        ax_simrate.grid()
-        ax_simrate.legend()
-        ax_simrate.ticklabel_format(axis="y", scilimits=(-2, 3))
-        ax_simrate.figure.savefig(
-            "%s-%s-tracking_rate.png" % (problem, method),
-            bbox_inches="tight",
-            pad_inches=0,
-            dpi=600,
-        )
-        plt.close(ax_simrate.figure)
-
-    os.chdir("../..")
+    os.chdir("..")
 
 # Save record
 with open("../%s/serial/%s/record.yaml" % (version, platform), "w") as f:
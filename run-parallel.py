@@ -1,5 +1,7 @@
 import argparse
+import asyncio
 import collections
+import itertools
 import importlib.metadata
 import numpy as np
 import os
@@ -8,44 +10,19 @@ import yaml
 
 from pathlib import Path
 
-
-# Supported compute platforms and their parameters
-PLATFORMS = ["dane", "lassen", "tuolumne"]
-#
-JOB_SUBMISSION = {}
-JOB_SUBMISSION["dane"] = 'sbatch'
-JOB_SUBMISSION["lassen"] = 'bsub'
-JOB_SUBMISSION["tuolumne"] = 'flux batch'
-#
-JOB_SCHEDULER = {}
-JOB_SCHEDULER["dane"] = 'slurm'
-JOB_SCHEDULER["lassen"] = 'lsf'
-JOB_SCHEDULER["tuolumne"] = 'flux'
-#
-JOB_TIME = {}
-JOB_TIME['dane'] = "XX:00:00"
-JOB_TIME['lassen'] = "XX:00"
-JOB_TIME['tuolumne'] = "XXh"
-#
-MAX_TIME = {}
-MAX_TIME['dane'] = 24
-MAX_TIME['lassen'] = 24 # Actual max: 12
-MAX_TIME['tuolumne'] = 24
-#
-CPU_CORES_PER_NODE = {}
-CPU_CORES_PER_NODE["dane"] = 112
-CPU_CORES_PER_NODE["lassen"] = 40 # 44
-CPU_CORES_PER_NODE["tuolumne"] = 96
-#
-GPUS_PER_NODE = {}
-GPUS_PER_NODE["dane"] = 0
-GPUS_PER_NODE["lassen"] = 4
-GPUS_PER_NODE["tuolumne"] = 4
-#
-MAX_NODES = {}
-MAX_NODES["dane"] = 128 # Actual limit: 520
-MAX_NODES["lassen"] = 128 # Actual limit: 256
-MAX_NODES["tuolumne"] = 128 # No strict limit
+from suite.tasks import methods, variants, variant_tag, variant_args, wrapper_args, input_variants
+from suite.tasks import run_variant, placement, CASES
+from suite.tasks import cycle_args, data_libraries, snapshot_args, timing_args
+from suite.noise import noisy_nodes
+from suite.preflight import blocked, load as load_preflight
+from suite.staging import stage
+from suite.submit import JobArrays, submit
+from suite.watchdog import deadline, guard, job_exit, mark_sweep
+from suite.controller import Controller
+from suite.campaign import Campaign
+from suite.platforms import platforms, launcher, placements, hybrid, hybrid_tag, THREAD_BINDING
+from suite.platforms import load as load_platform
+from suite.xsdata import provision
 
 
 # ======================================================================================
@@ -53,22 +30,31 @@ MAX_NODES["tuolumne"] = 128 # No strict limit
 # ======================================================================================
 
 parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Parallel")
-parser.add_argument("--platform", type=str, required="True", choices=PLATFORMS)
+parser.add_argument("--platform", type=str, required="True", choices=platforms())
+parser.add_argument("--sample_bins", type=int, default=0, help="tally bins kept per tally")
+parser.add_argument(
+    "--control", default=False, action="store_true", help="follow the jobs until they finish"
+)
+parser.add_argument(
+    "--campaign", default=False, action="store_true", help="run the sweep in single allocations"
+)
 args, unargs = parser.parse_known_args()
 
-# Set platform parameters
+# Set platform parameters (see platforms/<platform>.yaml)
 platform = args.platform
-job_submission = JOB_SUBMISSION[platform]
-job_scheduler = JOB_SCHEDULER[platform]
-job_time = JOB_TIME[platform]
-cpu_cores_per_node = CPU_CORES_PER_NODE[platform]
-gpus_per_node = GPUS_PER_NODE[platform]
-max_nodes = MAX_NODES[platform]
-max_time = MAX_TIME[platform]
+profile = load_platform(platform)
+job_submission = profile["submission"]
+job_scheduler = profile["scheduler"]
+job_time = profile["time_format"]
+cpu_cores_per_node = profile["cpu_cores_per_node"]
+gpus_per_node = profile["gpus_per_node"]
+max_nodes = profile["max_nodes"]
+max_time = profile["max_time"]
 
 # Get the PBS template
 with open("pbs_templates/%s.pbs"%job_scheduler, 'r') as f:
     pbs_template = f.read()
+pbs_template = pbs_template.replace("<ROOT>", os.getcwd())
 
 # ======================================================================================
 # Preparation
@@ -84,8 +70,8 @@ dir_serial = "%s/parallel/%s" % (version, platform)
 Path(dir_serial).mkdir(parents=True, exist_ok=True)
 os.chdir(dir_serial)
 
-# Save the machine specification
-# TODO: GPU specs
+# Save the machine specification (of the submitting host; the compute nodes of every
+# run, with their GPUs, are recorded with the run, see suite/provenance.py)
 spec = {}
 spec["architecture"] = str(platform_.architecture())
 spec["machine"] = str(platform_.machine())
@@ -107,6 +93,64 @@ with open("tasks/parallel.yaml", "r") as file:
 # Run the tests
 # ======================================================================================
 
+# Total time spent staging the run directories
+staging_time = 0.0
+
+# Configurations that failed their pre-flight runs are not submitted (see preflight.py)
+preflight = load_preflight()
+
+# Nodes flagged as noisy in earlier campaigns are avoided (see noisy-nodes.py)
+exclude = noisy_nodes(platform)
+if len(exclude) > 0:
+    print("Excluding noisy nodes: %s" % ", ".join(exclude))
+
+# Job scripts are submitted at the end, as arrays of same-shaped jobs
+arrays = JobArrays(
+    job_scheduler,
+    job_submission,
+    os.getcwd(),
+    "%s/parallel/%s/jobs" % (version, platform),
+    "mcdc-par-%s" % platform,
+    exclude,
+)
+
+# ... or as steps of single-allocation campaigns (see suite/campaign.py)
+campaign = Campaign(
+    job_scheduler,
+    job_submission,
+    pbs_template,
+    job_time,
+    "%s/parallel/%s/jobs" % (version, platform),
+    "mcdc-par-%s" % platform,
+    max_nodes,
+    max_time,
+    exclude,
+)
+
+
+def step_launcher(N_node, N_rank, policy=None):
+    """Launcher prefix of a run with N_rank ranks on N_node nodes (and a placement)"""
+    return launcher(profile, N_node, N_rank, campaign=args.campaign, placement=policy)
+
+
+def submit_jobs():
+    """Submit the collected job scripts (and, with --control, follow and harvest them)"""
+    submissions = arrays.write() + campaign.write()
+    if args.control:
+        controller = Controller(job_scheduler, job_submission, os.path.dirname(arrays.jobs_dir))
+        asyncio.run(controller.run(submissions))
+    else:
+        submit(submissions, job_submission)
+
+
+def add_job(script, N_node, the_time):
+    """Submit a job script (at the end, see above)"""
+    if args.campaign:
+        campaign.add(script, N_node, the_time)
+    else:
+        arrays.add(script, N_node, job_time.replace('XX', str(the_time)))
+
+
 # Loop over the test suite problems
 os.chdir("test_suite")
 for problem in tasks:
@@ -123,85 +167,109 @@ for problem in tasks:
     Path("output").mkdir(parents=True, exist_ok=True)
     os.chdir("output")
 
-    # Loop over methods
-    for method in tasks[problem]:
-        # Loop over modes
-        for mode in tasks[problem][method][platform]:
-            # Only-CPU platform?
-            if platform in ['dane'] and mode == 'gpu':
-                continue
-
-            # OpenMC?
-            if mode == 'openmc':
-                continue
-
-            # TODO: GPU mode
-            if mode == 'gpu':
-                continue
-
-            # Run parameter
-            N_base = tasks[problem][method][platform][mode]
-
-            for N_node in [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]:
-                N_rank = N_node * cpu_cores_per_node
-
-                # Stop if exceeding maximum
-                if N_node > max_nodes:
-                    break
-
-                # Create and get into sub output folder
-                dir_output = "parallel-%s-%s-%s-node_%i" % (platform, method, mode, N_node)
-                Path(dir_output).mkdir(parents=True, exist_ok=True)
-                os.chdir(dir_output)
-
-                # Copy necessary files
-                os.system("cp ../../* . 2>/dev/null")
-
-                def submit_case(case, the_time, powers):
-                    # Exceed the time?
-                    if the_time > max_time:
-                        return
-
-                    # Start building the PBS file
-                    pbs_text = pbs_template[:]
-                    pbs_text = pbs_text.replace('<N_NODE>', '%i' % N_node)
-                    pbs_text = pbs_text.replace('<JOB_NAME>', 'mcdc-par-%s-%s-%s-%s' % (problem, method, mode, case))
-                    pbs_text = pbs_text.replace('<TIME>', job_time.replace('XX', str(the_time)))
-                    pbs_text = pbs_text.replace('<CASE>', "-"+case)
-
-                    # Loop over runs
-                    commands = ""
-                    previous_output = None
-                    for i in range(len(powers)):
-                        power = powers[i]
-                        N = int(2**power * N_node * N_base)
-
-                        commands += (
-                            "srun -n %i python input.py %s --mode=numba --N_particle=%i --output=output_%i --no-progress_bar --caching --runtime_output\n"
-                            % (N_rank, method, N, power)
-                        )
-
-                        # Delete previous output (note that runtimes are saved)
-                        if previous_output is not None:
-                            commands += "rm %s.h5\n" % previous_output
-                        previous_output = "output_%i" % power
-
-                    # Finalize commands and PBS file
-                    pbs_text = pbs_text.replace('<COMMANDS>', commands)
-                    with open(f"submit-%s.pbs"%case, 'w') as f:
-                        f.write(pbs_text)
-
-                    # Submit job
-                    os.system("%s submit-%s.pbs" % (job_submission, case))
-
-                # Submit cases
-                submit_case("case1", 3, [-4, -3, -2, -1, 0])
-                submit_case("case2", 3, [1])
-                submit_case("case3", 6, [2])
-                submit_case("case4", 12, [3])
-                submit_case("case5", 24, [4])
-
-                os.chdir('..')
+    # The runs also record the per-rank cycle (k-eigenvalue) or batch times
+    cycles = cycle_args(tasks[problem])
+    timing = timing_args(tasks[problem])
+    snapshot = snapshot_args(tasks[problem])
+
+    # Loop over problem variants and methods
+    for variant in variants(tasks[problem]):
+        tag = variant_tag(variant)
+
+        # Rank placement policy (see platforms/<platform>.yaml)
+        policy = placement(variant)
+        if policy is not None and policy not in placements(profile):
+            print("No %s placement on %s: skipping %s%s" % (policy, platform, problem, tag))
+            continue
+
+        for method in methods(tasks[problem]):
+            # Loop over modes
+            for mode in tasks[problem][method][platform]:
+                # Only-CPU platform?
+                if gpus_per_node == 0 and mode == 'gpu':
+                    continue
+
+                # OpenMC?
+                if mode == 'openmc':
+                    continue
+
+                # TODO: GPU mode
+                if mode == 'gpu':
+                    continue
+
+                if blocked(preflight, problem + variant_tag(run_variant(variant)), method, mode):
+                    continue
+
+                # Run parameter
+                N_base = tasks[problem][method][platform][mode]
+
+                for N_node in [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]:
+                    N_rank = N_node * cpu_cores_per_node
+
+                    # Stop if exceeding maximum
+                    if N_node > max_nodes:
+                        break
+
+                    # Create and get into sub output folder
+                    dir_output = "parallel-%s-%s-%s-node_%i%s" % (platform, method, mode, N_node, tag)
+                    Path(dir_output).mkdir(parents=True, exist_ok=True)
+                    os.chdir(dir_output)
+
+                    # Link the input files (through the staging store)
+                    staging_time += stage("../..")
+
+                    # Build or locate the cross-section libraries in the shared cache (the sweep is
+                    # reported as skipped without them)
+                    missing = provision(data_libraries(tasks[problem], variant))
+                    if len(missing) > 0:
+                        mark_sweep("missing cross-section data: %s" % ", ".join(missing))
+                        os.chdir("..")
+                        continue
+                    mark_sweep()
+
+                    def submit_case(case, the_time, powers):
+                        # Exceed the time?
+                        if the_time > max_time:
+                            return
+
+                        # Start building the PBS file
+                        pbs_text = pbs_template[:]
+                        pbs_text = pbs_text.replace('<N_NODE>', '%i' % N_node)
+                        pbs_text = pbs_text.replace('<JOB_NAME>', 'mcdc-par-%s-%s-%s%s-%s' % (problem, method, mode, tag, case))
+                        pbs_text = pbs_text.replace('<TIME>', job_time.replace('XX', str(the_time)))
+                        pbs_text = pbs_text.replace('<CASE>', "-"+case)
+
+                        # Loop over runs (each only if it fits in the remaining time)
+                        commands = deadline(the_time)
+                        for i in range(len(powers)):
+                            power = powers[i]
+                            N = int(2**power * N_node * N_base)
+
+                            run = (
+                                "%s python -m suite.run%s%s%s input.py %s%s%s --mode=numba --N_particle=%i --output=output_%i --no-progress_bar --caching --runtime_output\n"
+                                % (step_launcher(N_node, N_rank, policy), timing, snapshot, wrapper_args(variant), method, variant_args(variant), cycles, N, power)
+                            )
+
+                            # Extract the metrics into the run record and delete the output
+                            run += "python -m suite.extract output_%i.h5 --sample=%i\n" % (
+                                power,
+                                args.sample_bins,
+                            )
+                            commands += guard("output_%i" % power, N, run)
+
+                        # Finalize commands and PBS file
+                        pbs_text = pbs_text.replace('<COMMANDS>', commands + job_exit())
+                        with open(f"submit-%s.pbs"%case, 'w') as f:
+                            f.write(pbs_text)
+
+                        # Submit job (as an array element or campaign step)
+                        add_job("submit-%s.pbs" % case, N_node, the_time)
+
+                    # Submit cases
+                    for case, the_time, powers in CASES:
+                        submit_case(case, the_time, powers)
+
+                    os.chdir('..')
 
     os.chdir("../../")
 
@@ -209,9 +277,10 @@ for problem in tasks:
     # OpenMC
     # ==================================================================================
 
-    # Only for Dane
-    if platform != "dane":
-        exit()
+    # Only for problems with an OpenMC model and task on the platform
+    if not os.path.isdir("openmc") or 'openmc' not in tasks[problem]['analog'].get(platform, {}):
+        os.chdir("../")
+        continue
 
     os.chdir("openmc")
 
@@ -220,67 +289,91 @@ for problem in tasks:
     os.chdir("output")
 
     # Run parameter
-    N_base = tasks[problem]['analog']['dane']['openmc']
-
-    for N_node in [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]:
-        N_rank = N_node * cpu_cores_per_node
-
-        # Stop if exceeding maximum
-        if N_node > max_nodes:
-            break
-
-        # Create and get into sub output folder
-        dir_output = "parallel-%s-node_%i" % (platform, N_node)
-        Path(dir_output).mkdir(parents=True, exist_ok=True)
-        os.chdir(dir_output)
-
-        # Copy necessary files
-        os.system("cp ../../* . 2>/dev/null")
-
-        def submit_case(case, the_time, powers):
-            # Exceed the time?
-            if the_time > max_time:
-                return
-
-            # Start building the PBS file
-            pbs_text = pbs_template[:]
-            pbs_text = pbs_text.replace('<N_NODE>', '%i' % N_node)
-            pbs_text = pbs_text.replace('<JOB_NAME>', 'openmc-par-%s-%s' % (problem, case))
-            pbs_text = pbs_text.replace('<TIME>', job_time.replace('XX', str(the_time)))
-            pbs_text = pbs_text.replace('<CASE>', "-"+case)
-
-            # Loop over runs
-            commands = ""
-            previous_output = None
-            for i in range(len(powers)):
-                power = powers[i]
-                N = int(2**power * N_node * N_base)
-
-                commands += "python build-xml.py %i\n" % (N)
-                commands += "srun -n %i openmc -s 1\n" % (N_node)
-                commands += "mv statepoint.30.h5 output_%i.h5\n" % power
-                commands += "rm *xml\n"
-
-                # Delete previous output (note that runtimes are saved)
-                if previous_output is not None:
-                    commands += "rm %s.h5\n" % previous_output
-                previous_output = "output_%i" % power
-
-            # Finalize commands and PBS file
-            pbs_text = pbs_text.replace('<COMMANDS>', commands)
-            with open(f"submit-%s.pbs"%case, 'w') as f:
-                f.write(pbs_text)
-
-            # Submit job
-            os.system("%s submit-%s.pbs" % (job_submission, case))
-
-        # Submit cases
-        submit_case("case1", 3, [-4, -3, -2, -1, 0])
-        submit_case("case2", 3, [1])
-        submit_case("case3", 6, [2])
-        submit_case("case4", 12, [3])
-        submit_case("case5", 24, [4])
-
-        os.chdir('..')
+    N_base = tasks[problem]['analog'][platform]['openmc']
+
+    # Loop over problem variants and hybrid MPI x OpenMP configurations (the best one is
+    # the reference of the plots, see process-parallel.py)
+    for variant, (N_rank_node, N_thread) in itertools.product(input_variants(tasks[problem]), hybrid(profile)):
+        tag = variant_tag(variant)
+        if blocked(preflight, problem + tag, "analog", "openmc"):
+            continue
+        layout = hybrid_tag(N_rank_node, N_thread)
+        for N_node in [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]:
+            N_rank = N_node * N_rank_node
+
+            # Stop if exceeding maximum
+            if N_node > max_nodes:
+                break
+
+            # Create and get into sub output folder
+            dir_output = "parallel-%s-node_%i%s%s" % (platform, N_node, layout, tag)
+            Path(dir_output).mkdir(parents=True, exist_ok=True)
+            os.chdir(dir_output)
+
+            # Link the input files (through the staging store)
+            staging_time += stage("../..")
+
+            # Build or locate the cross-section libraries in the shared cache (the sweep is
+            # reported as skipped without them)
+            missing = provision(data_libraries(tasks[problem], variant))
+            if len(missing) > 0:
+                mark_sweep("missing cross-section data: %s" % ", ".join(missing))
+                os.chdir("..")
+                continue
+            mark_sweep()
+
+            def submit_case(case, the_time, powers):
+                # Exceed the time?
+                if the_time > max_time:
+                    return
+
+                # Start building the PBS file
+                pbs_text = pbs_template[:]
+                pbs_text = pbs_text.replace('<N_NODE>', '%i' % N_node)
+                pbs_text = pbs_text.replace('<JOB_NAME>', "openmc-par-%s%s%s-%s" % (problem, layout, tag, case))
+                pbs_text = pbs_text.replace('<TIME>', job_time.replace('XX', str(the_time)))
+                pbs_text = pbs_text.replace('<CASE>', "-"+case)
+
+                # Loop over runs (each only if it fits in the remaining time)
+                commands = deadline(the_time)
+                previous_output = None
+                for i in range(len(powers)):
+                    power = powers[i]
+                    N = int(2**power * N_node * N_base)
+
+                    run = "python build-xml.py %i%s%s\n" % (N, variant_args(variant), cycles)
+                    # The launcher is wrapped once (not every rank), see suite/run.py
+                    run += "%s python -m suite.run --record output_%i %s openmc -s %i\n" % (
+                        THREAD_BINDING,
+                        power,
+                        step_launcher(N_node, N_rank),
+                        N_thread,
+                    )
+                    run += "mv statepoint.*.h5 output_%i.h5\n" % power
+                    run += "python get_runtime.py output_%i.h5\n" % power
+                    run += "rm *xml\n"
+                    commands += guard("output_%i" % power, N, run)
+
+                    # Delete previous output (note that runtimes are saved)
+                    if previous_output is not None:
+                        commands += "rm %s.h5\n" % previous_output
+                    previous_output = "output_%i" % power
+
+                # Finalize commands and PBS file
+                pbs_text = pbs_text.replace('<COMMANDS>', commands + job_exit())
+                with open(f"submit-%s.pbs"%case, 'w') as f:
+                    f.write(pbs_text)
+
+                # Submit job (as an array element or campaign step)
+                add_job("submit-%s.pbs" % case, N_node, the_time)
+
+            # Submit cases
+            for case, the_time, powers in CASES:
+                submit_case(case, the_time, powers)
+
+            os.chdir('..')
 
     os.chdir("../../..")
+
+print("Staging time: %.3f s" % staging_time)
+submit_jobs()
@@ -0,0 +1,103 @@
+import argparse
+import itertools
+import os
+import yaml
+
+from pathlib import Path
+
+from suite.platforms import platforms, placements, format_time, launcher, load as load_platform
+
+
+# Supported compute platforms (see platforms/*.yaml; "local" runs mpiexec directly, see
+# suite.platforms.LOCAL)
+PLATFORMS = platforms() + ["local"]
+
+
+# ======================================================================================
+# Run options
+# ======================================================================================
+
+parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Tally Reduction")
+parser.add_argument("--platform", type=str, required="True", choices=PLATFORMS)
+parser.add_argument("--placement", type=str, default=None, help="rank placement policy")
+args, unargs = parser.parse_known_args()
+
+platform = args.platform
+placement = args.placement
+profile = load_platform(platform)
+if placement is not None and placement not in placements(profile):
+    parser.error("no %s placement on %s (%s)" % (placement, platform, ", ".join(placements(profile))))
+
+# Read the tasks
+with open("tasks/reduction.yaml", "r") as file:
+    tasks = yaml.safe_load(file)
+
+# Test points of a rank count
+points = [
+    (int(size), int(chunk), op)
+    for size, chunk, op in itertools.product(tasks["size"], tasks["chunk"], tasks["op"])
+    if chunk <= size
+]
+
+
+def commands(launcher):
+    """Commands running all the test points with the given MPI launcher"""
+    text = ""
+    for size, chunk, op in points:
+        text += (
+            "%s python ../../../tally_reduction.py --size=%i --chunk=%i --op=%s --output=%s-size_%i-chunk_%i\n"
+            % (launcher, size, chunk, op, op, size, chunk)
+        )
+    return text
+
+
+# ======================================================================================
+# Run the tests
+# ======================================================================================
+
+os.chdir("microbenchmarks")
+
+# Create and get into output folder
+dir_output = "output/reduction-%s%s" % (platform, "" if placement is None else "-placement_%s" % placement)
+Path(dir_output).mkdir(parents=True, exist_ok=True)
+os.chdir(dir_output)
+
+# Local: run now, with a few ranks
+if platform == "local":
+    for N_rank in tasks["ranks"]:
+        dir_rank = "rank_%i" % N_rank
+        Path(dir_rank).mkdir(parents=True, exist_ok=True)
+        os.chdir(dir_rank)
+        for command in commands(launcher(profile, 1, N_rank, placement=placement)).splitlines():
+            print(command)
+            os.system(command)
+        os.chdir("..")
+    exit()
+
+# Get the PBS template
+with open("../../../pbs_templates/%s.pbs" % profile["scheduler"], 'r') as f:
+    pbs_template = f.read()
+pbs_template = pbs_template.replace("<ROOT>", os.path.abspath("../../.."))
+
+# Platforms: one job per node count
+for N_node in tasks["nodes"]:
+    N_rank = N_node * profile["cpu_cores_per_node"]
+
+    dir_rank = "rank_%i" % N_rank
+    Path(dir_rank).mkdir(parents=True, exist_ok=True)
+    os.chdir(dir_rank)
+
+    # Build the PBS file
+    pbs_text = pbs_template[:]
+    pbs_text = pbs_text.replace('<N_NODE>', '%i' % N_node)
+    pbs_text = pbs_text.replace('<JOB_NAME>', 'reduction-node_%i' % N_node)
+    pbs_text = pbs_text.replace('<TIME>', format_time(profile, 1))
+    pbs_text = pbs_text.replace('<CASE>', "")
+    pbs_text = pbs_text.replace('<COMMANDS>', commands(launcher(profile, N_node, N_rank, placement=placement)))
+    with open(f"submit.pbs", 'w') as f:
+        f.write(pbs_text)
+
+    # Submit job
+    os.system("%s submit.pbs" % profile["submission"])
+
+    os.chdir("..")
@@ -1,50 +1,55 @@
 import argparse
+import asyncio
 import collections
 import importlib.metadata
 import numpy as np
 import os
 import platform as platform_
+import shlex
 import yaml
 
 from pathlib import Path
 
+from suite.tasks import methods, variants, variant_tag, variant_args, wrapper_args, input_variants
+from suite.tasks import cycle_args, data_libraries, snapshot_args, timing_args
+from suite.noise import noisy_nodes
+from suite.preflight import blocked, load as load_preflight
+from suite.staging import stage
+from suite.submit import JobArrays, submit
+from suite.watchdog import deadline, guard, job_exit, mark_sweep, time_limit
+from suite.controller import Controller
+from suite.platforms import platforms, format_time, load as load_platform
+from suite.xsdata import provision
 
-# Supported compute platforms and their parameters
-PLATFORMS = ["dane", "lassen", "tuolumne"]
-#
-JOB_SUBMISSION = {}
-JOB_SUBMISSION["dane"] = 'sbatch'
-JOB_SUBMISSION["lassen"] = 'bsub'
-JOB_SUBMISSION["tuolumne"] = 'flux batch'
-#
-JOB_SCHEDULER = {}
-JOB_SCHEDULER["dane"] = 'slurm'
-JOB_SCHEDULER["lassen"] = 'lsf'
-JOB_SCHEDULER["tuolumne"] = 'flux'
-#
-JOB_TIME = {}
-JOB_TIME['dane'] = "24:00:00"
-JOB_TIME['lassen'] = "12:00"
-JOB_TIME['tuolumne'] = "24h"
 
 # ======================================================================================
 # Run options
 # ======================================================================================
 
 parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Serial")
-parser.add_argument("--platform", type=str, required="True", choices=PLATFORMS)
+parser.add_argument("--platform", type=str, required="True", choices=platforms())
 parser.add_argument("--save_recent_output", default=False, action="store_true")
+parser.add_argument(
+    "--adaptive", default=False, action="store_true", help="adaptive particle-count sweeps"
+)
+parser.add_argument("--tolerance", type=float, default=0.05, help="adaptive plateau tolerance")
+parser.add_argument("--sample_bins", type=int, default=0, help="tally bins kept per tally")
+parser.add_argument(
+    "--control", default=False, action="store_true", help="follow the jobs until they finish"
+)
 args, unargs = parser.parse_known_args()
 
-# Set platform parameters
+# Set platform parameters (see platforms/<platform>.yaml)
 platform = args.platform
-job_submission = JOB_SUBMISSION[platform]
-job_scheduler = JOB_SCHEDULER[platform]
-job_time = JOB_TIME[platform]
+profile = load_platform(platform)
+job_submission = profile["submission"]
+job_scheduler = profile["scheduler"]
+job_time = format_time(profile, profile["serial_time"])
 
 # Get the PBS template
 with open("pbs_templates/%s.pbs"%job_scheduler, 'r') as f:
     pbs_template = f.read()
+pbs_template = pbs_template.replace("<ROOT>", os.getcwd())
 
 
 # ======================================================================================
@@ -83,6 +88,38 @@ with open("tasks/serial.yaml", "r") as file:
 # Run the tests
 # ======================================================================================
 
+# Total time spent staging the run directories
+staging_time = 0.0
+
+# Configurations that failed their pre-flight runs are not submitted (see preflight.py)
+preflight = load_preflight()
+
+# Nodes flagged as noisy in earlier campaigns are avoided (see noisy-nodes.py)
+exclude = noisy_nodes(platform)
+if len(exclude) > 0:
+    print("Excluding noisy nodes: %s" % ", ".join(exclude))
+
+# Job scripts are submitted at the end, as arrays of same-shaped jobs
+arrays = JobArrays(
+    job_scheduler,
+    job_submission,
+    os.getcwd(),
+    "%s/serial/%s/jobs" % (version, platform),
+    "mcdc-ser-%s" % platform,
+    exclude,
+)
+
+
+def submit_jobs():
+    """Submit the collected job scripts (and, with --control, follow and harvest them)"""
+    submissions = arrays.write()
+    if args.control:
+        controller = Controller(job_scheduler, job_submission, os.path.dirname(arrays.jobs_dir))
+        asyncio.run(controller.run(submissions))
+    else:
+        submit(submissions, job_submission)
+
+
 # Loop over the test suite problems
 os.chdir("test_suite")
 for problem in tasks:
@@ -99,63 +136,102 @@ for problem in tasks:
     Path("output").mkdir(parents=True, exist_ok=True)
     os.chdir("output")
 
-    # Loop over methods
-    for method in tasks[problem]:
-        # Loop over modes
-        for mode in tasks[problem][method]:
-            # Create and get into sub output folder
-            dir_output = "serial-%s-%s-%s" % (platform, method, mode)
-            Path(dir_output).mkdir(parents=True, exist_ok=True)
-            os.chdir(dir_output)
-
-            # Copy necessary files
-            os.system("cp ../../* . 2>/dev/null")
-
-            # Start building the PBS file
-            pbs_text = pbs_template[:]
-            pbs_text = pbs_text.replace('<N_NODE>', '1')
-            pbs_text = pbs_text.replace('<JOB_NAME>', 'mcdc-ser-%s-%s-%s' % (problem, method, mode))
-            pbs_text = pbs_text.replace('<TIME>', job_time)
-            pbs_text = pbs_text.replace('<CASE>', "")
-
-            # Run parameters
-            start, stop, num = tasks[problem][method][mode]
-
-            # Loop over runs
-            commands = ""
-            previous_output = None
-            for N in np.logspace(start, stop, num, dtype=int):
-                commands += (
-                    "python input.py %s --mode=%s --N_particle=%i --output=output_%i --no-progress_bar --caching --runtime_output\n"
-                    % (method, mode, N, N)
-                )
-
-                # Delete previous output (note that runtimes are saved)
-                if previous_output is not None:
-                    commands += "rm %s.h5\n" % previous_output
-
-                previous_output = "output_%i" % N
-            # Delete recent output?
-            if not args.save_recent_output:
-                commands += "rm %s.h5\n" % previous_output
-
-            # Finalize commands and PBS file
-            pbs_text = pbs_text.replace('<COMMANDS>', commands)
-            with open(f"submit.pbs", 'w') as f:
-                f.write(pbs_text)
-
-            # Submit job
-            os.system("%s submit.pbs" % job_submission)
-
-            os.chdir("..")
+    # The runs also record the per-rank cycle (k-eigenvalue) or batch times
+    cycles = cycle_args(tasks[problem])
+    timing = timing_args(tasks[problem])
+    snapshot = snapshot_args(tasks[problem])
+
+    # Loop over problem variants and methods
+    for variant in variants(tasks[problem]):
+        tag = variant_tag(variant)
+        for method in methods(tasks[problem]):
+            # Loop over modes
+            for mode in tasks[problem][method]:
+                if blocked(preflight, problem + tag, method, mode):
+                    continue
+
+                # Create and get into sub output folder
+                dir_output = "serial-%s-%s-%s%s" % (platform, method, mode, tag)
+                Path(dir_output).mkdir(parents=True, exist_ok=True)
+                os.chdir(dir_output)
+
+                # Link the input files (through the staging store)
+                staging_time += stage("../..")
+
+                # Build or locate the cross-section libraries in the shared cache (the sweep is
+                # reported as skipped without them)
+                missing = provision(data_libraries(tasks[problem], variant))
+                if len(missing) > 0:
+                    mark_sweep("missing cross-section data: %s" % ", ".join(missing))
+                    os.chdir("..")
+                    continue
+                mark_sweep()
+
+                # Start building the PBS file
+                pbs_text = pbs_template[:]
+                pbs_text = pbs_text.replace('<N_NODE>', '1')
+                pbs_text = pbs_text.replace('<JOB_NAME>', 'mcdc-ser-%s-%s-%s%s' % (problem, method, mode, tag))
+                pbs_text = pbs_text.replace('<TIME>', job_time)
+                pbs_text = pbs_text.replace('<CASE>', "")
+
+                # Run parameters
+                start, stop, num = tasks[problem][method][mode]
+
+                # Adaptive sweep: the particle counts are chosen in the job (see
+                # suite/sweep.py), within the bounds and number of runs of the grid
+                commands = deadline(time_limit(job_time))
+                if args.adaptive:
+                    run = (
+                        "python -m suite.run%s%s%s input.py %s%s%s --mode=%s --N_particle={N} --output=output_{N} --no-progress_bar --caching --runtime_output"
+                        % (timing, snapshot, wrapper_args(variant), method, variant_args(variant), cycles, mode)
+                    )
+                    # (keep the most recent one? {keep} is set by the sweep)
+                    extract = "python -m suite.extract output_{N}.h5 --sample=%i{keep}" % args.sample_bins
+                    commands += "python -m suite.sweep --start=%s --stop=%s --num=%i --tolerance=%s%s --command=%s --command=%s || failed=1\n" % (
+                        start,
+                        stop,
+                        num,
+                        args.tolerance,
+                        " --keep_largest" if args.save_recent_output else "",
+                        shlex.quote(run),
+                        shlex.quote(extract),
+                    )
+
+                # Loop over runs (each only if it fits in the remaining time)
+                N_list = np.logspace(start, stop, num, dtype=int) if not args.adaptive else []
+                for N in N_list:
+                    run = (
+                        "python -m suite.run%s%s%s input.py %s%s%s --mode=%s --N_particle=%i --output=output_%i --no-progress_bar --caching --runtime_output\n"
+                        % (timing, snapshot, wrapper_args(variant), method, variant_args(variant), cycles, mode, N, N)
+                    )
+
+                    # Extract the metrics into the run record and delete the output
+                    # (keep the most recent one?)
+                    keep = " --keep" if args.save_recent_output and N == N_list[-1] else ""
+                    run += "python -m suite.extract output_%i.h5 --sample=%i%s\n" % (
+                        N,
+                        args.sample_bins,
+                        keep,
+                    )
+                    commands += guard("output_%i" % N, N, run)
+
+                # Finalize commands and PBS file
+                pbs_text = pbs_text.replace('<COMMANDS>', commands + job_exit())
+                with open(f"submit.pbs", 'w') as f:
+                    f.write(pbs_text)
+
+                # Submit job (as an array element)
+                arrays.add("submit.pbs", 1, job_time)
+
+                os.chdir("..")
     os.chdir("../../")
 
     # ==================================================================================
     # OpenMC
     # ==================================================================================
 
-    # Only for Dane
-    if platform != "dane":
+    # Only for Dane, and only for problems with an OpenMC model
+    if platform != "dane" or not os.path.isdir("openmc"):
         os.chdir("../")
         continue
 
@@ -165,46 +241,67 @@ for problem in tasks:
     Path("output").mkdir(parents=True, exist_ok=True)
     os.chdir("output")
 
-    # Create and get into sub output folder
-    dir_output = "serial"
-    Path(dir_output).mkdir(parents=True, exist_ok=True)
-    os.chdir(dir_output)
-
-    # Copy necessary files
-    os.system("cp ../../* . 2>/dev/null")
-
-    # Start building the PBS file
-    pbs_text = pbs_template[:]
-    pbs_text = pbs_text.replace('<N_NODE>', '1')
-    pbs_text = pbs_text.replace('<JOB_NAME>', 'openmc-ser-%s' % problem)
-    pbs_text = pbs_text.replace('<TIME>', job_time)
-    pbs_text = pbs_text.replace('<CASE>', "")
-
-    # Run parameters
-    start, stop, num = tasks[problem]["analog"]["numba"]
-
-    # Loop over runs
-    commands = ""
-    previous_output = None
-    for N in np.logspace(start, stop, num, dtype=int):
-        commands += "python build-xml.py %i\n" % (N)
-        commands += "openmc -s 1\n"
-        commands += "mv statepoint.30.h5 output_%i.h5\n" % N
-        commands += "python get_runtime.py output_%i.h5\n" % N
-        commands += "rm *xml\n"
-
-        # Delete previous output (note that runtimes are saved)
-        if previous_output is not None:
-            commands += "rm %s.h5\n" % previous_output
-
-        previous_output = "output_%i" % N
-
-    # Finalize commands and PBS file
-    pbs_text = pbs_text.replace('<COMMANDS>', commands)
-    with open(f"submit.pbs", 'w') as f:
-        f.write(pbs_text)
-
-    # Submit job
-    os.system("%s submit.pbs" % job_submission)
-
-    os.chdir("../../../..")
+    # Loop over problem variants
+    for variant in input_variants(tasks[problem]):
+        tag = variant_tag(variant)
+        if blocked(preflight, problem + tag, "analog", "openmc"):
+            continue
+
+        # Create and get into sub output folder
+        dir_output = "serial%s" % tag
+        Path(dir_output).mkdir(parents=True, exist_ok=True)
+        os.chdir(dir_output)
+
+        # Link the input files (through the staging store)
+        staging_time += stage("../..")
+
+        # Build or locate the cross-section libraries in the shared cache (the sweep is
+        # reported as skipped without them)
+        missing = provision(data_libraries(tasks[problem], variant))
+        if len(missing) > 0:
+            mark_sweep("missing cross-section data: %s" % ", ".join(missing))
+            os.chdir("..")
+            continue
+        mark_sweep()
+
+        # Start building the PBS file
+        pbs_text = pbs_template[:]
+        pbs_text = pbs_text.replace('<N_NODE>', '1')
+        pbs_text = pbs_text.replace('<JOB_NAME>', 'openmc-ser-%s%s' % (problem, tag))
+        pbs_text = pbs_text.replace('<TIME>', job_time)
+        pbs_text = pbs_text.replace('<CASE>', "")
+
+        # Run parameters
+        start, stop, num = tasks[problem]["analog"]["numba"]
+
+        # Loop over runs (each only if it fits in the remaining time)
+        commands = deadline(time_limit(job_time))
+        previous_output = None
+        for N in np.logspace(start, stop, num, dtype=int):
+            run = "python build-xml.py %i%s%s\n" % (N, variant_args(variant), cycles)
+            run += "python -m suite.run --record output_%i openmc -s 1\n" % N
+            run += "mv statepoint.*.h5 output_%i.h5\n" % N
+            run += "python get_runtime.py output_%i.h5\n" % N
+            run += "rm *xml\n"
+            commands += guard("output_%i" % N, N, run)
+
+            # Delete previous output (note that runtimes are saved)
+            if previous_output is not None:
+                commands += "rm %s.h5\n" % previous_output
+
+            previous_output = "output_%i" % N
+
+        # Finalize commands and PBS file
+        pbs_text = pbs_text.replace('<COMMANDS>', commands + job_exit())
+        with open(f"submit.pbs", 'w') as f:
+            f.write(pbs_text)
+
+        # Submit job (as an array element)
+        arrays.add("submit.pbs", 1, job_time)
+
+        os.chdir("..")
+
+    os.chdir("../../..")
+
+print("Staging time: %.3f s" % staging_time)
+submit_jobs()
@@ -0,0 +1,197 @@
+import argparse
+import importlib.metadata
+import matplotlib.pyplot as plt
+import numpy as np
+import os
+import yaml
+
+from suite.platforms import platforms, hybrid, hybrid_tag, load as load_platform
+from suite.tasks import methods, variants, variant_tag, input_variant
+from suite.scaling import scaling_points, fit, predict, weak_efficiency, strong_efficiency
+from suite.scaling import propose_N_base, case_times, Z
+
+
+# Supported compute platforms (see platforms/*.yaml)
+PLATFORMS = platforms()
+
+# Node counts of the weak-scaling runs (see run-parallel.py)
+NODES = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+# ======================================================================================
+# Run options
+# ======================================================================================
+# Fits scaling models (see suite/scaling.py) to the completed weak-scaling runs of every
+# problem, method, and mode, predicts the runtime and efficiency at the node counts of
+# NODES, and proposes the N_base (tasks/parallel.yaml) whose power-0 run on --nodes nodes
+# takes --target_hours at the upper bound, with the time limits of the sweep cases.
+#
+# The sweep cases run 2^power times the power-0 run, up to 16 times in the 24-hour
+# case5, so the default target keeps case5 within 24 hours.
+
+parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Scaling Model")
+parser.add_argument("--platform", type=str, required="True", choices=PLATFORMS)
+parser.add_argument(
+    "--nodes", type=int, default=None, help="node count to size N_base for (default: max_nodes)"
+)
+parser.add_argument("--target_hours", type=float, default=1.5, help="power-0 run time [h]")
+args, unargs = parser.parse_known_args()
+
+platform = args.platform
+profile = load_platform(platform)
+if args.nodes is None:
+    args.nodes = profile["max_nodes"]
+
+# ======================================================================================
+# Preparation
+# ======================================================================================
+
+version = importlib.metadata.version("mcdc")
+
+# Read the tasks
+with open("tasks/parallel.yaml", "r") as file:
+    tasks = yaml.safe_load(file)
+
+
+# ======================================================================================
+# Fit the scaling models
+# ======================================================================================
+
+
+def report(name, label, points, N_base):
+    """Fit, predict, and propose for a weak-scaling sweep; returns its record entry"""
+    model = fit(points)
+    if model is None:
+        print("[NO MODEL] %s %s: %i runs" % (name, label, len(points["runtime"])))
+        return None
+
+    entry = {}
+    entry["model"] = model
+    entry["N_base"] = N_base
+
+    # Predictions at the node counts of the weak-scaling runs
+    nodes = np.array(NODES, dtype=float)
+    T, sigma = predict(model, nodes, nodes * N_base)
+    efficiency, efficiency_sigma = weak_efficiency(model, nodes, N_base)
+    strong, strong_sigma = strong_efficiency(model, nodes, args.nodes * N_base)
+    entry["prediction"] = {
+        int(N_node): {
+            "runtime": float(T[i]),
+            "runtime_sigma": float(sigma[i]),
+            "weak_efficiency": float(efficiency[i]),
+            "weak_efficiency_sigma": float(efficiency_sigma[i]),
+            "strong_efficiency": float(strong[i]),
+            "strong_efficiency_sigma": float(strong_sigma[i]),
+        }
+        for i, N_node in enumerate(NODES)
+    }
+
+    # Proposed N_base and the time limits of its sweep cases
+    target = args.target_hours * 3600.0
+    N_base_proposed = propose_N_base(model, args.nodes, target)
+    entry["proposal"] = {"nodes": args.nodes, "target_hours": args.target_hours}
+    if N_base_proposed is None:
+        print("[NO PROPOSAL] %s %s: no N_base meets the target" % (name, label))
+    else:
+        entry["proposal"]["N_base"] = int(N_base_proposed)
+        entry["proposal"]["case_hours"] = {
+            case: float(np.ceil(hours))
+            for case, hours in case_times(model, args.nodes, N_base_proposed).items()
+        }
+
+    print(
+        "%s %s: %s (%i runs, scatter %.1f%%), N_base %.3g -> %s, efficiency at %i nodes %.2f +- %.2f"
+        % (
+            name,
+            label,
+            model["model"],
+            model["N_point"],
+            model["scatter"] * 100,
+            N_base,
+            "%.3g" % N_base_proposed if N_base_proposed is not None else "-",
+            args.nodes,
+            *weak_efficiency(model, args.nodes, N_base),
+        )
+    )
+
+    # Plot the measured and predicted weak-scaling efficiency
+    measured = {}
+    for N_node, N, runtime in zip(points["N_node"], points["N_particle"], points["runtime"]):
+        if N == N_node * N_base:
+            measured[int(N_node)] = runtime
+    fig, ax = plt.subplots(1, 1, figsize=(4, 3))
+    ax.plot(NODES, efficiency, "k-", label="%s model" % model["model"])
+    ax.fill_between(
+        NODES,
+        efficiency - Z * efficiency_sigma,
+        efficiency + Z * efficiency_sigma,
+        color="k",
+        alpha=0.2,
+    )
+    if 1 in measured:
+        x = sorted(measured)
+        ax.plot(x, [measured[1] / measured[n] for n in x], "bo", fillstyle="none", label="Measured")
+    ax.set_xscale("log", base=2)
+    ax.set_xlabel("Number of nodes")
+    ax.set_ylabel("Weak-scaling efficiency")
+    ax.grid()
+    ax.legend()
+    ax.figure.savefig(
+        "%s-scaling-model-%s.png" % (name, label.replace(" ", "-").replace("/", "")),
+        bbox_inches="tight",
+        pad_inches=0,
+        dpi=600,
+    )
+    plt.close(ax.figure)
+
+    return entry
+
+
+# Records
+record = {}
+
+# Loop over the test suite problems
+os.chdir("test_suite")
+for problem in tasks:
+    os.chdir(problem)
+    task = tasks[problem]
+
+    # Loop over problem variants
+    for variant in variants(task):
+        tag = variant_tag(variant)
+        name = problem + tag
+        record[name] = {"MC/DC": {}}
+
+        # MC/DC
+        for method in methods(task):
+            record[name]["MC/DC"][method] = {}
+            for mode in task[method].get(platform, {}):
+                if mode in ["openmc", "gpu"]:
+                    continue
+                N_base = task[method][platform][mode]
+                pattern = "mcdc/output/parallel-%s-%s-%s-node_%%i%s" % (platform, method, mode, tag)
+                points = scaling_points(pattern, NODES, N_base, "simulation")
+                entry = report(name, "MC/DC %s %s" % (method, mode), points, N_base)
+                if entry is not None:
+                    record[name]["MC/DC"][method][mode] = entry
+
+        # OpenMC (analog), every hybrid MPI x OpenMP configuration
+        if os.path.isdir("openmc") and "openmc" in task["analog"].get(platform, {}):
+            N_base = task["analog"][platform]["openmc"]
+            for N_rank_node, N_thread in hybrid(profile):
+                layout = "%ix%i" % (N_rank_node, N_thread)
+                pattern = "openmc/output/parallel-%s-node_%%i%s%s" % (
+                    platform,
+                    hybrid_tag(N_rank_node, N_thread),
+                    variant_tag(input_variant(variant)),
+                )
+                points = scaling_points(pattern, NODES, N_base, "runtime/simulation")
+                entry = report(name, "OpenMC %s" % layout, points, N_base)
+                if entry is not None:
+                    record[name].setdefault("OpenMC", {})[layout] = entry
+
+    os.chdir("..")
+
+# Save record
+with open("../%s/parallel/%s/scaling-model.yaml" % (version, platform), "w") as f:
+    yaml.dump(record, f)
+os.system("mv */*-scaling-model-*.png ../%s/parallel/%s" % (version, platform))
@@ -0,0 +1 @@
+# Shared helpers for the MC/DC performance test suite drivers and inputs
@@ -0,0 +1,270 @@
+import argparse
+import math
+import os
+import subprocess
+import sys
+import time
+import yaml
+
+from suite.noise import exclude_nodes
+from suite.submit import submit
+
+
+# ======================================================================================
+# Single-allocation campaigns
+# ======================================================================================
+# Instead of one batch job per node count, the parallel sweep runs inside one large
+# allocation: the job scripts become steps on disjoint node subsets of the allocation,
+# so that independent node counts run concurrently. Campaign job scripts launch their
+# runs on the nodes given by the campaign (SUITE_NODES), with the campaign launcher of
+# the platform profile (see suite/platforms.py):
+#
+#   Slurm (dane)      srun job steps on --nodelist
+#   Flux (tuolumne)   flux run jobs, in the allocation's instance, on the required hosts
+#   LSF (lassen)      jsrun resource sets (placed by jsrun on free resources)
+#
+# The drivers write the campaign plans and allocation scripts (Campaign); inside the
+# allocation, the plan is run by
+#
+#   python -m suite.campaign campaign-0.yaml [--dry_run [--scale 1.0]]
+#
+# Each step runs on the nodes planned for it and starts once they are free, after the
+# steps planned before it on those nodes (the planned start times only order the
+# steps, as steps often end before their time limit). The runner exits non-zero if a
+# step fails or the node usage check fails: every step on its own nodes, never more
+# than the allocation. With --dry_run, the steps are run by a local fake scheduler:
+# each sleeps for its time limit (in seconds instead of hours, times --scale), on fake
+# nodes.
+
+
+def plan(jobs, N_node_total, max_time):
+    """
+    Campaigns (lists of jobs with "start" and "nodes") of at most N_node_total nodes
+    and max_time each. Jobs are list-scheduled, the largest (node-hours) first: a job
+    starts as soon as enough nodes are free, on the lowest free ones, or goes to the
+    next campaign if it would not end within max_time.
+    """
+    pending = sorted(jobs, key=lambda job: job["N_node"] * job["time"], reverse=True)
+    campaigns = []
+    while len(pending) > 0:
+        free_at = [0.0] * N_node_total
+        campaign = []
+        deferred = []
+        for job in pending:
+            # The earliest time at which N_node nodes are free
+            start = sorted(free_at)[job["N_node"] - 1]
+            if start + job["time"] > max_time and len(campaign) > 0:
+                deferred.append(job)
+                continue
+            nodes = [i for i in range(N_node_total) if free_at[i] <= start][: job["N_node"]]
+            for i in nodes:
+                free_at[i] = start + job["time"]
+            campaign.append(dict(job, start=start, nodes=nodes))
+        campaigns.append(campaign)
+        pending = deferred
+    return campaigns
+
+
+class Campaign:
+    """Job scripts collected for single-allocation campaigns"""
+
+    def __init__(
+        self, scheduler, submission, pbs_template, job_time, jobs_dir, name, N_node, max_time, exclude=()
+    ):
+        """
+        pbs_template: the batch script template (with <ROOT> set); job_time: its time
+        format, e.g. "XX:00:00"; N_node and max_time [h]: the largest allocation;
+        exclude: nodes to avoid
+        """
+        self.scheduler = scheduler
+        self.submission = submission
+        self.pbs_template = pbs_template
+        self.job_time = job_time
+        self.jobs_dir = os.path.abspath(jobs_dir)
+        self.name = name
+        self.N_node = N_node
+        self.max_time = max_time
+        self.exclude = list(exclude)
+        self.jobs = []
+
+    def add(self, script, N_node, time):
+        """Add a job script (in the working directory) with its node count and time [h]"""
+        self.jobs.append({"directory": os.getcwd(), "script": script, "N_node": N_node, "time": time})
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def write(self):
+        """Write the campaigns; returns the submissions (as JobArrays.write)"""
+        submissions = []
+        if len(self.jobs) == 0:
+            return submissions
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        campaigns = plan(self.jobs, self.N_node, self.max_time)
+        for i, jobs in enumerate(campaigns):
+            N_node = max(max(job["nodes"]) + 1 for job in jobs)
+            hours = math.ceil(max(job["start"] + job["time"] for job in jobs))
+            plan_name = "%s/campaign-%i.yaml" % (self.jobs_dir, i)
+            with open(plan_name, "w") as f:
+                yaml.dump({"scheduler": self.scheduler, "N_node": N_node, "jobs": jobs}, f)
+
+            text = self.pbs_template[:]
+            text = text.replace("<N_NODE>", "%i" % N_node)
+            text = text.replace("<JOB_NAME>", "%s-campaign-%i" % (self.name, i))
+            text = text.replace("<TIME>", self.job_time.replace("XX", str(hours)))
+            text = text.replace("<CASE>", "-campaign-%i" % i)
+            text = text.replace("<COMMANDS>", "python -m suite.campaign %s\n" % plan_name)
+            text = exclude_nodes(text, self.scheduler, self.exclude)
+            with open("%s/campaign-%i.pbs" % (self.jobs_dir, i), "w") as f:
+                f.write(text)
+
+            submissions.append(
+                {
+                    "name": "%s-campaign-%i" % (self.name, i),
+                    "script": "campaign-%i.pbs" % i,
+                    "jobs_dir": self.jobs_dir,
+                    "elements": {None: [job["directory"] for job in jobs]},
+                    "array": False,
+                }
+            )
+            print(
+                "Campaign %i: %i jobs on %i nodes, %i h (%s)"
+                % (i, len(jobs), N_node, hours, plan_name)
+            )
+        self.jobs = []
+        return submissions
+
+    def submit(self):
+        """Write and submit the campaigns; returns the number of submissions"""
+        return submit(self.write(), self.submission)
+
+
+# ======================================================================================
+# Campaign runner (inside the allocation)
+# ======================================================================================
+
+
+def hostnames(scheduler):
+    """Compute nodes of the allocation"""
+    if scheduler == "slurm":
+        command = ["scontrol", "show", "hostnames", os.environ["SLURM_JOB_NODELIST"]]
+        return subprocess.run(command, capture_output=True, text=True).stdout.split()
+    if scheduler == "flux":
+        command = ["flux", "hostlist", "--expand", "--delimiter= ", "instance"]
+        return subprocess.run(command, capture_output=True, text=True).stdout.split()
+    # LSF: slots per host, the first host being the launch node
+    hosts = os.environ["LSB_HOSTS"].split()
+    return sorted(set(hosts[1:]), key=hosts.index)
+
+
+def run(plan_file, dry_run=False, scale=1.0):
+    """Run the steps of a campaign plan; returns the step log"""
+    with open(plan_file, "r") as f:
+        campaign = yaml.safe_load(f)
+    jobs = campaign["jobs"]
+    if dry_run:
+        hosts = ["node%i" % i for i in range(campaign["N_node"])]
+    else:
+        hosts = hostnames(campaign["scheduler"])
+
+    N_missing = max(max(job["nodes"]) for job in jobs) + 1 - len(hosts)
+    if N_missing > 0:
+        raise RuntimeError("%i planned nodes missing from the allocation" % N_missing)
+
+    busy = set()
+    pending = sorted(range(len(jobs)), key=lambda index: jobs[index]["start"])
+    running = {}
+    log = []
+    time_start = time.perf_counter()
+    while len(pending) > 0 or len(running) > 0:
+        # Start the pending steps whose planned nodes are free, in their planned order
+        # on each node
+        claimed = set()
+        for index in pending[:]:
+            job = jobs[index]
+            nodes = job["nodes"]
+            if not busy.union(claimed).isdisjoint(nodes):
+                claimed.update(nodes)
+                continue
+            pending.remove(index)
+            busy.update(nodes)
+
+            environment = dict(os.environ)
+            environment["SUITE_NODES"] = ",".join(hosts[i] for i in nodes)
+            if dry_run:
+                process = subprocess.Popen(["sleep", str(job["time"] * scale)])
+            else:
+                case = job["script"][len("submit") : -len(".pbs")]
+                directory = job["directory"]
+                process = subprocess.Popen(
+                    ["bash", job["script"]],
+                    cwd=directory,
+                    env=environment,
+                    stdout=open(os.path.join(directory, "output%s.out" % case), "w"),
+                    stderr=open(os.path.join(directory, "output%s.err" % case), "w"),
+                )
+            entry = {
+                "directory": job["directory"],
+                "script": job["script"],
+                "nodes": [hosts[i] for i in nodes],
+                "start": time.perf_counter() - time_start,
+            }
+            running[index] = (process, nodes, entry)
+            print("[START] %s/%s on %s" % (job["directory"], job["script"], environment["SUITE_NODES"]))
+
+        # Wait for any step to finish
+        time.sleep(0.1 if dry_run else 5.0)
+        for index, (process, nodes, entry) in list(running.items()):
+            if process.poll() is None:
+                continue
+            entry["end"] = time.perf_counter() - time_start
+            entry["exit_code"] = process.returncode
+            log.append(entry)
+            busy.difference_update(nodes)
+            del running[index]
+
+    with open(plan_file[: -len(".yaml")] + "-log.yaml", "w") as f:
+        yaml.dump(log, f)
+    return log
+
+
+def verify(log, N_node):
+    """Node usage errors of a step log (empty if every step had its own nodes)"""
+    errors = []
+    used = set(node for entry in log for node in entry["nodes"])
+    if len(used) > N_node:
+        errors.append("%i nodes used in a %i-node allocation" % (len(used), N_node))
+    for i, a in enumerate(log):
+        for b in log[i + 1 :]:
+            overlap = min(a["end"], b["end"]) - max(a["start"], b["start"])
+            shared = set(a["nodes"]) & set(b["nodes"])
+            if overlap > 0 and len(shared) > 0:
+                errors.append(
+                    "%s/%s and %s/%s share %s"
+                    % (a["directory"], a["script"], b["directory"], b["script"], sorted(shared))
+                )
+    return errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a single-allocation campaign plan")
+    parser.add_argument("plan", type=str, help="campaign plan, e.g. campaign-0.yaml")
+    parser.add_argument("--dry_run", default=False, action="store_true", help="fake scheduler")
+    parser.add_argument("--scale", type=float, default=1.0, help="dry-run seconds per hour")
+    args = parser.parse_args()
+
+    log = run(args.plan, args.dry_run, args.scale)
+    with open(args.plan, "r") as f:
+        N_node = yaml.safe_load(f)["N_node"]
+    errors = verify(log, N_node)
+    for error in errors:
+        print("[ERROR] %s" % error)
+    failed = [entry for entry in log if entry["exit_code"] != 0]
+    for entry in failed:
+        print("[FAILED] %s/%s: exit code %i" % (entry["directory"], entry["script"], entry["exit_code"]))
+    print(
+        "%s: %i steps, %i failed, %i node-usage errors"
+        % ("Dry run" if args.dry_run else "Campaign", len(log), len(failed), len(errors))
+    )
+    if len(failed) > 0 or len(errors) > 0:
+        sys.exit(1)
@@ -0,0 +1,399 @@
+import asyncio
+import glob
+import os
+import re
+import shutil
+import time
+import yaml
+
+
+# ======================================================================================
+# Campaign controller
+# ======================================================================================
+# Submits the written job arrays and campaigns (see suite/submit.py and
+# suite/campaign.py) concurrently, follows them until they finish, and harvests their
+# results as each array element (or campaign) ends:
+#
+#   controller = Controller("slurm", "sbatch", "<version>/parallel/dane")
+#   asyncio.run(controller.run(arrays.write()))
+#
+# - Failed submission commands are retried with exponential backoff.
+# - The job IDs are parsed from the submission outputs, and the jobs are polled with
+#   sacct (Slurm; squeue forgets finished jobs), bjobs (LSF), or flux jobs (Flux).
+# - Elements that fail (including time-outs and cancellations) are requeued right away,
+#   up to `requeues` times, by resubmitting their array indices. A job script fails if
+#   any of its runs fails (see job_exit() in suite/watchdog.py), and a requeued one
+#   skips the runs already completed.
+# - The run records of finished elements are copied into the results store,
+#   <results dir>/runs/<problem>/<code>/output/<run>/, and the live campaign status is
+#   written to <results dir>/jobs/controller.yaml.
+#
+# The "local" scheduler is a stand-in that runs the jobs as local processes, to test
+# the controller (and the job scripts) without a batch system.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Element states
+ACTIVE = ["PENDING", "RUNNING"]
+FINAL = ["COMPLETED", "FAILED"]
+
+# Run records harvested into the results store
+HARVESTED = [
+    "*-run.yaml",
+    "*-runtime.h5",
+    "*-cycles.h5",
+    "*-batches.h5",
+    "*-provenance.yaml",
+    "*-status.yaml",
+    "staged.yaml",
+    "sweep.yaml",
+    "output*.out",
+    "output*.err",
+]
+
+
+class SubmissionError(Exception):
+    pass
+
+
+async def shell(command, cwd=None, env=None):
+    """Run a shell command; returns (exit code, stdout, stderr)"""
+    process = await asyncio.create_subprocess_shell(
+        command,
+        cwd=cwd,
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout.decode(), stderr.decode()
+
+
+def index_set(indices):
+    """Compact array index set, e.g. "1-3,7" """
+    indices = sorted(indices)
+    ranges = []
+    for index in indices:
+        if len(ranges) > 0 and index == ranges[-1][1] + 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return ",".join("%i" % a if a == b else "%i-%i" % (a, b) for a, b in ranges)
+
+
+# ======================================================================================
+# Schedulers
+# ======================================================================================
+# submit(script, directory, indices) -> {index: job key}, index None for non-arrays
+# status(keys) -> {job key: state}; keys without a state are left as they are
+
+
+class Slurm:
+    STATES = {
+        "PENDING": "PENDING",
+        "REQUEUED": "PENDING",
+        "RUNNING": "RUNNING",
+        "COMPLETING": "RUNNING",
+        "COMPLETED": "COMPLETED",
+    }
+
+    def __init__(self, submission):
+        self.submission = submission
+
+    async def submit(self, script, directory, indices):
+        option = " --array=%s" % index_set(indices) if indices is not None else ""
+        code, stdout, stderr = await shell(
+            "%s --parsable%s %s" % (self.submission, option, script), directory
+        )
+        match = re.match(r"\s*(\d+)", stdout)
+        if code != 0 or match is None:
+            raise SubmissionError(stderr.strip() or stdout.strip())
+        job_id = match.group(1)
+        if indices is None:
+            return {None: job_id}
+        return {index: "%s_%i" % (job_id, index) for index in indices}
+
+    async def status(self, keys):
+        job_ids = sorted(set(key.split("_")[0] for key in keys))
+        code, stdout, stderr = await shell(
+            "sacct -n -P -X -o JobID,State -j %s" % ",".join(job_ids)
+        )
+        result = {}
+        for line in stdout.splitlines():
+            if "|" not in line:
+                continue
+            key, state = line.split("|")[:2]
+            result[key] = self.STATES.get(state.split(" ")[0], "FAILED")
+        return result
+
+
+class LSF:
+    STATES = {
+        "PEND": "PENDING",
+        "PSUSP": "PENDING",
+        "WAIT": "PENDING",
+        "RUN": "RUNNING",
+        "USUSP": "RUNNING",
+        "SSUSP": "RUNNING",
+        "DONE": "COMPLETED",
+    }
+
+    def __init__(self, submission):
+        self.submission = submission
+
+    async def submit(self, script, directory, indices):
+        option = ""
+        if indices is not None:
+            option = ' -J "%s[%s]"' % (script[: -len(".pbs")], index_set(indices))
+        code, stdout, stderr = await shell("%s%s %s" % (self.submission, option, script), directory)
+        match = re.search(r"Job <(\d+)>", stdout)
+        if code != 0 or match is None:
+            raise SubmissionError(stderr.strip() or stdout.strip())
+        job_id = match.group(1)
+        if indices is None:
+            return {None: job_id}
+        return {index: "%s[%i]" % (job_id, index) for index in indices}
+
+    async def status(self, keys):
+        job_ids = sorted(set(key.split("[")[0] for key in keys))
+        code, stdout, stderr = await shell(
+            'bjobs -a -noheader -o "jobid jobindex stat" %s' % " ".join(job_ids)
+        )
+        result = {}
+        for line in stdout.splitlines():
+            fields = line.split()
+            if len(fields) != 3:
+                continue
+            job_id, index, state = fields
+            key = job_id if index == "0" else "%s[%s]" % (job_id, index)
+            result[key] = self.STATES.get(state, "FAILED")
+        return result
+
+
+class Flux:
+    STATES = {
+        "DEPEND": "PENDING",
+        "PRIORITY": "PENDING",
+        "SCHED": "PENDING",
+        "RUN": "RUNNING",
+        "CLEANUP": "RUNNING",
+        "COMPLETED": "COMPLETED",
+    }
+
+    def __init__(self, submission):
+        self.submission = submission
+
+    async def submit(self, script, directory, indices):
+        # A bulk submission (--cc) gives one job per index
+        option = " --cc=%s" % index_set(indices) if indices is not None else ""
+        code, stdout, stderr = await shell("%s%s %s" % (self.submission, option, script), directory)
+        job_ids = stdout.split()
+        expected = 1 if indices is None else len(indices)
+        if code != 0 or len(job_ids) != expected:
+            raise SubmissionError(stderr.strip() or stdout.strip())
+        if indices is None:
+            return {None: job_ids[0]}
+        return dict(zip(sorted(indices), job_ids))
+
+    async def status(self, keys):
+        code, stdout, stderr = await shell('flux jobs -a -n -o "{id.f58} {status}" %s' % " ".join(keys))
+        result = {}
+        for line in stdout.splitlines():
+            fields = line.split()
+            if len(fields) == 2:
+                result[fields[0]] = self.STATES.get(fields[1], "FAILED")
+        return result
+
+
+class Local:
+    """Stand-in scheduler: runs the jobs as local processes"""
+
+    # Array index variables of the array templates (pbs_templates/*-array.pbs)
+    INDEX_VARIABLES = ["SLURM_ARRAY_TASK_ID", "LSB_JOBINDEX", "FLUX_JOB_CC"]
+
+    def __init__(self, submission=None):
+        self.processes = {}
+
+    async def submit(self, script, directory, indices):
+        result = {}
+        for index in [None] if indices is None else indices:
+            environment = dict(os.environ)
+            if index is not None:
+                for name in self.INDEX_VARIABLES:
+                    environment[name] = "%i" % index
+            key = "local%i" % len(self.processes)
+            self.processes[key] = await asyncio.create_subprocess_exec(
+                "bash",
+                script,
+                cwd=directory,
+                env=environment,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            result[index] = key
+        return result
+
+    async def status(self, keys):
+        result = {}
+        for key in keys:
+            code = self.processes[key].returncode
+            result[key] = "RUNNING" if code is None else ("COMPLETED" if code == 0 else "FAILED")
+        return result
+
+
+SCHEDULERS = {"slurm": Slurm, "lsf": LSF, "flux": Flux, "local": Local}
+
+
+# ======================================================================================
+# Controller
+# ======================================================================================
+
+
+class Controller:
+    def __init__(
+        self,
+        scheduler,
+        submission,
+        results_dir,
+        retries=3,
+        backoff=30.0,
+        interval=60.0,
+        requeues=1,
+        concurrency=8,
+    ):
+        """
+        scheduler: "slurm", "lsf", "flux", or "local"; submission: the submission
+        command; results_dir: the results store, e.g. <version>/parallel/dane;
+        retries and backoff [s]: of failed submission commands; interval [s]: between
+        polls; requeues: resubmissions of a failed element; concurrency: of submissions
+        """
+        self.scheduler = SCHEDULERS[scheduler](submission)
+        self.results_dir = os.path.abspath(results_dir)
+        self.retries = retries
+        self.backoff = backoff
+        self.interval = interval
+        self.requeues = requeues
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.submissions = {}
+        self.elements = {}
+
+    async def run(self, submissions):
+        """Submit, follow, and harvest the submissions until every element is final"""
+        for submission in submissions:
+            self.submissions[submission["name"]] = submission
+            for index, directories in submission["elements"].items():
+                self.elements[(submission["name"], index)] = {
+                    "directories": directories,
+                    "state": "PENDING",
+                    "key": None,
+                    "attempts": 0,
+                }
+
+        await asyncio.gather(
+            *[self.submit(name, self.indices(name)) for name in self.submissions]
+        )
+        self.save()
+        while any(element["state"] in ACTIVE for element in self.elements.values()):
+            await asyncio.sleep(self.interval)
+            await self.poll()
+            self.save()
+        return self.elements
+
+    def indices(self, name):
+        """Array indices of a submission (None if not an array)"""
+        if not self.submissions[name]["array"]:
+            return None
+        return sorted(self.submissions[name]["elements"])
+
+    async def submit(self, name, indices):
+        """Submit (or resubmit) elements of a submission, with retries"""
+        submission = self.submissions[name]
+        keys = None
+        async with self.semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    keys = await self.scheduler.submit(
+                        submission["script"], submission["jobs_dir"], indices
+                    )
+                    break
+                except SubmissionError as error:
+                    if attempt == self.retries:
+                        print("[ERROR] Submitting %s: %s" % (name, error))
+                        break
+                    delay = self.backoff * 2**attempt
+                    print("[RETRY] Submitting %s in %.0f s: %s" % (name, delay, error))
+                    await asyncio.sleep(delay)
+
+        for index in [None] if indices is None else indices:
+            element = self.elements[(name, index)]
+            element["attempts"] += 1
+            if keys is None:
+                element["state"] = "FAILED"
+                element["error"] = "submission failed"
+            else:
+                element["state"] = "PENDING"
+                element["key"] = keys[index]
+
+    async def poll(self):
+        """Update the element states; harvest finished elements and requeue failed ones"""
+        active = {
+            element["key"]: (name, index)
+            for (name, index), element in self.elements.items()
+            if element["state"] in ACTIVE and element["key"] is not None
+        }
+        if len(active) == 0:
+            return
+        states = await self.scheduler.status(list(active))
+
+        requeued = {}
+        for key, (name, index) in active.items():
+            element = self.elements[(name, index)]
+            state = states.get(key, element["state"])
+            if state == element["state"]:
+                continue
+            element["state"] = state
+            if state not in FINAL:
+                continue
+            self.harvest(element)
+            if state == "FAILED" and element["attempts"] <= self.requeues:
+                requeued.setdefault(name, []).append(index)
+
+        for name, indices in requeued.items():
+            print("[REQUEUE] %s %s" % (name, "" if indices == [None] else index_set(indices)))
+        await asyncio.gather(
+            *[
+                self.submit(name, None if indices == [None] else indices)
+                for name, indices in requeued.items()
+            ]
+        )
+
+        counts = {}
+        for element in self.elements.values():
+            counts[element["state"]] = counts.get(element["state"], 0) + 1
+        print(
+            "[STATUS] %s"
+            % ", ".join("%i %s" % (counts[state], state.lower()) for state in sorted(counts))
+        )
+
+    def harvest(self, element):
+        """Copy the run records of a finished element into the results store"""
+        for directory in element["directories"]:
+            run = os.path.relpath(directory, os.path.join(ROOT, "test_suite"))
+            if run.startswith(".."):
+                run = os.path.basename(directory)
+            target = os.path.join(self.results_dir, "runs", run)
+            os.makedirs(target, exist_ok=True)
+            for pattern in HARVESTED:
+                for file_name in glob.glob(os.path.join(directory, pattern)):
+                    shutil.copy2(file_name, target)
+        element["harvested"] = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    def save(self):
+        """Write the live campaign status"""
+        status = {}
+        for (name, index), element in self.elements.items():
+            entry = {key: value for key, value in element.items() if key != "directories"}
+            status["%s[%s]" % (name, index) if index is not None else name] = entry
+        os.makedirs(os.path.join(self.results_dir, "jobs"), exist_ok=True)
+        with open(os.path.join(self.results_dir, "jobs", "controller.yaml"), "w") as f:
+            yaml.dump(status, f)
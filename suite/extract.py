@@ -0,0 +1,108 @@
+import argparse
+import h5py
+import numpy as np
+import os
+import sys
+import yaml
+
+from suite.metrics import fom, tally_statistics
+
+
+# ======================================================================================
+# Metric extraction from an MC/DC output (the MC/DC counterpart of get_runtime.py)
+# ======================================================================================
+# Streams the runtimes, scalar metadata, and tally statistics (and figures of merit) of
+# <PREFIX>.h5 into the run record <PREFIX>-run.yaml, and then deletes the output:
+#
+#   python -m suite.extract output_1000.h5 [--sample 16] [--keep]
+#
+# With --sample K, K bins evenly spread over each tally are kept (index, mean, sdev) to
+# verify the results against a reference without keeping the full output.
+
+
+def extract(file_name, N_sample=0):
+    """Compact record of an MC/DC output file"""
+    result = {"runtime": {}, "metadata": {}, "tallies": {}}
+
+    def visit(name, item):
+        if isinstance(item, h5py.Group):
+            if "mean" in item and "sdev" in item:
+                entry = tally_statistics(item["mean"], item["sdev"])
+                if N_sample > 0:
+                    entry["sample"] = sample(item["mean"], item["sdev"], N_sample)
+                result["tallies"][name] = entry
+            return
+
+        # Scalars only; tally arrays are summarized above
+        if item.size != 1 or item.dtype.kind not in "biuf":
+            return
+        value = item[()].item() if item.ndim == 0 else item[()].ravel()[0].item()
+        if name.startswith("runtime"):
+            result["runtime"][name[len("runtime/") :]] = value
+        elif "/mean" not in name and "/sdev" not in name:
+            result["metadata"][name] = value
+
+    with h5py.File(file_name, "r") as f:
+        for key, value in f.attrs.items():
+            if np.size(value) == 1:
+                result["metadata"][key] = np.asarray(value).ravel()[0].item()
+        f.visititems(visit)
+
+    # Runtimes written separately (--runtime_output)
+    runtime_name = file_name[:-3] + "-runtime.h5"
+    if os.path.isfile(runtime_name):
+        with h5py.File(runtime_name, "r") as f:
+            for name in f:
+                if isinstance(f[name], h5py.Dataset) and f[name].size == 1:
+                    result["runtime"][name] = f[name][()].item()
+
+    # Tally figures of merit, FOM = 1 / (R^2 T), with T the simulation runtime (fom_time;
+    # see suite/metrics.py)
+    runtime = result["runtime"].get("simulation")
+    if runtime is not None:
+        result["fom_time"] = runtime
+        for entry in result["tallies"].values():
+            if "relative_error" in entry:
+                entry["fom"] = fom(entry["relative_error"], runtime)
+    return result
+
+
+def sample(mean, sdev, N):
+    """N bins evenly spread over a tally (flat index, mean, sdev)"""
+    indices = np.unique(np.linspace(0, mean.size - 1, N, dtype=np.int64))
+    result = {"index": [], "mean": [], "sdev": []}
+    for index in indices:
+        position = np.unravel_index(index, mean.shape)
+        result["index"].append(int(index))
+        result["mean"].append(float(mean[position]))
+        result["sdev"].append(float(sdev[position]))
+    return result
+
+
+# ======================================================================================
+# Command line
+# ======================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract the metrics of an MC/DC output")
+    parser.add_argument("output", type=str, help="MC/DC output, e.g. output_1000.h5")
+    parser.add_argument("--sample", type=int, default=0, help="tally bins kept per tally")
+    parser.add_argument("--keep", default=False, action="store_true", help="keep the output")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.output):
+        print("[ERROR] No output to extract: %s" % args.output)
+        sys.exit(1)
+
+    # Merge into the run record
+    record_name = args.output[:-3] + "-run.yaml"
+    record = {}
+    if os.path.isfile(record_name):
+        with open(record_name, "r") as f:
+            record = yaml.safe_load(f) or {}
+    record["output"] = extract(args.output, args.sample)
+    with open(record_name, "w") as f:
+        yaml.dump(record, f)
+
+    if not args.keep:
+        os.remove(args.output)
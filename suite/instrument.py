@@ -0,0 +1,264 @@
+import time
+import numpy as np
+
+
+# ======================================================================================
+# Hooks into the MC/DC simulation loop
+# ======================================================================================
+# MC/DC reports the progress of each cycle by calling printing functions, from object
+# mode in Numba mode. These are looked up as module globals at call time, so wrapping
+# them gives per-rank timestamps in both Python and Numba modes without touching the
+# jitted kernels. Missing hooks (other MC/DC versions) are silently skipped.
+
+
+def wrap(module, name, before=None, after=None):
+    """Wrap module.<name> with callbacks; returns False if it does not exist"""
+    function = getattr(module, name, None)
+    if function is None:
+        return False
+
+    def wrapper(*args, **kwargs):
+        if before is not None:
+            before(*args)
+        result = function(*args, **kwargs)
+        if after is not None:
+            after(*args)
+        return result
+
+    setattr(module, name, wrapper)
+    return True
+
+
+def gather(comm, data):
+    """Stack per-rank lists into [N_rank, N] arrays on the root (None elsewhere)"""
+    if comm is None:
+        return np.array([data])
+    data = comm.gather(data, root=0)
+    if comm.Get_rank() > 0:
+        return None
+    N = max(len(x) for x in data)
+    result = np.full((len(data), N), np.nan)
+    for i, x in enumerate(data):
+        result[i, : len(x)] = x
+    return result
+
+
+class CycleTimer:
+    """Per-rank wall-clock times of the k-eigenvalue cycles"""
+
+    def __init__(self):
+        self.start = None
+        self.cycle_time = []
+        self.bank_size = []
+        self.bank_time = []
+
+    def install(self):
+        import mcdc.loop
+        import mcdc.main
+
+        wrap(mcdc.main, "print_header_eigenvalue", after=self.begin)
+        wrap(mcdc.loop, "print_progress_eigenvalue", after=self.end_cycle)
+
+        # The fission bank sampling and rebalancing can be timed directly only in
+        # Python mode; in Numba mode it is inlined in the jitted cycle loop
+        import numba
+        import mcdc.kernel
+
+        if numba.config.DISABLE_JIT:
+            manage_particle_banks = mcdc.kernel.manage_particle_banks
+
+            def timed(*args):
+                time_start = time.perf_counter()
+                manage_particle_banks(*args)
+                self.bank_time.append(time.perf_counter() - time_start)
+
+            mcdc.kernel.manage_particle_banks = timed
+
+    def begin(self, *args):
+        self.start = time.perf_counter()
+
+    def end_cycle(self, mcdc, *args):
+        now = time.perf_counter()
+        if self.start is not None:
+            self.cycle_time.append(now - self.start)
+        self.start = now
+
+        # The local fission bank, before it is sampled and rebalanced across ranks
+        try:
+            self.bank_size.append(float(np.squeeze(mcdc["bank_census"]["size"])))
+        except Exception:
+            pass
+
+    def save(self, file_name, comm=None):
+        import h5py
+
+        data = {}
+        data["cycle_time"] = gather(comm, self.cycle_time)
+        data["bank_size"] = gather(comm, self.bank_size)
+        data["bank_time"] = gather(comm, self.bank_time)
+        if comm is not None and comm.Get_rank() > 0:
+            return
+        with h5py.File(file_name, "w") as f:
+            for name, value in data.items():
+                if value.size > 0:
+                    f.create_dataset(name, data=value)
+
+
+class BatchTimer:
+    """Per-rank wall-clock times of the fixed-source batches"""
+
+    def __init__(self):
+        self.start = None
+        self.batch_time = []
+
+    def install(self):
+        import mcdc.loop
+        import mcdc.main
+
+        # A batch runs from its header to the next one; the last one ends when the
+        # output is generated, right after the batch loop
+        wrap(mcdc.loop, "print_header_batch", after=self.begin)
+        wrap(mcdc.main, "generate_hdf5", before=self.end)
+
+    def begin(self, *args):
+        now = time.perf_counter()
+        if self.start is not None:
+            self.batch_time.append(now - self.start)
+        self.start = now
+
+    def end(self, *args):
+        if self.start is not None:
+            self.batch_time.append(time.perf_counter() - self.start)
+        self.start = None
+
+    def save(self, file_name, comm=None):
+        import h5py
+
+        batch_time = gather(comm, self.batch_time)
+        if comm is not None and comm.Get_rank() > 0:
+            return
+        with h5py.File(file_name, "w") as f:
+            if batch_time.size > 0:
+                f.create_dataset("batch_time", data=batch_time)
+
+
+# ======================================================================================
+# Hooks into the MC/DC output
+# ======================================================================================
+# MC/DC writes all the results into <output>.h5 with mcdc.main.generate_hdf5 once the
+# simulation is done. The tally datasets (paths under "tallies/" of at least
+# TALLY_MIN_SIZE elements) can be written in one of the TALLY_OUTPUTS modes:
+#
+#   full        as is
+#   compressed  gzip-compressed in chunks
+#   summary     reduced to the bin totals: sum of the means, root-sum-square of the
+#               standard deviations (uncorrelated bins), plus the shape and extrema
+#   none        not written (a DiscardedDataset stands in for them)
+
+TALLY_OUTPUTS = ["full", "compressed", "summary", "none"]
+TALLY_MIN_SIZE = 1024
+
+
+class OutputTimer:
+    """Wall-clock time of writing the MC/DC output, with the tally output mode"""
+
+    def __init__(self, mode="full"):
+        self.mode = mode
+        self.time = None
+
+    def install(self):
+        import mcdc.main
+
+        generate_hdf5 = getattr(mcdc.main, "generate_hdf5", None)
+        if generate_hdf5 is None:
+            return
+
+        def timed(*args, **kwargs):
+            time_start = time.perf_counter()
+            with TallyOutput(self.mode):
+                result = generate_hdf5(*args, **kwargs)
+            self.time = time.perf_counter() - time_start
+            return result
+
+        mcdc.main.generate_hdf5 = timed
+
+
+class DiscardedDataset:
+    """Stand-in for a tally dataset that is not written; its writes are dropped"""
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+        self.attrs = {}
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class TallyOutput:
+    """Context that writes the large tally datasets of h5py in the given mode"""
+
+    def __init__(self, mode):
+        self.mode = mode
+
+    def __enter__(self):
+        import h5py
+
+        self.create_dataset = h5py.Group.create_dataset
+        self.setitem = h5py.Group.__setitem__
+        if self.mode == "full":
+            return self
+
+        context = self
+
+        def create_dataset(group, name, shape=None, dtype=None, data=None, **kwargs):
+            if not context.is_tally(group, name, shape, data):
+                return context.create_dataset(group, name, shape, dtype, data, **kwargs)
+            if context.mode == "none":
+                if data is not None:
+                    data = np.asarray(data)
+                    shape, dtype = data.shape, data.dtype
+                return DiscardedDataset(name, tuple(int(n) for n in np.atleast_1d(shape)), dtype)
+            if context.mode == "compressed":
+                kwargs.update(compression="gzip", compression_opts=4, shuffle=True, chunks=True)
+                return context.create_dataset(group, name, shape, dtype, data, **kwargs)
+            # Summary (datasets filled in after their creation are written as they are)
+            if data is None:
+                return context.create_dataset(group, name, shape, dtype, data, **kwargs)
+            data = np.asarray(data)
+            if name.split("/")[-1] == "sdev":
+                total = np.sqrt(np.sum(data.astype(np.float64) ** 2))
+            else:
+                total = np.sum(data, dtype=np.float64)
+            dataset = context.create_dataset(group, name, data=total)
+            dataset.attrs["shape"] = data.shape
+            dataset.attrs["min"] = np.min(data)
+            dataset.attrs["max"] = np.max(data)
+            return dataset
+
+        def setitem(group, name, obj):
+            if isinstance(obj, (np.ndarray, list, tuple)):
+                create_dataset(group, name, data=obj)
+            else:
+                context.setitem(group, name, obj)
+
+        h5py.Group.create_dataset = create_dataset
+        h5py.Group.__setitem__ = setitem
+        return self
+
+    def __exit__(self, *args):
+        import h5py
+
+        h5py.Group.create_dataset = self.create_dataset
+        h5py.Group.__setitem__ = self.setitem
+
+    @staticmethod
+    def is_tally(group, name, shape, data):
+        if name is None:
+            return False
+        path = name if name.startswith("/") else "%s/%s" % (group.name, name)
+        if not path.lstrip("/").startswith("tallies/"):
+            return False
+        size = np.size(data) if data is not None else np.prod(shape or ())
+        return size >= TALLY_MIN_SIZE
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+# ======================================================================================
+# Tally figure of merit
+# ======================================================================================
+# FOM = 1 / (R^2 T), with R the relative error of a tally and T the simulation runtime.
+# A tally is summarized by the mean relative error over its scored (non-zero) bins, so
+# that bins no particle reached do not make the FOM vanish. In Numba mode, the
+# simulation runtime includes the JIT compilation; process.py takes it out of T (of the
+# largest run of the sweep) so that the FOMs compare the techniques, not the compiler.
+
+
+# Tally elements read at a time
+BLOCK_SIZE = 2**22
+
+
+def relative_errors(mean, sdev):
+    """Relative errors of the scored bins of a tally"""
+    mean = np.abs(np.ravel(mean))
+    sdev = np.ravel(sdev)
+    scored = mean > 0.0
+    return sdev[scored] / mean[scored]
+
+
+def fom(relative_error, runtime):
+    """Figure of merit of a tally (None without a positive runtime)"""
+    if runtime is None or runtime <= 0.0:
+        return None
+    return 1.0 / (relative_error**2 * runtime)
+
+
+def blocks(dataset):
+    """Slices reading a dataset in blocks of about BLOCK_SIZE elements along its first axis"""
+    if dataset.ndim == 0:
+        yield ()
+        return
+    step = max(1, BLOCK_SIZE // max(1, int(np.prod(dataset.shape[1:]))))
+    for start in range(0, dataset.shape[0], step):
+        yield slice(start, start + step)
+
+
+def tally_statistics(mean, sdev):
+    """Bin count, total, and mean relative error of a tally, streamed from its datasets"""
+    N_scored = 0
+    R_sum = 0.0
+    total = 0.0
+    for block in blocks(mean):
+        mean_block = mean[block]
+        R = relative_errors(mean_block, sdev[block])
+        N_scored += R.size
+        R_sum += float(np.sum(R))
+        total += float(np.sum(mean_block))
+
+    result = {}
+    result["N_bin"] = int(mean.size)
+    result["N_bin_scored"] = int(N_scored)
+    result["total"] = total
+    if N_scored > 0:
+        result["relative_error"] = R_sum / N_scored
+    return result
@@ -0,0 +1,126 @@
+import argparse
+import numpy as np
+import os
+
+
+# ======================================================================================
+# Energy-group collapsing of the MGXS-SHEM361 library
+# ======================================================================================
+# The library arrays are stored from the lowest to the highest energy group:
+#   SigmaT, SigmaC, SigmaF, nuSigmaF_p, nu_p, v : [G]
+#   SigmaS                                     : [G_out, G_in]
+#   chi_p                                      : [G_out, G_in]
+#   chi_d                                      : [G_out, J]
+#   nu_d                                       : [J, G_in]
+#   E                                          : [G + 1], ascending
+# The collapsing weight is the infinite-medium flux driven by the prompt fission
+# spectrum, so that every collapsed library preserves the fine-group reaction rates of
+# the same reference spectrum.
+
+
+def spectrum(data):
+    """Infinite-medium fine-group flux: (SigmaT - SigmaS) phi = chi"""
+    chi = np.sum(data["chi_p"], axis=1)
+    chi /= np.sum(chi)
+    A = np.diag(data["SigmaT"]) - data["SigmaS"]
+    return np.linalg.solve(A, chi)
+
+
+def coarse_edges(E, G):
+    """
+    Indices of the fine-group edges bounding G coarse groups of (nearly) equal lethargy.
+    The coarse edges are snapped to the fine ones, so the fine groups nest exactly.
+    """
+    G_fine = len(E) - 1
+    if G >= G_fine:
+        return np.arange(G_fine + 1)
+
+    u = np.log(np.maximum(E, E[E > 0.0][0]))
+    targets = np.linspace(u[0], u[-1], G + 1)
+    edges = np.abs(u[:, None] - targets[None, :]).argmin(axis=0)
+    edges[0] = 0
+    edges[-1] = G_fine
+
+    # Keep the edges strictly increasing
+    for i in range(1, G + 1):
+        edges[i] = max(edges[i], edges[i - 1] + 1)
+    for i in range(G - 1, 0, -1):
+        edges[i] = min(edges[i], edges[i + 1] - 1)
+    return edges
+
+
+def collapse(data, G):
+    """Collapse the library into G groups, returning a dict with the same keys"""
+    E = data["E"]
+    edges = coarse_edges(E, G)
+    G = len(edges) - 1
+    phi = spectrum(data)
+
+    def group_sum(x, axis=0):
+        return np.add.reduceat(x, edges[:-1], axis=axis)
+
+    def weighted(x, w):
+        w_sum = group_sum(w)
+        # Fall back to flux weighting where the weight vanishes (e.g. no fission)
+        phi_sum = group_sum(phi)
+        return np.where(
+            w_sum > 0.0,
+            group_sum(x * w) / np.where(w_sum > 0.0, w_sum, 1.0),
+            group_sum(x * phi) / phi_sum,
+        )
+
+    result = {}
+    result["G"] = np.array(G)
+    result["J"] = np.array(data["J"])
+    result["E"] = E[edges]
+    result["lamd"] = data["lamd"]
+
+    # Reaction cross sections
+    for name in ["SigmaT", "SigmaC", "SigmaF", "nuSigmaF_p"]:
+        result[name] = weighted(data[name], phi)
+
+    # Scattering matrix [G_out, G_in]: sum over outgoing, flux-weight the incoming
+    SigmaS = group_sum(data["SigmaS"] * phi[None, :], axis=1) / group_sum(phi)[None, :]
+    result["SigmaS"] = group_sum(SigmaS, axis=0)
+
+    # Fission multiplicities, weighted by the fission rate
+    fission_rate = data["SigmaF"] * phi
+    result["nu_p"] = weighted(data["nu_p"], fission_rate)
+    result["nu_d"] = np.array([weighted(nu_d, fission_rate) for nu_d in data["nu_d"]])
+
+    # Spectra: sum over outgoing, weight the incoming by the prompt production
+    production = data["nu_p"] * fission_rate
+    w = production if np.sum(production) > 0.0 else phi
+    w_sum = group_sum(w)
+    chi_p = group_sum(data["chi_p"] * w[None, :], axis=1)
+    chi_p /= np.where(w_sum > 0.0, w_sum, 1.0)[None, :]
+    result["chi_p"] = group_sum(chi_p, axis=0)
+    result["chi_d"] = group_sum(data["chi_d"], axis=0)
+
+    # Speed, from the flux-weighted inverse velocity
+    result["v"] = group_sum(phi) / group_sum(phi / data["v"])
+
+    return result
+
+
+# ======================================================================================
+# Command line
+# ======================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collapse an MGXS library into fewer groups")
+    parser.add_argument("library", type=str, help="fine-group library, e.g. MGXS-SHEM361.npz")
+    parser.add_argument("--groups", type=int, nargs="+", required=True)
+    parser.add_argument("--output_dir", type=str, nargs="+", default=["."])
+    args = parser.parse_args()
+
+    with np.load(args.library) as f:
+        data = {key: f[key] for key in f.files}
+
+    base = os.path.basename(args.library)[:-4]
+    for G in args.groups:
+        result = collapse(data, G)
+        for output_dir in args.output_dir:
+            file_name = os.path.join(output_dir, "%s-G%i.npz" % (base, G))
+            np.savez(file_name, **result)
+            print("%s (%i groups)" % (file_name, result["G"]))
@@ -0,0 +1,148 @@
+import collections
+import os
+import socket
+import subprocess
+import yaml
+
+
+# ======================================================================================
+# Noisy nodes
+# ======================================================================================
+# Every run records the compute nodes it ran on (see hosts() and suite/run.py). After a
+# campaign, noisy-nodes.py finds the runs that are anomalously slow for their
+# configuration and writes, at the suite root,
+#
+#   noisy_nodes.yaml:  <platform> -> <host> -> {runs: [run], anomalous: [run]}
+#
+# where a run is "<version>/<run folder>/output_<power>", so that the record builds up
+# over campaigns. Suspicious nodes are those that explain the anomalous runs (see
+# suspects()); the drivers exclude them from their submissions with the scheduler's
+# exclude option (see exclude_nodes()).
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NOISY_NODES_FILE = os.path.join(ROOT, "noisy_nodes.yaml")
+
+MIN_ANOMALOUS = 2
+ANOMALOUS_FRACTION = 0.5
+
+
+def hosts(comm=None):
+    """
+    Compute nodes of a run, {host: number of ranks}: gathered over MPI if the run has a
+    communicator, or else the nodes of the campaign step or of the allocation
+    """
+    if comm is not None:
+        names = comm.gather(socket.gethostname(), root=0)
+        if comm.Get_rank() > 0:
+            return None
+        return dict(collections.Counter(names))
+    if "SUITE_NODES" in os.environ:
+        names = os.environ["SUITE_NODES"].split(",")
+    elif "SLURM_JOB_NODELIST" in os.environ:
+        command = ["scontrol", "show", "hostnames", os.environ["SLURM_JOB_NODELIST"]]
+        names = subprocess.run(command, capture_output=True, text=True).stdout.split()
+    elif "LSB_HOSTS" in os.environ:
+        # Slots per host, the first host being the launch node
+        names = os.environ["LSB_HOSTS"].split()[1:]
+    elif "FLUX_URI" in os.environ:
+        command = ["flux", "hostlist", "--expand", "--delimiter= ", "instance"]
+        names = subprocess.run(command, capture_output=True, text=True).stdout.split()
+    else:
+        names = [socket.gethostname()]
+    return {name: 0 for name in names}
+
+
+def load():
+    """The noisy-node record, empty if there is none"""
+    if not os.path.isfile(NOISY_NODES_FILE):
+        return {}
+    with open(NOISY_NODES_FILE, "r") as f:
+        return yaml.safe_load(f) or {}
+
+
+def suspects(record):
+    """
+    The suspicious nodes of a platform record. Nodes are picked one at a time, the one
+    in the most anomalous runs first, and the anomalous runs of a picked node are
+    explained by it (so that the nodes that merely shared its runs are not picked). A
+    node is picked if it was in at least MIN_ANOMALOUS unexplained anomalous runs that
+    make up at least ANOMALOUS_FRACTION of its unexplained runs, and twice the fraction
+    of the unexplained runs without it.
+    """
+    runs = set()
+    anomalous = set()
+    for entry in record.values():
+        runs.update(entry["runs"])
+        anomalous.update(entry["anomalous"])
+
+    picked = []
+    explained = set()
+    while True:
+        best = None
+        for host, entry in record.items():
+            if host in picked:
+                continue
+            host_runs = set(entry["runs"]) - explained
+            host_anomalous = set(entry["anomalous"]) - explained
+            if len(host_anomalous) < MIN_ANOMALOUS:
+                continue
+            fraction = len(host_anomalous) / len(host_runs)
+            other_runs = runs - explained - host_runs
+            other_anomalous = anomalous - explained - host_anomalous
+            fraction_without = len(other_anomalous) / max(len(other_runs), 1)
+            if fraction < ANOMALOUS_FRACTION or fraction < 2.0 * fraction_without:
+                continue
+            key = (len(host_anomalous), fraction)
+            if best is None or key > best[0]:
+                best = (key, host)
+        if best is None:
+            return sorted(picked)
+        picked.append(best[1])
+        explained.update(record[best[1]]["anomalous"])
+
+
+def noisy_nodes(platform):
+    """The suspicious nodes of a platform, sorted"""
+    return suspects(load().get(platform, {}))
+
+
+def update(platform, runs):
+    """
+    Add the runs of a campaign, {run: (hosts, anomalous)}, to the noisy-node record;
+    returns the suspicious nodes of the platform
+    """
+    record = load()
+    nodes = record.setdefault(platform, {})
+    for run, (names, anomalous) in runs.items():
+        for host in names:
+            entry = nodes.setdefault(host, {"runs": [], "anomalous": []})
+            if run not in entry["runs"]:
+                entry["runs"].append(run)
+            if anomalous and run not in entry["anomalous"]:
+                entry["anomalous"].append(run)
+    with open(NOISY_NODES_FILE, "w") as f:
+        yaml.dump(record, f)
+    return noisy_nodes(platform)
+
+
+def exclude_directive(scheduler, names):
+    """Batch script directive excluding the nodes ("" if none)"""
+    if len(names) == 0:
+        return ""
+    if scheduler == "slurm":
+        return "#SBATCH --exclude=%s\n" % ",".join(names)
+    if scheduler == "lsf":
+        return '#BSUB -R "select[%s]"\n' % " && ".join("hname!=%s" % name for name in names)
+    return "#flux: --requires=-host:%s\n" % ",".join(names)
+
+
+def exclude_nodes(text, scheduler, names):
+    """A batch script with the nodes excluded (directive added after the last one)"""
+    directive = exclude_directive(scheduler, names)
+    if directive == "":
+        return text
+    prefix = {"slurm": "#SBATCH", "lsf": "#BSUB", "flux": "#flux:"}[scheduler]
+    lines = text.splitlines(keepends=True)
+    last = max(i for i, line in enumerate(lines) if line.startswith(prefix))
+    return "".join(lines[: last + 1]) + directive + "".join(lines[last + 1 :])
@@ -0,0 +1,519 @@
+import h5py
+import numpy as np
+import os
+import runpy
+import sys
+import xml.etree.ElementTree as ElementTree
+import yaml
+
+
+# ======================================================================================
+# Cross-code workload parity
+# ======================================================================================
+# The MC/DC input (mcdc/input.py) and the OpenMC model (openmc/build-xml.py) of a
+# problem are meant to do the same work. The workload of each is extracted into a
+# common description,
+#
+#   run:             {mode, batches, inactive}
+#   source:          {space, time, energy, angle}
+#   boundaries:      {"<surface type> <coefficients>": boundary condition}
+#   time_cutoff:     time cutoff [s] (None: none)
+#   cross_sections:  {energy_mode, groups, materials: [nuclide fractions, or "macroscopic"]}
+#   tallies:         [{kind, scores, bins: {filter: bins}, total}]
+#
+# and the two are compared by parity.py (see compare()). The MC/DC model is recorded
+# from the calls of the input, which is stopped at mcdc.run():
+#
+#   python -m suite.parity input.py analog [input arguments]   ->  parity-mcdc.yaml
+#
+# and the OpenMC model is read from the XML files written by build-xml.py (see
+# openmc_model()). Multigroup source energies are compared as group indices, in
+# increasing energy order, the way MC/DC numbers its groups.
+
+MCDC_MODEL_FILE = "parity-mcdc.yaml"
+
+# MC/DC model calls recorded
+RECORDED = [
+    "Material",
+    "MaterialMG",
+    "Source",
+    "MeshUniform",
+    "MeshStructured",
+    "TallyGlobal",
+    "TallyCell",
+    "TallyMesh",
+    "TallySurface",
+]
+
+# MC/DC surfaces: OpenMC surface type and the arguments making up its coefficients
+SURFACES = {
+    "PlaneX": ("x-plane", ["x"]),
+    "PlaneY": ("y-plane", ["y"]),
+    "PlaneZ": ("z-plane", ["z"]),
+    "Plane": ("plane", ["A", "B", "C", "D"]),
+    "CylinderX": ("x-cylinder", ["center", "radius"]),
+    "CylinderY": ("y-cylinder", ["center", "radius"]),
+    "CylinderZ": ("z-cylinder", ["center", "radius"]),
+    "Sphere": ("sphere", ["center", "radius"]),
+}
+
+# Boundary conditions that are not boundaries
+TRANSMISSION = [None, "none", "interface", "transmission"]
+
+# OpenMC scores that MC/DC names differently
+SCORES = {"inverse-velocity": "density"}
+
+# Relative tolerance of the numerical comparisons
+TOLERANCE = 1e-6
+
+
+def floats(value):
+    """A number or array as (a list of) plain floats"""
+    array = np.asarray(value, dtype=float)
+    return float(array) if array.ndim == 0 else [float(x) for x in array.ravel()]
+
+
+def bins(grid):
+    """Number of bins of a grid (1 if there is none)"""
+    if grid is None:
+        return 1
+    return max(len(np.atleast_1d(grid)) - 1, 1)
+
+
+def surface_key(kind, coefficients):
+    """Key of a boundary surface, e.g. "x-plane 0" """
+    return " ".join([kind] + ["%g" % c for c in np.atleast_1d(floats(coefficients))])
+
+
+def group_of(energy, edges, side="right"):
+    """Multigroup index (increasing energy) of an energy [eV]"""
+    return int(np.clip(np.searchsorted(edges, energy, side=side) - 1, 0, len(edges) - 2))
+
+
+def groups_of(lower, upper, edges):
+    """Description of the multigroup indices spanned by an energy range [eV]"""
+    groups = list(range(group_of(lower, edges), group_of(upper, edges, "left") + 1))
+    return ["group", groups[0]] if len(groups) == 1 else ["groups", groups]
+
+
+def fractions(composition):
+    """Nuclide fractions of a composition, {nuclide: density}"""
+    total = sum(composition.values())
+    return {name: float("%.6g" % (value / total)) for name, value in sorted(composition.items())}
+
+
+# ======================================================================================
+# MC/DC
+# ======================================================================================
+
+
+class ModelComplete(Exception):
+    """Raised at mcdc.run(), once the input has set the model"""
+
+
+class Recorder:
+    """Records the model calls of an MC/DC input"""
+
+    def __init__(self):
+        # (name, keyword arguments, returned object)
+        self.calls = []
+
+    def wrap(self, owner, name, label, names=()):
+        function = getattr(owner, name)
+
+        def recorded(*args, **kwargs):
+            result = function(*args, **kwargs)
+            arguments = dict(zip(names, args))
+            arguments.update(kwargs)
+            self.calls.append((label, arguments, result))
+            return result
+
+        setattr(owner, name, recorded)
+
+    def install(self):
+        import mcdc
+
+        for name in RECORDED:
+            if hasattr(mcdc, name):
+                self.wrap(mcdc, name, name)
+        for name, (kind, names) in SURFACES.items():
+            if hasattr(mcdc, "Surface") and hasattr(mcdc.Surface, name):
+                self.wrap(mcdc.Surface, name, "Surface.%s" % name, names)
+        if hasattr(mcdc.settings, "set_eigenmode"):
+            self.wrap(mcdc.settings, "set_eigenmode", "set_eigenmode")
+
+        def run(*args, **kwargs):
+            raise ModelComplete()
+
+        mcdc.run = run
+
+    def model(self):
+        """The workload description of the recorded input"""
+        import mcdc
+
+        settings = mcdc.settings
+        calls = self.calls
+
+        def named(name):
+            return [kwargs for label, kwargs, result in calls if label == name]
+
+        # Run
+        run = {"mode": "fixed source", "batches": getattr(settings, "N_batch", None)}
+        for kwargs in named("set_eigenmode"):
+            run = {
+                "mode": "eigenvalue",
+                "batches": kwargs["N_inactive"] + kwargs["N_active"],
+                "inactive": kwargs["N_inactive"],
+            }
+        if run["mode"] == "fixed source":
+            run["inactive"] = 0
+
+        # Cross sections
+        materials = []
+        groups = None
+        for kwargs in named("MaterialMG"):
+            data = [kwargs.get(key) for key in ["capture", "scatter", "fission", "total"]]
+            groups = len(np.atleast_1d(next(x for x in data if x is not None)))
+            materials.append("macroscopic")
+        for kwargs in named("Material"):
+            materials.append(fractions(kwargs["nuclide_composition"]))
+        cross_sections = {
+            "energy_mode": "multi-group" if groups is not None else "continuous-energy",
+            "groups": groups,
+            "materials": sorted(materials, key=str),
+        }
+
+        # Boundaries
+        boundaries = {}
+        for label, kwargs, result in calls:
+            if not label.startswith("Surface."):
+                continue
+            condition = kwargs.get("boundary_condition")
+            if condition in TRANSMISSION:
+                continue
+            kind, names = SURFACES[label[len("Surface.") :]]
+            coefficients = np.concatenate([np.atleast_1d(kwargs[name]) for name in names if name in kwargs])
+            boundaries[surface_key(kind, coefficients)] = condition
+
+        # Time cutoff
+        time_cutoff = getattr(settings, "time_boundary", None)
+        if time_cutoff is not None and not np.isfinite(time_cutoff):
+            time_cutoff = None
+
+        # Tallies
+        meshes = {}
+        for label, kwargs, result in calls:
+            if label == "MeshUniform":
+                meshes[id(result)] = int(
+                    np.prod([kwargs[axis][2] for axis in ["x", "y", "z"] if axis in kwargs])
+                )
+            elif label == "MeshStructured":
+                meshes[id(result)] = int(
+                    np.prod([bins(kwargs[axis]) for axis in ["x", "y", "z"] if axis in kwargs])
+                )
+        tallies = []
+        for label, kwargs, result in calls:
+            if not label.startswith("Tally"):
+                continue
+            tally_bins = {"time": bins(kwargs.get("time"))}
+            energy = kwargs.get("energy")
+            if isinstance(energy, str):
+                tally_bins["energy"] = groups or 1
+            else:
+                tally_bins["energy"] = bins(energy)
+            if label == "TallyMesh":
+                tally_bins["mesh"] = meshes.get(id(kwargs["mesh"]), 1)
+            tallies.append(tally(label[len("Tally") :].lower(), kwargs.get("scores", []), tally_bins))
+
+        return {
+            "run": run,
+            "source": [source(kwargs) for kwargs in named("Source")],
+            "boundaries": boundaries,
+            "time_cutoff": time_cutoff,
+            "cross_sections": cross_sections,
+            "tallies": tallies,
+        }
+
+
+def source(kwargs):
+    """Description of an MC/DC source"""
+    if "position" in kwargs:
+        space = ["point", floats(kwargs["position"])]
+    else:
+        lower = [floats(kwargs[axis][0]) if axis in kwargs else None for axis in "xyz"]
+        upper = [floats(kwargs[axis][1]) if axis in kwargs else None for axis in "xyz"]
+        space = ["box", lower, upper]
+
+    time = kwargs.get("time", 0.0)
+    if np.ndim(time) == 0:
+        time = ["point", floats(time)]
+    else:
+        time = ["uniform"] + floats(time)
+
+    if "energy_group" in kwargs:
+        group = np.asarray(kwargs["energy_group"])
+        groups = [int(g) for g in np.atleast_1d(group if group.ndim < 2 else group[0])]
+        energy = ["group", groups[0]] if len(groups) == 1 else ["groups", groups]
+    elif "energy" in kwargs:
+        value = np.asarray(kwargs["energy"], dtype=float)
+        energy = ["point", floats(value)] if value.ndim == 0 else ["discrete", floats(value[0])]
+    else:
+        energy = None
+
+    angle = ["direction", floats(kwargs["direction"])] if "direction" in kwargs else "isotropic"
+    return {"space": space, "time": time, "energy": energy, "angle": angle}
+
+
+def tally(kind, scores, tally_bins):
+    """Description of a tally (the bins of its filters, 1-bin filters left out)"""
+    tally_bins = {name: int(n) for name, n in tally_bins.items() if n > 1}
+    total = int(np.prod(list(tally_bins.values()) or [1])) * max(len(scores), 1)
+    return {"kind": kind, "scores": sorted(scores), "bins": tally_bins, "total": total}
+
+
+# ======================================================================================
+# OpenMC
+# ======================================================================================
+
+
+def values(element, name):
+    """Numbers of an XML attribute or child element (empty if there is none)"""
+    if element is None:
+        return []
+    text = element.get(name)
+    if text is None:
+        text = element.findtext(name)
+    return [float(x) for x in text.split()] if text else []
+
+
+def distribution(element, edges=None, default=None):
+    """Description of an OpenMC source distribution"""
+    if element is None:
+        return default
+    kind = element.get("type")
+    parameters = values(element, "parameters")
+    if kind == "discrete":
+        points = parameters[: len(parameters) // 2]
+        if edges is not None:
+            groups = sorted(set(group_of(x, edges) for x in points))
+            return ["group", groups[0]] if len(groups) == 1 else ["groups", groups]
+        return ["point", points[0]] if len(points) == 1 else ["discrete", points]
+    if kind == "uniform":
+        if edges is not None:
+            return groups_of(parameters[0], parameters[1], edges)
+        return ["uniform"] + parameters
+    return [kind] + parameters
+
+
+def openmc_model(directory):
+    """The workload description of the OpenMC model written into a directory"""
+    settings = ElementTree.parse(os.path.join(directory, "settings.xml")).getroot()
+    geometry = ElementTree.parse(os.path.join(directory, "geometry.xml")).getroot()
+    materials = ElementTree.parse(os.path.join(directory, "materials.xml")).getroot()
+    tallies_file = os.path.join(directory, "tallies.xml")
+    tallies_root = ElementTree.parse(tallies_file).getroot() if os.path.isfile(tallies_file) else None
+
+    # Run
+    mode = (settings.findtext("run_mode") or "eigenvalue").strip()
+    run = {
+        "mode": mode,
+        "batches": int(settings.findtext("batches")),
+        "inactive": int(settings.findtext("inactive") or 0),
+    }
+
+    # Cross sections (the group structure of a multigroup library, increasing energy)
+    energy_mode = (settings.findtext("energy_mode") or "continuous-energy").strip()
+    groups = None
+    edges = None
+    library = materials.findtext("cross_sections")
+    if energy_mode == "multi-group" and library is not None:
+        library = os.path.join(directory, library.strip())
+        if os.path.isfile(library):
+            with h5py.File(library, "r") as f:
+                edges = np.sort(np.asarray(f.attrs["group structure"], dtype=float))
+            groups = len(edges) - 1
+    compositions = []
+    for material in materials.findall("material"):
+        if material.find("macroscopic") is not None:
+            compositions.append("macroscopic")
+            continue
+        composition = {}
+        for nuclide in material.findall("nuclide"):
+            composition[nuclide.get("name")] = float(nuclide.get("ao") or nuclide.get("wo"))
+        compositions.append(fractions(composition))
+    cross_sections = {
+        "energy_mode": energy_mode,
+        "groups": groups,
+        "materials": sorted(compositions, key=str),
+    }
+
+    # Source
+    sources = []
+    for element in settings.findall("source"):
+        space = element.find("space")
+        parameters = values(space, "parameters")
+        if space is None:
+            space = ["point", [0.0, 0.0, 0.0]]
+        elif space.get("type") == "point":
+            space = ["point", parameters[:3]]
+        elif space.get("type") == "box":
+            space = ["box", parameters[:3], parameters[3:6]]
+        else:
+            space = [space.get("type")] + parameters
+        angle = element.find("angle")
+        if angle is None or angle.get("type") == "isotropic":
+            angle = "isotropic"
+        else:
+            angle = ["direction", values(angle, "reference_uvw")]
+        sources.append(
+            {
+                "space": space,
+                "time": distribution(element.find("time"), default=["point", 0.0]),
+                "energy": distribution(element.find("energy"), edges),
+                "angle": angle,
+            }
+        )
+
+    # Boundaries
+    boundaries = {}
+    for surface in geometry.findall("surface"):
+        condition = surface.get("boundary")
+        if condition in TRANSMISSION:
+            continue
+        boundaries[surface_key(surface.get("type"), values(surface, "coeffs"))] = condition
+
+    # Time cutoff
+    cutoff = settings.find("cutoff")
+    time_cutoff = None
+    if cutoff is not None and len(values(cutoff, "time_neutron")) > 0:
+        time_cutoff = values(cutoff, "time_neutron")[0]
+
+    # Tallies
+    tallies = []
+    if tallies_root is not None:
+        meshes = {}
+        for mesh in tallies_root.findall("mesh"):
+            if mesh.find("dimension") is not None:
+                cells = np.prod(values(mesh, "dimension"))
+            else:
+                cells = np.prod([bins(values(mesh, grid.tag)) for grid in mesh if grid.tag.endswith("_grid")])
+            meshes[mesh.get("id")] = int(cells)
+        filters = {}
+        for element in tallies_root.findall("filter"):
+            kind = element.get("type")
+            filter_bins = {}
+            text = element.get("bins") or element.findtext("bins") or ""
+            if "mesh" in kind:
+                # Time-resolved mesh filters carry their time grid too
+                filter_bins["mesh"] = meshes.get(text.split()[0], 1)
+                for name in list(element.attrib) + [child.tag for child in element]:
+                    if "time" in name:
+                        filter_bins["time"] = bins(values(element, name))
+            elif kind in ["time", "energy"]:
+                filter_bins[kind] = bins(values(element, "bins"))
+            else:
+                filter_bins[kind] = len(text.split())
+            filters[element.get("id")] = filter_bins
+        for element in tallies_root.findall("tally"):
+            tally_bins = {}
+            for filter_id in (element.findtext("filters") or "").split():
+                tally_bins.update(filters[filter_id])
+            kind = "mesh" if "mesh" in tally_bins else "cell" if "cell" in tally_bins else "global"
+            scores = (element.findtext("scores") or "").split()
+            scores = [SCORES.get(score, score) for score in scores]
+            nuclides = (element.findtext("nuclides") or "").split()
+            entry = tally(kind, scores, tally_bins)
+            entry["total"] *= max(len(nuclides), 1)
+            tallies.append(entry)
+
+    return {
+        "run": run,
+        "source": sources,
+        "boundaries": boundaries,
+        "time_cutoff": time_cutoff,
+        "cross_sections": cross_sections,
+        "tallies": tallies,
+    }
+
+
+# ======================================================================================
+# Comparison
+# ======================================================================================
+
+
+def same(a, b):
+    """Whether two descriptions are equal (numbers to TOLERANCE)"""
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return abs(a - b) <= TOLERANCE * max(abs(a), abs(b), 1e-300)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(same(a[key], b[key]) for key in a)
+    return a == b
+
+
+def tally_signature(entry):
+    """Tally description, e.g. "mesh flux (mesh 360000 x time 100)" """
+    filters = " x ".join("%s %i" % item for item in sorted(entry["bins"].items()))
+    return "%s %s (%s)" % (entry["kind"], ",".join(entry["scores"]), filters or "1 bin")
+
+
+def compare(mcdc, openmc):
+    """Mismatches between the MC/DC and OpenMC descriptions: [{item, mcdc, openmc}]"""
+    mismatches = []
+
+    def check(item, a, b):
+        if not same(a, b):
+            mismatches.append({"item": item, "mcdc": a, "openmc": b})
+
+    for key in ["mode", "batches", "inactive"]:
+        check("run %s" % key, mcdc["run"][key], openmc["run"][key])
+    check("number of sources", len(mcdc["source"]), len(openmc["source"]))
+    for i, (a, b) in enumerate(zip(mcdc["source"], openmc["source"])):
+        for key in ["space", "time", "energy", "angle"]:
+            check("source %i %s" % (i, key), a[key], b[key])
+    for surface in sorted(set(mcdc["boundaries"]) | set(openmc["boundaries"])):
+        check(
+            "boundary %s" % surface,
+            mcdc["boundaries"].get(surface),
+            openmc["boundaries"].get(surface),
+        )
+    check("time cutoff", mcdc["time_cutoff"], openmc["time_cutoff"])
+    for key in ["energy_mode", "groups", "materials"]:
+        check("cross sections %s" % key, mcdc["cross_sections"][key], openmc["cross_sections"][key])
+
+    # Tallies: the total bins, and the tallies of one code only
+    check(
+        "tally bins",
+        sum(entry["total"] for entry in mcdc["tallies"]),
+        sum(entry["total"] for entry in openmc["tallies"]),
+    )
+    a = [tally_signature(entry) for entry in mcdc["tallies"]]
+    b = [tally_signature(entry) for entry in openmc["tallies"]]
+    for signature in sorted(set(a) ^ set(b)):
+        check("tally %s" % signature, a.count(signature), b.count(signature))
+    return mismatches
+
+
+# ======================================================================================
+# Recording an MC/DC input
+# ======================================================================================
+
+
+def main():
+    recorder = Recorder()
+    recorder.install()
+    sys.argv = sys.argv[1:]
+    try:
+        runpy.run_path(sys.argv[0], run_name="__main__")
+    except ModelComplete:
+        pass
+    else:
+        print("[ERROR] the input did not call mcdc.run()")
+        sys.exit(1)
+    with open(MCDC_MODEL_FILE, "w") as f:
+        yaml.dump(recorder.model(), f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import glob
+import os
+import yaml
+
+
+# ======================================================================================
+# Platform profiles
+# ======================================================================================
+# Every compute platform is described by platforms/<name>.yaml: its scheduler and
+# submission command, time limits, node resources, and how its MPI runs are launched
+# (launch line, rank-to-core binding, and NUMA policy). Adding a platform means adding
+# a profile; the drivers and post-processors take the list of platforms from there.
+#
+# The rank placement policies of a platform (the "placement" sweep parameter of
+# tasks/parallel.yaml) are listed under its `placements`, by name; a policy overrides
+# the `binding` and `numa` options of the profile, and may add a `wrapper` command
+# (e.g. numactl) that every rank is run under:
+#
+#   placements:
+#       compact: {}
+#       interleave:
+#           numa: ""
+#           wrapper: "numactl --interleave=all"
+#
+# The hybrid MPI x OpenMP runs (OpenMC) are swept over the ranks per node of the
+# profile's `hybrid_ranks_per_node`, each rank running threads on its share of the
+# cores (see hybrid()), the threads bound to the cores with THREAD_BINDING.
+#
+# The "local" platform, a local machine without a batch system, has the built-in
+# profile LOCAL: mpiexec, with the placements done by mpiexec and numactl.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PLATFORMS_DIR = os.path.join(ROOT, "platforms")
+
+# OpenMP thread binding of the hybrid runs, one thread per core of the rank
+THREAD_BINDING = "OMP_PLACES=cores OMP_PROC_BIND=close"
+
+LOCAL = {
+    "name": "local",
+    "cpu_cores_per_node": os.cpu_count(),
+    "gpus_per_node": 0,
+    "launcher": "mpiexec -n %(N_rank)i",
+    "binding": "",
+    "numa": "",
+    "placements": {
+        "compact": {"binding": "--map-by core --bind-to core"},
+        "scatter": {"binding": "--map-by socket --bind-to core"},
+        "threads": {"binding": "--map-by hwthread --bind-to hwthread"},
+        "interleave": {
+            "binding": "--map-by core --bind-to core",
+            "wrapper": "numactl --interleave=all",
+        },
+        "socket": {"binding": "--bind-to none", "wrapper": "numactl --cpunodebind=0 --membind=0"},
+        "none": {"binding": "--bind-to none"},
+    },
+}
+
+
+def platforms():
+    """Names of the platforms with a profile"""
+    return sorted(
+        os.path.basename(file_name)[: -len(".yaml")]
+        for file_name in glob.glob("%s/*.yaml" % PLATFORMS_DIR)
+    )
+
+
+def load(name):
+    """The profile of a platform"""
+    if name == "local":
+        return dict(LOCAL)
+    with open("%s/%s.yaml" % (PLATFORMS_DIR, name), "r") as f:
+        profile = yaml.safe_load(f)
+    profile["name"] = name
+    return profile
+
+
+def format_time(profile, hours):
+    """Time limit of a job in the scheduler's format, e.g. "24:00:00" """
+    return profile["time_format"].replace("XX", str(hours))
+
+
+def hybrid(profile):
+    """(ranks per node, threads per rank) configurations of the hybrid runs"""
+    return [
+        (N_rank_node, max(profile["cpu_cores_per_node"] // N_rank_node, 1))
+        for N_rank_node in profile.get("hybrid_ranks_per_node", [1])
+    ]
+
+
+def hybrid_tag(N_rank_node, N_thread):
+    """Suffix of the run folders and jobs of a hybrid configuration, e.g. "-hybrid_8x14" """
+    return "-hybrid_%ix%i" % (N_rank_node, N_thread)
+
+
+def placements(profile):
+    """Names of the rank placement policies of a platform"""
+    return list(profile.get("placements", {}))
+
+
+def launcher(profile, N_node, N_rank, campaign=False, bind=True, placement=None):
+    """
+    Launch prefix of a run with N_rank ranks on N_node nodes (the cores of the nodes
+    split evenly between the ranks); campaign: as a campaign step (see
+    suite/campaign.py); bind: with the rank-to-core binding and NUMA policy; placement:
+    the rank placement policy (None: the defaults of the profile)
+    """
+    N_rank_node = max(N_rank // N_node, 1)
+    values = {
+        "N_node": N_node,
+        "N_rank": N_rank,
+        "N_rank_node": N_rank_node,
+        "N_core_rank": max(profile["cpu_cores_per_node"] // N_rank_node, 1),
+    }
+    options = dict(profile)
+    if placement is not None:
+        options.update(profile["placements"][placement])
+    parts = [profile["campaign_launcher" if campaign else "launcher"]]
+    if bind:
+        parts += [options.get("binding", ""), options.get("numa", ""), options.get("wrapper", "")]
+    return " ".join(part for part in parts if part != "") % values
@@ -0,0 +1,43 @@
+import os
+import yaml
+
+
+# ======================================================================================
+# Pre-flight records
+# ======================================================================================
+# preflight.py runs every configuration of the drivers at a tiny particle count and
+# writes, at the suite root,
+#
+#   preflight.yaml:  <problem><tag> -> <method> -> <mode> -> {passed, error, cost, ...}
+#
+# The drivers do not submit the configurations that failed. Configurations without a
+# pre-flight record (e.g. preflight.py never run) are submitted as usual.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PREFLIGHT_FILE = os.path.join(ROOT, "preflight.yaml")
+
+# MC/DC modes of the parallel tasks
+MCDC_MODES = {"cpu": "numba"}
+
+
+def mcdc_mode(mode):
+    """The MC/DC --mode of a task mode, e.g. "numba" for the parallel "cpu" mode"""
+    return MCDC_MODES.get(mode, mode)
+
+
+def load():
+    """The pre-flight record, empty if there is none"""
+    if not os.path.isfile(PREFLIGHT_FILE):
+        return {}
+    with open(PREFLIGHT_FILE, "r") as f:
+        return yaml.safe_load(f) or {}
+
+
+def blocked(record, name, method, mode):
+    """Whether a configuration failed its pre-flight run (and says so)"""
+    entry = record.get(name, {}).get(method, {}).get(mcdc_mode(mode))
+    if entry is None or entry["passed"]:
+        return False
+    print("[SKIP] %s %s %s failed its pre-flight run: %s" % (name, method, mode, entry["error"]))
+    return True
@@ -0,0 +1,225 @@
+import glob
+import hashlib
+import importlib.metadata
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import yaml
+
+
+# ======================================================================================
+# Run provenance
+# ======================================================================================
+# Every run writes <PREFIX>-provenance.yaml next to its record (see suite/run.py):
+#
+#   software:     versions of PACKAGES, Python, and the MPI library
+#   environment:  the variables that change how the code runs (ENVIRONMENT_PREFIXES,
+#                 ENVIRONMENT_KEYWORDS)
+#   hardware:     [{hosts: [...], cpu, sockets, cores, threads, numa, memory, governor,
+#                   gpus, ...}], one entry per distinct node configuration of the run
+#
+# The hardware is read on the compute nodes (by the first rank of every node for MPI
+# runs) from /proc and /sys, and the GPUs from nvidia-smi or rocm-smi if there are any.
+# Every entry also has a short digest, so that runs on identical configurations can be
+# told apart from the others at a glance.
+
+PACKAGES = ["mcdc", "numba", "llvmlite", "numpy", "mpi4py", "h5py", "openmc"]
+
+# Environment variables by prefix, and by any of the keywords in their names
+ENVIRONMENT_PREFIXES = ["NUMBA_", "OMP_", "KMP_", "MKL_", "OPENBLAS_", "MCDC_", "SUITE_"]
+ENVIRONMENT_KEYWORDS = ["BIND", "AFFINITY", "DISTRIBUTION", "NUMA", "PLACES"]
+
+
+def digest(data):
+    """Short digest of a record"""
+    text = yaml.dump(data, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+
+def read(file_name):
+    """Stripped content of a (/proc or /sys) file, None if it cannot be read"""
+    try:
+        with open(file_name, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_list(text):
+    """Number of CPUs of a Linux CPU list, e.g. "0-55,112-167" """
+    count = 0
+    for part in text.split(","):
+        if "-" in part:
+            start, stop = part.split("-")
+            count += int(stop) - int(start) + 1
+        elif part != "":
+            count += 1
+    return count
+
+
+def cpu():
+    """CPU model, sockets, cores, and hardware threads (from /proc/cpuinfo)"""
+    text = read("/proc/cpuinfo")
+    if text is None:
+        return {"cpu": platform.processor(), "threads": os.cpu_count()}
+    model = None
+    threads = 0
+    cores = set()
+    sockets = set()
+    for block in text.split("\n\n"):
+        fields = {}
+        for line in block.splitlines():
+            key, _, value = line.partition(":")
+            fields[key.strip()] = value.strip()
+        if "processor" not in fields:
+            continue
+        threads += 1
+        # x86 ("model name") and POWER ("cpu") spell the model differently
+        model = model or fields.get("model name") or fields.get("cpu")
+        socket_id = fields.get("physical id", "0")
+        sockets.add(socket_id)
+        cores.add((socket_id, fields.get("core id", str(threads))))
+    return {"cpu": model, "sockets": len(sockets), "cores": len(cores), "threads": threads}
+
+
+def numa():
+    """NUMA nodes: number of CPUs and memory [GB] of each"""
+    nodes = {}
+    for directory in sorted(glob.glob("/sys/devices/system/node/node[0-9]*")):
+        node = {}
+        cpus = read("%s/cpulist" % directory)
+        if cpus is not None:
+            node["cpus"] = cpu_list(cpus)
+        meminfo = read("%s/meminfo" % directory)
+        if meminfo is not None:
+            for line in meminfo.splitlines():
+                if "MemTotal:" in line:
+                    node["memory"] = round(int(line.split()[-2]) / 1024.0**2, 1)
+        nodes[os.path.basename(directory)] = node
+    return nodes
+
+
+def memory():
+    """Memory size [GB]"""
+    text = read("/proc/meminfo")
+    if text is None:
+        return None
+    for line in text.splitlines():
+        if line.startswith("MemTotal:"):
+            return round(int(line.split()[1]) / 1024.0**2, 1)
+    return None
+
+
+def frequency():
+    """Frequency governor and range [GHz] of the first CPU"""
+    directory = "/sys/devices/system/cpu/cpu0/cpufreq"
+    result = {"governor": read("%s/scaling_governor" % directory)}
+    for key, name in [("min_frequency", "scaling_min_freq"), ("max_frequency", "scaling_max_freq")]:
+        value = read("%s/%s" % (directory, name))
+        if value is not None:
+            result[key] = int(value) / 1e6
+    return result
+
+
+def gpus():
+    """GPU models, memory, and driver (empty if there are none)"""
+    if shutil.which("nvidia-smi") is not None:
+        command = [
+            "nvidia-smi",
+            "--query-gpu=name,memory.total,driver_version",
+            "--format=csv,noheader",
+        ]
+        result = subprocess.run(command, capture_output=True, text=True)
+        return [
+            dict(zip(["name", "memory", "driver"], [field.strip() for field in line.split(",")]))
+            for line in result.stdout.splitlines()
+            if line.strip() != ""
+        ]
+    if shutil.which("rocm-smi") is not None:
+        command = ["rocm-smi", "--showproductname", "--showmeminfo", "vram", "--json"]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            return []
+        cards = json.loads(result.stdout)
+        return [dict(card, card=name) for name, card in cards.items() if name.startswith("card")]
+    return []
+
+
+def hardware():
+    """The configuration of this node"""
+    spec = cpu()
+    spec["numa"] = numa()
+    spec["memory"] = memory()
+    spec.update(frequency())
+    spec["gpus"] = gpus()
+    spec["kernel"] = platform.release()
+    return spec
+
+
+def software():
+    """Versions of the packages, Python, and the MPI library"""
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            pass
+    versions["python"] = platform.python_version()
+    if "mpi4py.MPI" in sys.modules:
+        library = sys.modules["mpi4py.MPI"].Get_library_version()
+        versions["mpi"] = library.strip("\0 \n").splitlines()[0]
+    return versions
+
+
+def environment():
+    """The environment variables that change how the code runs"""
+    return {
+        name: value
+        for name, value in sorted(os.environ.items())
+        if any(name.startswith(prefix) for prefix in ENVIRONMENT_PREFIXES)
+        or any(keyword in name for keyword in ENVIRONMENT_KEYWORDS)
+    }
+
+
+def collect(comm=None):
+    """
+    The provenance of a run (None except on the first rank); with a communicator, the
+    hardware is read by the first rank of every node
+    """
+    host = socket.gethostname()
+    if comm is None:
+        nodes = [(host, hardware())]
+    else:
+        hosts = comm.allgather(host)
+        spec = hardware() if hosts.index(host) == comm.Get_rank() else None
+        nodes = comm.gather((host, spec), root=0)
+        if comm.Get_rank() > 0:
+            return None
+
+    # Nodes with identical configurations are listed together
+    configurations = {}
+    for name, spec in nodes:
+        if spec is None:
+            continue
+        key = digest(spec)
+        configurations.setdefault(key, dict(spec, digest=key, hosts=[]))["hosts"].append(name)
+
+    return {
+        "software": software(),
+        "environment": environment(),
+        "hardware": list(configurations.values()),
+    }
+
+
+def save(file_name, comm=None):
+    """Write the provenance of a run (on the first rank)"""
+    record = collect(comm)
+    if record is None:
+        return None
+    with open(file_name, "w") as f:
+        yaml.dump(record, f)
+    return record
@@ -0,0 +1,209 @@
+import argparse
+import os
+import resource
+import runpy
+import signal
+import subprocess
+import sys
+import time
+import traceback
+import yaml
+
+from suite.instrument import BatchTimer, CycleTimer, OutputTimer, TALLY_OUTPUTS
+from suite.noise import hosts
+from suite.provenance import digest, save as save_provenance
+from suite.snapshot import Snapshot
+from suite.watchdog import particle_count, write_status
+
+
+# ======================================================================================
+# Run wrapper
+# ======================================================================================
+# Runs one test point and writes a compact record <PREFIX>-run.yaml next to the output:
+#
+#   python -m suite.run input.py analog --mode=numba --N_particle=1000 --output=output_1000
+#   python -m suite.run --record output_1000 openmc -s 1
+#   python -m suite.run --record output_10 srun -N 2 -n 16 openmc -s 14
+#
+# Python scripts are executed in-process (so that every MPI rank measures itself);
+# anything else, e.g. an MPI launcher, is executed as a subprocess. The record holds
+#
+#   - exit code, wall time, and peak memory (gathered over the MPI ranks)
+#   - compute nodes and ranks per node (suite/noise.py); hardware, software, and
+#     environment in <PREFIX>-provenance.yaml (suite/provenance.py)
+#   - MC/DC output write time and size; --tally_output (suite/instrument.py)
+#   - with --snapshot, the input deck snapshot used (suite/snapshot.py)
+#   - output metrics, added later by suite/extract.py
+#
+# --cycle_timing and --batch_timing write the per-rank cycle and batch times to
+# <PREFIX>-cycles.h5 and <PREFIX>-batches.h5 (suite/instrument.py). The outcome of the
+# run, including termination by the scheduler, goes to <PREFIX>-status.yaml
+# (suite/watchdog.py).
+
+
+def output_prefix(args):
+    """The --output=<PREFIX> argument of an MC/DC input, if any"""
+    for i, arg in enumerate(args):
+        if arg.startswith("--output="):
+            return arg[len("--output=") :]
+        if arg == "--output" and i + 1 < len(args):
+            return args[i + 1]
+    return None
+
+
+def peak_memory(who):
+    """Peak resident set size [MB]"""
+    return resource.getrusage(who).ru_maxrss / 1024.0
+
+
+def launcher_rank():
+    """Rank of this process as set by the MPI launcher (0 if not launched)"""
+    for name in [
+        "SLURM_PROCID",
+        "FLUX_TASK_RANK",
+        "JSM_NAMESPACE_RANK",
+        "OMPI_COMM_WORLD_RANK",
+        "PMI_RANK",
+        "PMIX_RANK",
+    ]:
+        if name in os.environ:
+            return int(os.environ[name])
+    return 0
+
+
+def mpi_comm():
+    """The MPI world communicator, if the run has initialized mpi4py"""
+    if "mpi4py.MPI" not in sys.modules:
+        return None
+    MPI = sys.modules["mpi4py.MPI"]
+    if not MPI.Is_initialized() or MPI.Is_finalized():
+        return None
+    return MPI.COMM_WORLD
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MC/DC Performance Test Suite - Run wrapper")
+    parser.add_argument("--record", type=str, default=None)
+    parser.add_argument("--cycle_timing", default=False, action="store_true")
+    parser.add_argument("--batch_timing", default=False, action="store_true")
+    parser.add_argument("--tally_output", type=str, default="full", choices=TALLY_OUTPUTS)
+    parser.add_argument("--snapshot", default=False, action="store_true")
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    command = args.command
+    prefix = args.record or output_prefix(command[1:])
+    if prefix is None:
+        parser.error("no --record given and the command has no --output")
+
+    # Record the termination by the scheduler (e.g. at the walltime)
+    def terminated(signum, frame):
+        if launcher_rank() == 0:
+            write_status(
+                os.path.basename(prefix),
+                {"status": "failed", "error": "terminated by signal %i" % signum},
+                os.path.dirname(prefix) or ".",
+                update=True,
+            )
+        os._exit(128 + signum)
+
+    signal.signal(signal.SIGTERM, terminated)
+
+    # Run
+    in_process = command[0].endswith(".py")
+    error_message = None
+    snapshot = Snapshot(command) if in_process and args.snapshot else None
+    exit_code = 0
+    time_start = time.perf_counter()
+    try:
+        if in_process:
+            sys.argv = command[:]
+            output_timer = OutputTimer(args.tally_output)
+            output_timer.install()
+            if args.cycle_timing:
+                timer = CycleTimer()
+                timer.install()
+            if args.batch_timing:
+                batch_timer = BatchTimer()
+                batch_timer.install()
+            if snapshot is not None and snapshot.exists() and snapshot.load():
+                import mcdc
+
+                mcdc.run()
+            else:
+                if snapshot is not None:
+                    snapshot.install()
+                runpy.run_path(command[0], run_name="__main__")
+        else:
+            exit_code = subprocess.run(command).returncode
+    except SystemExit as error:
+        # As the interpreter: exit() is a success, exit("message") a failure
+        if error.code is None or isinstance(error.code, int):
+            exit_code = error.code or 0
+        else:
+            exit_code = 1
+            error_message = str(error.code)
+    except Exception as error:
+        traceback.print_exc()
+        exit_code = 1
+        error_message = "%s: %s" % (type(error).__name__, error)
+    wall_time = time.perf_counter() - time_start
+
+    # Resources
+    memory = peak_memory(resource.RUSAGE_SELF if in_process else resource.RUSAGE_CHILDREN)
+    record = {}
+    record["command"] = " ".join(command)
+    record["exit_code"] = exit_code
+    record["wall_time"] = wall_time
+    record["peak_memory"] = memory
+
+    # Gather over MPI ranks (a subprocess, e.g. an MPI launcher, is recorded by the
+    # wrapper around it)
+    comm = mpi_comm() if in_process else None
+    if in_process and args.cycle_timing:
+        timer.save("%s-cycles.h5" % prefix, comm)
+    if in_process and args.batch_timing:
+        batch_timer.save("%s-batches.h5" % prefix, comm)
+    record["hosts"] = hosts(comm if comm is not None and comm.Get_size() > 1 else None)
+    provenance = save_provenance(
+        "%s-provenance.yaml" % prefix, comm if comm is not None and comm.Get_size() > 1 else None
+    )
+    if comm is not None and comm.Get_size() > 1:
+        memories = comm.gather(memory, root=0)
+        if comm.Get_rank() > 0:
+            sys.exit(exit_code)
+        record["N_rank"] = len(memories)
+        record["peak_memory"] = max(memories)
+        record["peak_memory_total"] = sum(memories)
+
+    # Output writing (MC/DC outputs)
+    if in_process:
+        record["tally_output"] = args.tally_output
+        if output_timer.time is not None:
+            record["output_write_time"] = output_timer.time
+        if os.path.isfile("%s.h5" % prefix):
+            record["output_size"] = os.path.getsize("%s.h5" % prefix) / 1024.0**2
+        if snapshot is not None:
+            record["snapshot"] = snapshot.record
+
+    # Digests of the software and node configurations (see <PREFIX>-provenance.yaml)
+    record["provenance"] = {
+        "software": digest(provenance["software"]),
+        "hardware": [configuration["digest"] for configuration in provenance["hardware"]],
+    }
+
+    with open("%s-run.yaml" % prefix, "w") as f:
+        yaml.dump(record, f)
+
+    # Run status
+    entry = {"status": "completed" if exit_code == 0 else "failed", "wall_time": wall_time}
+    if particle_count(command) is not None:
+        entry["N_particle"] = particle_count(command)
+    if exit_code != 0:
+        entry["error"] = error_message or "exit code %s" % exit_code
+    write_status(os.path.basename(prefix), entry, os.path.dirname(prefix) or ".", update=True)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import glob
+import h5py
+import math
+import numpy as np
+import os
+
+from suite.tasks import CASES
+
+# ======================================================================================
+# Scaling models
+# ======================================================================================
+# The runtime T of a run with N particles on n nodes is modeled as a sum of terms,
+#
+#   T(n, N) = t_0 + a N/n + b N + c log2(n)
+#
+#   t_0       fixed cost (start-up, compilation, output)
+#   a N/n     perfectly parallel work (tracking)
+#   b N       work that does not shrink with the nodes (Amdahl's serial fraction)
+#   c log2(n) communication (tree reductions, fission-bank synchronization)
+#
+# MODELS are the subsets of these terms that are fitted; "gustafson" (fixed cost and
+# parallel work only) scales perfectly in the weak sense. The coefficients are fitted by
+# least squares of the relative residuals (runtimes span orders of magnitude), and the
+# model with the smallest corrected Akaike information criterion among those with
+# non-negative coefficients is kept. Every completed run of the weak-scaling sweeps is a
+# point: the powers of a node count vary N at fixed n, and the power p at n nodes and
+# p - 1 at 2n nodes are strong-scaling pairs.
+
+TERMS = {
+    "fixed": lambda n, N: np.ones_like(N),
+    "parallel": lambda n, N: N / n,
+    "serial": lambda n, N: N,
+    "communication": lambda n, N: np.log2(n),
+}
+
+MODELS = {
+    "gustafson": ["fixed", "parallel"],
+    "amdahl": ["fixed", "parallel", "serial"],
+    "communication": ["fixed", "parallel", "communication"],
+    "amdahl-communication": ["fixed", "parallel", "serial", "communication"],
+}
+
+# Number of standard deviations of the upper bounds
+Z = 2.0
+
+# Largest number of N_base doublings searched for a proposal
+MAX_DOUBLINGS = 64
+
+
+def scaling_points(pattern, nodes, N_base, runtime_key):
+    """
+    The completed runs of a weak-scaling sweep, {"N_node", "N_particle", "runtime"}
+    arrays; pattern gives the run folder of a node count, e.g.
+    "mcdc/output/parallel-dane-analog-cpu-node_%i"
+    """
+    N_node, N_particle, runtime = [], [], []
+    for n in nodes:
+        for file_name in glob.glob("%s/output_*-runtime.h5" % (pattern % n)):
+            power = int(os.path.basename(file_name)[len("output_") : -len("-runtime.h5")])
+            with h5py.File(file_name, "r") as f:
+                runtime.append(float(f[runtime_key][()]))
+            N_node.append(n)
+            N_particle.append(2**power * n * N_base)
+    return {
+        "N_node": np.array(N_node, dtype=float),
+        "N_particle": np.array(N_particle, dtype=float),
+        "runtime": np.array(runtime, dtype=float),
+    }
+
+
+def design(terms, N_node, N_particle):
+    """The terms evaluated at the runs, one row per run"""
+    N_node, N_particle = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(N_node, dtype=float)),
+        np.atleast_1d(np.asarray(N_particle, dtype=float)),
+    )
+    return np.stack([TERMS[term](N_node, N_particle) for term in terms], axis=1)
+
+
+def fit_model(name, points):
+    """Fit a model (None if the points do not determine it); see predict()"""
+    terms = MODELS[name]
+    N_point = len(points["runtime"])
+    N_term = len(terms)
+    if N_point <= N_term + 1:
+        return None
+
+    # Relative residuals: each row is divided by its runtime
+    A = design(terms, points["N_node"], points["N_particle"]) / points["runtime"][:, None]
+    y = np.ones(N_point)
+    if np.linalg.matrix_rank(A) < N_term:
+        return None
+    coefficients, _, _, _ = np.linalg.lstsq(A, y, rcond=None)
+    if np.any(coefficients < 0.0):
+        return None
+
+    residual = y - A @ coefficients
+    RSS = float(residual @ residual)
+    scatter = math.sqrt(RSS / (N_point - N_term))
+    covariance = scatter**2 * np.linalg.inv(A.T @ A)
+
+    # Corrected Akaike information criterion (RSS floored for exact fits)
+    k = N_term + 1
+    AICc = N_point * math.log(max(RSS, 1e-12) / N_point) + 2 * k
+    if N_point - k - 1 > 0:
+        AICc += 2 * k * (k + 1) / (N_point - k - 1)
+    else:
+        AICc = math.inf
+
+    return {
+        "model": name,
+        "terms": terms,
+        "coefficients": coefficients.tolist(),
+        "covariance": covariance.tolist(),
+        "scatter": scatter,
+        "AICc": AICc,
+        "N_point": N_point,
+    }
+
+
+def fit(points):
+    """The best-supported model of the points (None if no model can be fitted)"""
+    fits = [fit_model(name, points) for name in MODELS]
+    fits = [model for model in fits if model is not None]
+    if len(fits) == 0:
+        return None
+    return min(fits, key=lambda model: model["AICc"])
+
+
+def predict(model, N_node, N_particle):
+    """
+    Predicted runtime [s] and its standard deviation [s]: the coefficient uncertainty
+    and the relative scatter of the runs about the model
+    """
+    x = design(model["terms"], N_node, N_particle)
+    T = x @ np.array(model["coefficients"])
+    variance = np.einsum("ij,jk,ik->i", x, np.array(model["covariance"]), x)
+    sigma = np.sqrt(variance + (model["scatter"] * T) ** 2)
+    if np.ndim(N_node) == 0 and np.ndim(N_particle) == 0:
+        return float(T[0]), float(sigma[0])
+    return T, sigma
+
+
+def weak_efficiency(model, N_node, N_base):
+    """Predicted weak-scaling efficiency at N_base particles per node, relative to 1 node"""
+    T_1, _ = predict(model, 1, N_base)
+    T, sigma = predict(model, N_node, np.asarray(N_node) * N_base)
+    return T_1 / T, T_1 * sigma / T**2
+
+
+def strong_efficiency(model, N_node, N_particle):
+    """Predicted strong-scaling efficiency of a run of N_particle, relative to 1 node"""
+    T_1, _ = predict(model, 1, N_particle)
+    T, sigma = predict(model, N_node, N_particle)
+    return T_1 / (N_node * T), T_1 * sigma / (N_node * T**2)
+
+
+def propose_N_base(model, N_node, target):
+    """
+    The N_base whose power-0 run on N_node nodes takes target [s] at the upper bound
+    (None if the fixed costs alone exceed the target, or no N_base within
+    MAX_DOUBLINGS doublings reaches it, e.g. a model without particle-count terms)
+    """
+
+    def upper(N_base):
+        T, sigma = predict(model, N_node, N_node * N_base)
+        return T + Z * sigma
+
+    low, high = 1.0, 1.0
+    if upper(low) > target:
+        return None
+    for _ in range(MAX_DOUBLINGS):
+        if upper(high) >= target:
+            break
+        high *= 2.0
+    else:
+        return None
+    # Bisection in log space
+    for _ in range(60):
+        middle = math.sqrt(low * high)
+        if upper(middle) < target:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def case_times(model, N_node, N_base):
+    """Upper-bound time [h] of every sweep case of a node count"""
+    times = {}
+    for case, _, powers in CASES:
+        total = 0.0
+        for power in powers:
+            T, sigma = predict(model, N_node, 2**power * N_node * N_base)
+            total += T + Z * sigma
+        times[case] = total / 3600.0
+    return times
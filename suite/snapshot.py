@@ -0,0 +1,194 @@
+import glob
+import hashlib
+import importlib
+import importlib.metadata
+import os
+import pickle
+import tempfile
+import time
+import yaml
+
+from suite.spec import find
+
+
+# ======================================================================================
+# Model snapshots
+# ======================================================================================
+# Building a model (e.g. the SMR core) through the MC/DC Python input calls can take
+# seconds, repeated by every rank of every run. The fully constructed input deck (the
+# simulation object of the MC/DC object API: its settings, techniques, and registered
+# materials, surfaces, cells, sources, tallies, ...) is pickled the first time a model
+# is run, right before mcdc.run(), into
+#
+#   $MCDC_SUITE_SNAPSHOTS/<key>.pkl    (default: <suite root>/data/snapshots)
+#
+# keyed by the hash of the staged input files, the MC/DC version, and the input
+# arguments (MC/DC's own run options, such as --N_particle, do not change the deck).
+# Later runs restore the deck and call mcdc.run() without executing the input script.
+# The snapshot also holds the digest of the saved deck; a snapshot whose deck does not
+# restore to that digest is not used, and the input is executed instead. MC/DC versions
+# without a recognized input deck simply run the input as usual.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where the input deck lives: (module, attribute)
+INPUT_DECKS = [("mcdc.object_.simulation", "simulation")]
+
+# Module attributes that alias attributes of the input deck: (module, attribute)
+ALIASES = [("mcdc", "settings")]
+
+# Input deck attributes of the running process, not of the model
+PROCESS_ATTRIBUTES = ["mpi_size", "mpi_rank", "mpi_master"]
+
+# MC/DC command-line options that do not affect the input deck
+RUN_OPTIONS = [
+    "--mode",
+    "--N_particle",
+    "--output",
+    "--progress_bar",
+    "--no-progress_bar",
+    "--caching",
+    "--no_caching",
+    "--clear_cache",
+    "--runtime_output",
+    "--target",
+]
+
+
+def snapshot_dir():
+    return os.environ.get("MCDC_SUITE_SNAPSHOTS", os.path.join(ROOT, "data", "snapshots"))
+
+
+def input_deck():
+    """The MC/DC input deck object, if this MC/DC version has a recognized one"""
+    for module_name, name in INPUT_DECKS:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        if hasattr(module, name):
+            return getattr(module, name)
+    return None
+
+
+def input_hash(script):
+    """
+    Hash of the input files: the staged manifest if any, else the Python files and the
+    problem specification
+    """
+    directory = os.path.dirname(os.path.abspath(script))
+    manifest = os.path.join(directory, "staged.yaml")
+    sha256 = hashlib.sha256()
+    if os.path.isfile(manifest):
+        with open(manifest, "r") as f:
+            files = yaml.safe_load(f)["files"]
+        for name in sorted(files):
+            sha256.update(("%s:%s\n" % (name, files[name])).encode())
+    else:
+        file_names = glob.glob(os.path.join(directory, "*.py"))
+        file_names += [file_name for file_name in [find(directory)] if file_name is not None]
+        for file_name in sorted(file_names):
+            with open(file_name, "rb") as f:
+                sha256.update(f.read())
+    return sha256.hexdigest()
+
+
+def deck_digest(state):
+    """
+    Digest of the pickled input deck state; that of an unpickled state, as pickling
+    the live deck shares objects (e.g. strings) that unpickling does not
+    """
+    data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha256(data).hexdigest()
+
+
+def snapshot_key(command):
+    """Snapshot key of an input command (script and arguments)"""
+    arguments = [
+        arg for arg in command[1:] if arg.split("=")[0] not in RUN_OPTIONS
+    ]
+    sha256 = hashlib.sha256()
+    sha256.update(input_hash(command[0]).encode())
+    sha256.update(importlib.metadata.version("mcdc").encode())
+    sha256.update(" ".join(arguments).encode())
+    return sha256.hexdigest()[:32]
+
+
+class Snapshot:
+    """Save or restore the MC/DC input deck of an input command"""
+
+    def __init__(self, command):
+        self.file_name = os.path.join(snapshot_dir(), "%s.pkl" % snapshot_key(command))
+        self.record = {"key": os.path.basename(self.file_name)[:-4]}
+
+    def exists(self):
+        return os.path.isfile(self.file_name)
+
+    def load(self):
+        """Restore the input deck in place; returns False if it cannot be restored"""
+        deck = input_deck()
+        if deck is None:
+            self.record["status"] = "unsupported"
+            return False
+        time_start = time.perf_counter()
+        with open(self.file_name, "rb") as f:
+            snapshot = pickle.load(f)
+        if not isinstance(snapshot, dict) or "digest" not in snapshot:
+            self.record["status"] = "invalid"
+            return False
+        state = pickle.loads(snapshot["deck"])
+        if deck_digest(state) != snapshot["digest"]:
+            self.record["status"] = "mismatch"
+            self.record["fallback"] = "restored deck digest differs from the saved one"
+            return False
+
+        # In place, as MC/DC modules hold references to the deck object
+        for name in PROCESS_ATTRIBUTES:
+            if name in deck.__dict__:
+                state[name] = deck.__dict__[name]
+        deck.__dict__.clear()
+        deck.__dict__.update(state)
+        for module_name, name in ALIASES:
+            module = importlib.import_module(module_name)
+            if hasattr(module, name) and name in state:
+                setattr(module, name, state[name])
+        self.record["status"] = "loaded"
+        self.record["load_time"] = time.perf_counter() - time_start
+        self.record["size"] = os.path.getsize(self.file_name) / 1024.0**2
+        return True
+
+    def install(self):
+        """Save the input deck when the input calls mcdc.run()"""
+        import mcdc
+
+        run = mcdc.run
+
+        def saved_run(*args, **kwargs):
+            self.save()
+            return run(*args, **kwargs)
+
+        mcdc.run = saved_run
+
+    def save(self):
+        deck = input_deck()
+        if deck is None:
+            self.record["status"] = "unsupported"
+            return
+        time_start = time.perf_counter()
+        try:
+            state = pickle.dumps(deck.__dict__, protocol=pickle.HIGHEST_PROTOCOL)
+            snapshot = {"digest": deck_digest(pickle.loads(state)), "deck": state}
+            data = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as error:
+            self.record["status"] = "unpicklable: %s" % error
+            return
+
+        # Concurrent writers (MPI ranks) are fine: the last rename wins, same content
+        os.makedirs(snapshot_dir(), exist_ok=True)
+        fd, temporary = tempfile.mkstemp(prefix=".snapshot-", dir=snapshot_dir())
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temporary, self.file_name)
+        self.record["status"] = "saved"
+        self.record["save_time"] = time.perf_counter() - time_start
+        self.record["size"] = len(data) / 1024.0**2
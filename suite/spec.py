@@ -0,0 +1,392 @@
+import argparse
+import numpy as np
+import os
+import yaml
+
+
+# ======================================================================================
+# Problem specifications
+# ======================================================================================
+# A problem may be specified once, declaratively, in test_suite/<problem>/problem.yaml;
+# its MC/DC input (mcdc/input.py) and OpenMC model (openmc/build-xml.py) are then both
+# generated from it (see mcdc_model() and build_openmc()), so that the two codes do the
+# same work:
+#
+#   parameters:     {<name>: default, or [choices] (the first is the default)}, set by
+#                    the input arguments --<name>=<value>
+#   energy_groups:  group structure of the multigroup data [eV] (default: [0, 2e7])
+#   materials:      {<name>: multigroup data (capture, scatter, fission, nu_p, chi_p,
+#                    speed; as mcdc.MaterialMG, in increasing energy order), or
+#                    {nuclides: {<nuclide>: density}}}
+#   surfaces:       {<name>: {type: plane-x|plane-y|plane-z|cylinder-z|sphere,
+#                    x|y|z|center|radius, boundary: vacuum|reflective}}
+#   regions:        {<name>: expression of the surfaces and the regions above it}
+#   cells:          {<name>: {region: expression, fill: material}}
+#   source:         {x, y, z | position, time, energy_group | energy, isotropic}
+#   tallies:        [{kind: global|cell|mesh, scores, time, energy: all (the groups),
+#                     cell, mesh: {x, y, z}, when: condition (default: true)}]
+#   settings:       {particles, batches, time_cutoff, eigenvalue: {inactive, active}}
+#
+# The parameters are the size knobs of the problem (tally resolution, group count,
+# ...); any number may be an expression of them, "= 60 * resolution", and any grid a
+# {linspace: [start, stop, points]} or {logspace: [...]} as well as a list; a tally
+# whose "when" is false, e.g. "= tallies == 'native'", is left out. They are
+# sweep parameters like any other (see suite/tasks.py), e.g. in tasks/serial.yaml:
+#
+#   kobayashi:
+#       parameters:
+#           resolution: [1, 2]
+#
+# The specification is staged with the inputs of both codes (see suite/staging.py).
+
+SPEC_FILE = "problem.yaml"
+
+# Axis-aligned planes: MC/DC surface, OpenMC surface, and coordinate
+PLANES = {
+    "plane-x": ("PlaneX", "XPlane", "x"),
+    "plane-y": ("PlaneY", "YPlane", "y"),
+    "plane-z": ("PlaneZ", "ZPlane", "z"),
+}
+
+# Temperature of the OpenMC multigroup library [K]
+TEMPERATURE = 294.0
+
+# Extent of the OpenMC mesh axes the MC/DC mesh does not have
+UNBOUNDED = 1e10
+
+# MC/DC scores that OpenMC names differently
+OPENMC_SCORES = {"density": "inverse-velocity"}
+
+
+def evaluate(value, parameters):
+    """A specification value with its expressions evaluated and its grids built"""
+    if isinstance(value, str) and value.startswith("="):
+        return eval(value[1:], {"np": np}, dict(parameters))
+    if isinstance(value, list):
+        return [evaluate(item, parameters) for item in value]
+    if isinstance(value, dict):
+        value = {key: evaluate(item, parameters) for key, item in value.items()}
+        if list(value) == ["linspace"]:
+            start, stop, points = value["linspace"]
+            return np.linspace(start, stop, int(points))
+        if list(value) == ["logspace"]:
+            start, stop, points = value["logspace"]
+            return np.logspace(start, stop, int(points))
+        return value
+    return value
+
+
+def find(directory="."):
+    """
+    The specification file of a model folder (staged, or test_suite/<problem>/<code>),
+    None if the problem has none
+    """
+    for file_name in [
+        os.path.join(directory, SPEC_FILE),
+        os.path.join(os.path.dirname(os.path.abspath(directory)), SPEC_FILE),
+    ]:
+        if os.path.isfile(file_name):
+            return file_name
+    return None
+
+
+def load(file_name=None, argv=None):
+    """
+    The specification of a problem (default: that of the current folder, see find()),
+    its parameters set by the input arguments
+    """
+    with open(file_name or find(), "r") as f:
+        spec = yaml.safe_load(f)
+
+    parameters = dict(spec.get("parameters", {}))
+    parser = argparse.ArgumentParser(allow_abbrev=False)
+    for name, default in parameters.items():
+        if isinstance(default, list):
+            parser.add_argument(
+                "--%s" % name, type=type(default[0]), default=default[0], choices=default
+            )
+        else:
+            parser.add_argument("--%s" % name, type=type(default), default=default)
+    args, unargs = parser.parse_known_args(argv)
+    parameters.update(vars(args))
+
+    spec = {key: evaluate(value, parameters) for key, value in spec.items() if key != "parameters"}
+    if "tallies" in spec:
+        spec["tallies"] = [tally for tally in spec["tallies"] if tally.pop("when", True)]
+    spec["parameters"] = parameters
+    spec.setdefault("energy_groups", np.array([0.0, 2e7]))
+    return spec
+
+
+def regions(spec, surfaces):
+    """The regions and cell regions of a problem, built from its surfaces"""
+    namespace = dict(surfaces)
+    for name, expression in spec.get("regions", {}).items():
+        namespace[name] = eval(expression, {"__builtins__": {}}, namespace)
+    return {
+        name: eval(cell["region"], {"__builtins__": {}}, namespace)
+        for name, cell in spec["cells"].items()
+    }
+
+
+def multigroup(spec):
+    """Whether a problem is multigroup"""
+    return any("nuclides" not in data for data in spec["materials"].values())
+
+
+# ======================================================================================
+# MC/DC
+# ======================================================================================
+
+
+def mcdc_model(spec):
+    """
+    Set the MC/DC model of a problem (the input then sets its method and runs MC/DC);
+    returns its cells, by name
+    """
+    import mcdc
+
+    # Materials
+    materials = {}
+    for name, data in spec["materials"].items():
+        if "nuclides" in data:
+            materials[name] = mcdc.Material(nuclide_composition=data["nuclides"])
+        else:
+            materials[name] = mcdc.MaterialMG(**{key: np.array(x) for key, x in data.items()})
+
+    # Surfaces
+    surfaces = {}
+    for name, data in spec["surfaces"].items():
+        kwargs = {}
+        if data.get("boundary") is not None:
+            kwargs["boundary_condition"] = data["boundary"]
+        kind = data["type"]
+        if kind in PLANES:
+            surface, _, axis = PLANES[kind]
+            kwargs[axis] = data[axis]
+            surfaces[name] = getattr(mcdc.Surface, surface)(**kwargs)
+        elif kind == "cylinder-z":
+            surfaces[name] = mcdc.Surface.CylinderZ(
+                center=data.get("center", [0.0, 0.0]), radius=data["radius"], **kwargs
+            )
+        elif kind == "sphere":
+            surfaces[name] = mcdc.Surface.Sphere(
+                center=data.get("center", [0.0, 0.0, 0.0]), radius=data["radius"], **kwargs
+            )
+        else:
+            raise ValueError("Unsupported surface type: %s" % kind)
+
+    # Cells
+    cell_regions = regions(spec, surfaces)
+    cells = {
+        name: mcdc.Cell(region=cell_regions[name], fill=materials[cell["fill"]])
+        for name, cell in spec["cells"].items()
+    }
+
+    # Source
+    mcdc.Source(**spec["source"])
+
+    # Tallies
+    for data in spec.get("tallies", []):
+        kwargs = {"scores": data["scores"]}
+        if "time" in data:
+            kwargs["time"] = np.array(data["time"])
+        if isinstance(data.get("energy"), str):
+            kwargs["energy"] = "all_groups"
+        elif "energy" in data:
+            kwargs["energy"] = np.array(data["energy"])
+        if data["kind"] == "global":
+            mcdc.TallyGlobal(**kwargs)
+        elif data["kind"] == "cell":
+            mcdc.TallyCell(cell=cells[data["cell"]], **kwargs)
+        elif data["kind"] == "mesh":
+            mesh = mcdc.MeshStructured(
+                **{axis: np.array(grid) for axis, grid in data["mesh"].items()}
+            )
+            mcdc.TallyMesh(mesh=mesh, **kwargs)
+        else:
+            raise ValueError("Unsupported tally kind: %s" % data["kind"])
+
+    # Settings
+    settings = spec["settings"]
+    if "particles" in settings:
+        mcdc.settings.N_particle = settings["particles"]
+    if "eigenvalue" in settings:
+        mcdc.settings.set_eigenmode(
+            N_inactive=settings["eigenvalue"]["inactive"],
+            N_active=settings["eigenvalue"]["active"],
+        )
+    else:
+        mcdc.settings.N_batch = settings["batches"]
+    if "time_cutoff" in settings:
+        mcdc.settings.time_boundary = settings["time_cutoff"]
+
+    return cells
+
+
+# ======================================================================================
+# OpenMC
+# ======================================================================================
+
+
+def xsdata(name, data, groups):
+    """
+    OpenMC multigroup data of a material; OpenMC orders the groups by decreasing
+    energy, and its scattering matrix is [gin, gout]
+    """
+    import openmc
+
+    G = groups.num_groups
+    unknown = set(data) - set(["capture", "scatter", "fission", "nu_p", "chi_p", "speed"])
+    if len(unknown) > 0:
+        raise ValueError("Multigroup data not supported by OpenMC models: %s" % sorted(unknown))
+
+    capture = np.array(data.get("capture", np.zeros(G)), dtype=float)
+    scatter = np.array(data.get("scatter", np.zeros((G, G))), dtype=float)
+    fission = np.array(data.get("fission", np.zeros(G)), dtype=float)
+    speed = np.array(data.get("speed", np.ones(G)), dtype=float)
+    absorption = capture + fission
+    total = absorption + np.sum(scatter, 0)
+
+    result = openmc.XSdata(name, groups)
+    result.order = 0
+    result.set_inverse_velocity(np.flip(1.0 / speed), temperature=TEMPERATURE)
+    result.set_total(np.flip(total), temperature=TEMPERATURE)
+    result.set_absorption(np.flip(absorption), temperature=TEMPERATURE)
+    result.set_scatter_matrix(
+        np.expand_dims(np.transpose(np.flip(scatter)), 2), temperature=TEMPERATURE
+    )
+    if np.any(fission > 0.0):
+        nu_p = np.array(data["nu_p"], dtype=float)
+        # A fission spectrum independent of the inducing neutron energy
+        chi_p = np.array(data.get("chi_p", np.ones((G, G))), dtype=float)
+        chi_p = np.sum(chi_p, axis=1) / np.sum(chi_p)
+        result.set_nu_fission(np.flip(nu_p * fission), temperature=TEMPERATURE)
+        result.set_chi(np.flip(chi_p), temperature=TEMPERATURE)
+    return result
+
+
+def build_openmc(spec, N):
+    """
+    Write the OpenMC model of a problem with N particles per batch into the current
+    directory (the XML files, and mgxs.h5 for multigroup problems)
+    """
+    import openmc
+    import openmc.mgxs
+
+    edges = np.array(spec["energy_groups"], dtype=float)
+
+    # Materials
+    materials = {}
+    for name, data in spec["materials"].items():
+        material = openmc.Material(name=name)
+        if "nuclides" in data:
+            for nuclide, density in data["nuclides"].items():
+                material.add_nuclide(nuclide, density)
+            material.set_density("sum")
+        else:
+            material.set_density("macro", 1.0)
+            material.add_macroscopic(name)
+        materials[name] = material
+    collection = openmc.Materials(materials.values())
+    if multigroup(spec):
+        groups = openmc.mgxs.EnergyGroups(edges)
+        library = openmc.MGXSLibrary(groups)
+        for name, data in spec["materials"].items():
+            if "nuclides" not in data:
+                library.add_xsdata(xsdata(name, data, groups))
+        library.export_to_hdf5("mgxs.h5")
+        collection.cross_sections = "mgxs.h5"
+    collection.export_to_xml()
+
+    # Geometry
+    surfaces = {}
+    for name, data in spec["surfaces"].items():
+        kwargs = {"boundary_type": data.get("boundary") or "transmission"}
+        kind = data["type"]
+        if kind in PLANES:
+            _, surface, axis = PLANES[kind]
+            surfaces[name] = getattr(openmc, surface)(data[axis], **kwargs)
+        elif kind == "cylinder-z":
+            x0, y0 = data.get("center", [0.0, 0.0])
+            surfaces[name] = openmc.ZCylinder(x0=x0, y0=y0, r=data["radius"], **kwargs)
+        elif kind == "sphere":
+            x0, y0, z0 = data.get("center", [0.0, 0.0, 0.0])
+            surfaces[name] = openmc.Sphere(x0=x0, y0=y0, z0=z0, r=data["radius"], **kwargs)
+        else:
+            raise ValueError("Unsupported surface type: %s" % kind)
+    cell_regions = regions(spec, surfaces)
+    cells = {
+        name: openmc.Cell(name=name, region=cell_regions[name], fill=materials[cell["fill"]])
+        for name, cell in spec["cells"].items()
+    }
+    openmc.Geometry(list(cells.values())).export_to_xml()
+
+    # Source
+    source = spec["source"]
+    if "position" in source:
+        space = openmc.stats.Point(source["position"])
+    else:
+        lower = [source[axis][0] if axis in source else -UNBOUNDED for axis in "xyz"]
+        upper = [source[axis][1] if axis in source else UNBOUNDED for axis in "xyz"]
+        space = openmc.stats.Box(lower, upper)
+    time = source.get("time", 0.0)
+    if np.ndim(time) == 0:
+        time = openmc.stats.Discrete([time], [1.0])
+    else:
+        time = openmc.stats.Uniform(time[0], time[1])
+    if "energy_group" in source:
+        # The middle of the group, in increasing energy order as MC/DC numbers them
+        g = source["energy_group"]
+        energy = openmc.stats.Discrete([0.5 * (edges[g] + edges[g + 1])], [1.0])
+    else:
+        energy = openmc.stats.Discrete([source.get("energy", 2e6)], [1.0])
+
+    # Settings
+    settings = openmc.Settings()
+    data = spec["settings"]
+    if "eigenvalue" in data:
+        settings.run_mode = "eigenvalue"
+        settings.inactive = data["eigenvalue"]["inactive"]
+        settings.batches = data["eigenvalue"]["inactive"] + data["eigenvalue"]["active"]
+    else:
+        settings.run_mode = "fixed source"
+        settings.batches = data["batches"]
+    settings.particles = N
+    if multigroup(spec):
+        settings.energy_mode = "multi-group"
+    if "time_cutoff" in data:
+        settings.cutoff = {"time_neutron": data["time_cutoff"]}
+    settings.source = openmc.IndependentSource(
+        space=space, angle=openmc.stats.Isotropic(), time=time, energy=energy
+    )
+    settings.output = {"tallies": False}
+    settings.export_to_xml()
+
+    # Tallies
+    tallies = openmc.Tallies()
+    for i, data in enumerate(spec.get("tallies", [])):
+        filters = []
+        if data["kind"] == "cell":
+            filters.append(openmc.CellFilter([cells[data["cell"]]]))
+        if data["kind"] == "mesh":
+            mesh = openmc.RectilinearMesh()
+            for axis in "xyz":
+                grid = data["mesh"].get(axis, [-UNBOUNDED, UNBOUNDED])
+                setattr(mesh, "%s_grid" % axis, np.array(grid, dtype=float))
+            if "time" in data:
+                filters.append(openmc.TimedMeshFilter(mesh, np.array(data["time"])))
+            else:
+                filters.append(openmc.MeshFilter(mesh))
+        elif "time" in data:
+            filters.append(openmc.TimeFilter(np.array(data["time"])))
+        if isinstance(data.get("energy"), str):
+            filters.append(openmc.EnergyFilter(edges))
+        elif "energy" in data:
+            filters.append(openmc.EnergyFilter(np.array(data["energy"])))
+        tally = openmc.Tally(name="%s_%i" % (data["kind"], i))
+        tally.filters = filters
+        tally.estimator = "tracklength"
+        tally.scores = [OPENMC_SCORES.get(score, score) for score in data["scores"]]
+        tallies.append(tally)
+    tallies.export_to_xml()
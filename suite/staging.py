@@ -0,0 +1,110 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import yaml
+
+from suite.spec import find
+
+
+# ======================================================================================
+# Run-directory staging
+# ======================================================================================
+# The input files of a problem (the files, not the folders, of test_suite/<problem>/
+# <code>) are put once into a content-addressed store,
+#
+#   $MCDC_SUITE_STORE/<sha256>    (default: <suite root>/data/store)
+#
+# and every run directory links to them, and to the problem specification,
+# test_suite/<problem>/problem.yaml, if there is one (see suite/spec.py). A staged run
+# directory has a manifest, staged.yaml, with the hash of every input and the staging
+# time. Staging fails loudly: a store object that does not match its hash is an error.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Hashes already computed in this process: path -> (size, mtime, hash)
+_hashes = {}
+
+# Store objects verified in this process
+_verified = set()
+
+
+def store_dir():
+    return os.environ.get("MCDC_SUITE_STORE", os.path.join(ROOT, "data", "store"))
+
+
+def file_hash(path):
+    """SHA-256 of a file, computed once per file version"""
+    stat = os.stat(path)
+    key = os.path.realpath(path)
+    if key in _hashes and _hashes[key][:2] == (stat.st_size, stat.st_mtime):
+        return _hashes[key][2]
+
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            sha256.update(block)
+    digest = sha256.hexdigest()
+    _hashes[key] = (stat.st_size, stat.st_mtime, digest)
+    return digest
+
+
+def ingest(path):
+    """Put a file into the store; returns the store object path"""
+    digest = file_hash(path)
+    target = os.path.join(store_dir(), digest)
+    if not os.path.isfile(target):
+        os.makedirs(store_dir(), exist_ok=True)
+        fd, temporary = tempfile.mkstemp(prefix=".%s-" % digest, dir=store_dir())
+        os.close(fd)
+        shutil.copyfile(path, temporary)
+        os.chmod(temporary, 0o444)
+        os.replace(temporary, target)
+        _verified.add(target)
+    return target
+
+
+def verify(target):
+    """Check that a store object still matches its hash (once per process)"""
+    if target in _verified:
+        return
+    if file_hash(target) != os.path.basename(target):
+        raise RuntimeError("Corrupted staging store object: %s" % target)
+    _verified.add(target)
+
+
+def stage(source_dir, run_dir=".", link="symlink"):
+    """
+    Link the files of source_dir into run_dir through the store (link: "symlink" or
+    "hardlink"), write the manifest, and return the staging time [s].
+    """
+    time_start = time.perf_counter()
+
+    # The files of the code folder, and the specification of the problem
+    paths = [os.path.join(source_dir, name) for name in sorted(os.listdir(source_dir))]
+    spec = find(source_dir)
+    if spec is not None and spec not in paths:
+        paths.append(spec)
+
+    manifest = {}
+    for path in paths:
+        name = os.path.basename(path)
+        if name.startswith(".") or not os.path.isfile(path):
+            continue
+        target = ingest(path)
+        verify(target)
+
+        destination = os.path.join(run_dir, name)
+        if os.path.lexists(destination):
+            os.remove(destination)
+        if link == "hardlink":
+            os.link(target, destination)
+        else:
+            os.symlink(target, destination)
+        manifest[name] = os.path.basename(target)
+
+    staging_time = time.perf_counter() - time_start
+    with open(os.path.join(run_dir, "staged.yaml"), "w") as f:
+        yaml.dump({"files": manifest, "staging_time": staging_time}, f)
+    return staging_time
@@ -0,0 +1,103 @@
+import os
+
+from suite.noise import exclude_nodes
+
+
+# ======================================================================================
+# Job-array submission
+# ======================================================================================
+# Instead of one scheduler call per job script, the drivers collect the scripts and
+# submit the jobs of the same shape (node count and time limit) together, as a Slurm
+# or LSF job array or a Flux bulk submission (pbs_templates/<scheduler>-array.pbs).
+# The elements of an array are listed, one "<run directory> <job script>" per line, in
+# an index file next to the array script:
+#
+#   <jobs dir>/<name>.txt    element i runs line i (1-based)
+#   <jobs dir>/<name>.pbs
+#
+# Each element runs its job script in its run directory, with the outputs that the
+# script would have had as a standalone job (output<CASE>.out/err).
+
+# Largest array the schedulers take (e.g. Slurm's default MaxArraySize is 1001)
+MAX_ARRAY_SIZE = 1000
+
+
+class JobArrays:
+    """Job scripts collected by shape, submitted as arrays"""
+
+    def __init__(self, scheduler, submission, root, jobs_dir, name, exclude=()):
+        """
+        scheduler: "slurm", "lsf", or "flux"; submission: the submission command;
+        root: the suite root; jobs_dir: where the index files and array scripts go;
+        name: the job name prefix, e.g. "serial-dane"; exclude: nodes to avoid
+        """
+        with open("%s/pbs_templates/%s-array.pbs" % (root, scheduler), "r") as f:
+            self.template = f.read().replace("<ROOT>", root)
+        self.scheduler = scheduler
+        self.submission = submission
+        self.exclude = list(exclude)
+        self.jobs_dir = os.path.abspath(jobs_dir)
+        self.name = name
+        self.groups = {}
+
+    def add(self, script, N_node, time):
+        """Add a job script (in the working directory) with its node count and time limit"""
+        self.groups.setdefault((N_node, time), []).append((os.getcwd(), script))
+
+    def __len__(self):
+        return sum(len(jobs) for jobs in self.groups.values())
+
+    def write(self):
+        """
+        Write the arrays; returns the submissions: {"name", "script", "jobs_dir",
+        "elements": {index: [run directory]}, "array": True}
+        """
+        submissions = []
+        if len(self) == 0:
+            return submissions
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        for (N_node, time), jobs in self.groups.items():
+            for start in range(0, len(jobs), MAX_ARRAY_SIZE):
+                elements = jobs[start : start + MAX_ARRAY_SIZE]
+                job_name = "%s-%i" % (self.name, len(submissions))
+                index_file = "%s/%s.txt" % (self.jobs_dir, job_name)
+                with open(index_file, "w") as f:
+                    for directory, script in elements:
+                        f.write("%s %s\n" % (directory, script))
+
+                text = self.template[:]
+                text = text.replace("<N_NODE>", "%i" % N_node)
+                text = text.replace("<JOB_NAME>", job_name)
+                text = text.replace("<TIME>", time)
+                text = text.replace("<N_JOB>", "%i" % len(elements))
+                text = text.replace("<INDEX_FILE>", index_file)
+                text = exclude_nodes(text, self.scheduler, self.exclude)
+                with open("%s/%s.pbs" % (self.jobs_dir, job_name), "w") as f:
+                    f.write(text)
+
+                submissions.append(
+                    {
+                        "name": job_name,
+                        "script": "%s.pbs" % job_name,
+                        "jobs_dir": self.jobs_dir,
+                        "elements": {
+                            i + 1: [directory] for i, (directory, script) in enumerate(elements)
+                        },
+                        "array": True,
+                    }
+                )
+
+        print("Wrote %i jobs in %i arrays (%s)" % (len(self), len(submissions), self.jobs_dir))
+        self.groups = {}
+        return submissions
+
+    def submit(self):
+        """Write and submit the arrays; returns the number of submissions"""
+        return submit(self.write(), self.submission)
+
+
+def submit(submissions, submission):
+    """Submit written job scripts (from their jobs folder, where their outputs go)"""
+    for entry in submissions:
+        os.system("cd %s && %s %s" % (entry["jobs_dir"], submission, entry["script"]))
+    return len(submissions)
@@ -0,0 +1,168 @@
+import argparse
+import h5py
+import math
+import os
+import subprocess
+import sys
+import yaml
+
+from suite.watchdog import completed, fits
+
+
+# ======================================================================================
+# Adaptive particle-count sweeps
+# ======================================================================================
+# Instead of the fixed grid np.logspace(start, stop, num), the particle counts of an
+# adaptive sweep are chosen from the results so far:
+#
+#   python -m suite.sweep --start 1 --stop 8 --num 15 \
+#       --command "python -m suite.run input.py ... --N_particle={N} --output=output_{N}" \
+#       --command "python -m suite.extract output_{N}.h5"
+#
+# 1. Climb: from 10^start, on every other point of the fixed grid, until the tracking
+#    rate (N / simulation runtime) of the last PLATEAU runs is within --tolerance of
+#    their mean, or 10^stop is reached.
+# 2. Refine: while runs are left (at most num in total), run the geometric midpoint of
+#    the interval with the largest rate change relative to the plateau rate (the
+#    overhead crossover), as long as that change exceeds --refine. The first midpoints
+#    are the skipped points of the fixed grid.
+#
+# Every run is guarded by the walltime watchdog (see suite/watchdog.py); the runs
+# already completed (by an earlier attempt of a requeued job) are not run again, but
+# their rates are used. The sweep exits non-zero if a run fails. The particle
+# counts and rates go to sweep.yaml in the run directory (see sweep_points()). With
+# --keep_largest, {keep} in the commands is " --keep" for the climb runs (any of which
+# may end up the largest) and the output of the previous largest run is deleted, so
+# that only the output of the largest run is kept (e.g. for suite/extract.py).
+
+SWEEP_FILE = "sweep.yaml"
+
+# Number of runs that must agree for a plateau
+PLATEAU = 3
+
+
+def sweep_points(directory):
+    """Particle counts run by an adaptive sweep, in increasing order (None if not adaptive)"""
+    file_name = os.path.join(directory, SWEEP_FILE)
+    if not os.path.isfile(file_name):
+        return None
+    with open(file_name, "r") as f:
+        return sorted(yaml.safe_load(f)["N"])
+
+
+def plateau(rates, tolerance):
+    """Whether the last PLATEAU rates (in run order of increasing N) agree"""
+    if len(rates) < PLATEAU:
+        return False
+    last = rates[-PLATEAU:]
+    mean = sum(last) / PLATEAU
+    return (max(last) - min(last)) / mean <= tolerance
+
+
+def midpoint(points, rates, threshold):
+    """Geometric midpoint of the largest relative rate change above threshold (or None)"""
+    order = sorted(range(len(points)), key=lambda i: points[i])
+    reference = max(rates)
+    best = None
+    for a, b in zip(order[:-1], order[1:]):
+        change = abs(rates[b] - rates[a]) / reference
+        N = int(round(math.sqrt(points[a] * points[b])))
+        if change > threshold and points[a] < N < points[b]:
+            if best is None or change > best[0]:
+                best = (change, N)
+    return None if best is None else best[1]
+
+
+def run(N, commands, keep=False):
+    """
+    Run a point; returns its tracking rate (None if it was skipped or failed) and
+    whether it failed
+    """
+    prefix = "output_%i" % N
+    failed = False
+    if not completed(prefix):
+        if not fits(prefix, N):
+            return None, False
+        for command in commands:
+            command = command.format(N=N, keep=" --keep" if keep else "")
+            failed = subprocess.run(command, shell=True).returncode != 0 or failed
+    file_name = "%s-runtime.h5" % prefix
+    if not os.path.isfile(file_name):
+        return None, True
+    with h5py.File(file_name, "r") as f:
+        return N / float(f["simulation"][()]), failed
+
+
+def sweep(start, stop, num, commands, tolerance, refine, keep_largest=False):
+    """Run an adaptive sweep; returns why its climb stopped and the number of failed runs"""
+    step = 10.0 ** (2 * (stop - start) / max(num - 1, 1))
+    points = []
+    rates = []
+    reason = "bounds"
+    N_failed = 0
+
+    def save():
+        with open(SWEEP_FILE, "w") as f:
+            yaml.dump({"N": points, "rate": rates, "stopped": reason}, f)
+
+    # Climb
+    N_float = 10.0**start
+    while round(N_float) <= round(10.0**stop) and len(points) < num:
+        N = int(round(N_float))
+        rate, failed = run(N, commands, keep_largest)
+        N_failed += failed
+        if rate is None:
+            reason = "incomplete run"
+            save()
+            return reason, N_failed
+        if keep_largest and len(points) > 0 and os.path.isfile("output_%i.h5" % points[-1]):
+            os.remove("output_%i.h5" % points[-1])
+        points.append(N)
+        rates.append(rate)
+        save()
+        if plateau(rates, tolerance):
+            reason = "plateau"
+            break
+        N_float *= step
+
+    # Refine
+    while len(points) < num:
+        N = midpoint(points, rates, refine)
+        if N is None:
+            break
+        rate, failed = run(N, commands)
+        N_failed += failed
+        if rate is None:
+            break
+        points.append(N)
+        rates.append(rate)
+        save()
+    save()
+    return reason, N_failed
+
+
+# ======================================================================================
+# Command line
+# ======================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Adaptive particle-count sweep")
+    parser.add_argument("--start", type=float, required=True, help="log10 of the first N")
+    parser.add_argument("--stop", type=float, required=True, help="log10 of the largest N")
+    parser.add_argument("--num", type=int, required=True, help="largest number of runs")
+    parser.add_argument(
+        "--command", type=str, action="append", required=True, help="run command, with {N}"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.05, help="plateau rate spread")
+    parser.add_argument("--refine", type=float, default=0.2, help="rate change to refine")
+    parser.add_argument(
+        "--keep_largest", default=False, action="store_true", help="keep the largest output"
+    )
+    args = parser.parse_args()
+
+    reason, N_failed = sweep(
+        args.start, args.stop, args.num, args.command, args.tolerance, args.refine, args.keep_largest
+    )
+    print("Sweep stopped: %s, %i failed runs" % (reason, N_failed))
+    if N_failed > 0:
+        sys.exit(1)
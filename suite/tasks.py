@@ -0,0 +1,169 @@
+import itertools
+
+
+# Problem-level keys in tasks/*.yaml that are not methods
+RESERVED = ["parameters", "eigenvalue", "data", "snapshot"]
+
+# Sweep parameters that are options of the run wrapper (suite/run.py), not of the inputs
+WRAPPER_PARAMETERS = ["tally_output"]
+
+# Sweep parameters that are options of the MPI launcher (see suite/platforms.py)
+LAUNCHER_PARAMETERS = ["placement"]
+
+# The job scripts of a node count in the parallel sweeps: (case, time limit [h],
+# powers), a power p running 2^p N_base particles per node
+CASES = [
+    ("case1", 3, [-4, -3, -2, -1, 0]),
+    ("case2", 3, [1]),
+    ("case3", 6, [2]),
+    ("case4", 12, [3]),
+    ("case5", 24, [4]),
+]
+
+
+def methods(task):
+    """Method names of a problem task, skipping the reserved keys"""
+    return [key for key in task if key not in RESERVED]
+
+
+def variants(task):
+    """
+    All combinations of the problem sweep parameters, e.g.
+
+        parameters:
+            groups: [1, 2, 8]
+
+    gives [{"groups": 1}, {"groups": 2}, {"groups": 8}]. Problems without
+    parameters have a single, empty variant.
+    """
+    parameters = task.get("parameters", {})
+    names = list(parameters)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*[parameters[name] for name in names])
+    ]
+
+
+def variant_tag(variant):
+    """Suffix for output folder and job names, e.g. "-groups_8" """
+    return "".join("-%s_%s" % (name, value) for name, value in variant.items())
+
+
+def variant_args(variant):
+    """Extra command-line arguments for the input scripts, e.g. " --groups=8" """
+    return "".join(
+        " --%s=%s" % (name, value)
+        for name, value in variant.items()
+        if name not in WRAPPER_PARAMETERS + LAUNCHER_PARAMETERS
+    )
+
+
+def wrapper_args(variant):
+    """Extra command-line arguments for the run wrapper, e.g. " --tally_output=none" """
+    return "".join(
+        " --%s=%s" % (name, value) for name, value in variant.items() if name in WRAPPER_PARAMETERS
+    )
+
+
+def input_variant(variant):
+    """
+    The variant without the run wrapper and launcher parameters (what the OpenMC runs
+    follow)
+    """
+    return {
+        name: value
+        for name, value in variant.items()
+        if name not in WRAPPER_PARAMETERS + LAUNCHER_PARAMETERS
+    }
+
+
+def run_variant(variant):
+    """The variant without the launcher parameters (what the pre-flight runs follow)"""
+    return {name: value for name, value in variant.items() if name not in LAUNCHER_PARAMETERS}
+
+
+def run_variants(task):
+    """The distinct run variants of a problem"""
+    result = []
+    for variant in variants(task):
+        if run_variant(variant) not in result:
+            result.append(run_variant(variant))
+    return result
+
+
+def placement(variant):
+    """Rank placement policy of a variant (None: the platform default)"""
+    return variant.get("placement")
+
+
+def input_variants(task):
+    """The distinct input variants of a problem"""
+    result = []
+    for variant in variants(task):
+        if input_variant(variant) not in result:
+            result.append(input_variant(variant))
+    return result
+
+
+def is_eigenvalue(task):
+    """Whether the problem is a k-eigenvalue problem"""
+    return "eigenvalue" in task
+
+
+def cycle_args(task):
+    """
+    Cycle arguments of a k-eigenvalue problem, e.g.
+
+        eigenvalue:
+            N_inactive: 10
+            N_active: 20
+
+    gives " --N_inactive=10 --N_active=20". Fixed-source problems have none.
+    """
+    if not is_eigenvalue(task):
+        return ""
+    cycles = task["eigenvalue"]
+    return " --N_inactive=%i --N_active=%i" % (cycles["N_inactive"], cycles["N_active"])
+
+
+def histories(task, N):
+    """
+    Number of source particles tracked by a run with N particles. A k-eigenvalue run
+    tracks N particles per cycle; fixed-source runs keep the suite convention of 10 N.
+    """
+    if not is_eigenvalue(task):
+        return 10 * N
+    cycles = task["eigenvalue"]
+    return N * (cycles["N_inactive"] + cycles["N_active"])
+
+
+def data_libraries(task, variant):
+    """
+    Cross-section libraries used by a problem variant (see suite/xsdata.py), e.g.
+
+        data: ["MGXS-SHEM361-G{groups}"]
+
+    gives ["MGXS-SHEM361-G8"] for the variant {"groups": 8}.
+    """
+    return [name.format(**variant) for name in task.get("data", [])]
+
+
+def timing_args(task):
+    """
+    Run wrapper argument recording the per-rank times of the cycles (k-eigenvalue
+    problems) or batches (fixed-source problems) of the MC/DC runs: " --cycle_timing"
+    or " --batch_timing"
+    """
+    return " --cycle_timing" if is_eigenvalue(task) else " --batch_timing"
+
+
+def snapshot_args(task):
+    """
+    Run wrapper argument of a problem whose MC/DC model is restored from a snapshot
+    (see suite/snapshot.py), e.g. for geometry-heavy models:
+
+        snapshot: true
+
+    gives " --snapshot".
+    """
+    return " --snapshot" if task.get("snapshot", False) else ""
@@ -0,0 +1,120 @@
+import h5py
+import numpy as np
+
+
+# ======================================================================================
+# Post-processing of the per-rank timing records written by suite/instrument.py
+# ======================================================================================
+
+
+def cycle_summary(file_name, N_particle, N_inactive):
+    """
+    Per-cycle times, inactive vs active throughput, and fission-bank synchronization
+    cost of a k-eigenvalue run. The slowest rank sets the pace of every cycle, and
+    phase times are medians so that the first (compiling) cycle does not dominate.
+    """
+    with h5py.File(file_name, "r") as f:
+        cycle_time = np.nanmax(f["cycle_time"][()], axis=0)
+        bank_size = f["bank_size"][()] if "bank_size" in f else None
+        bank_time = f["bank_time"][()] if "bank_time" in f else None
+
+    inactive = cycle_time[:N_inactive]
+    active = cycle_time[N_inactive:]
+
+    summary = {}
+    summary["cycle_time"] = cycle_time.tolist()
+    summary["first_cycle_time"] = float(cycle_time[0])
+    for phase, times in [("inactive", inactive), ("active", active)]:
+        if len(times) == 0:
+            continue
+        summary["cycle_time_%s" % phase] = float(np.median(times))
+        summary["tracking_rate_%s" % phase] = float(N_particle / np.median(times) * 1e-3)
+
+    # Fission-bank synchronization
+    if bank_time is not None:
+        # Measured directly (Python mode), the slowest rank per cycle
+        summary["bank_sync_time"] = float(np.nanmean(np.nanmax(bank_time, axis=0)))
+    if bank_size is not None:
+        # Imbalance of the local banks before rebalancing, and the fraction of the
+        # bank that has to move between ranks to even it out
+        mean = np.nanmean(bank_size, axis=0)
+        moved = 0.5 * np.nansum(np.abs(bank_size - mean), axis=0)
+        summary["bank_imbalance"] = float(np.nanmean(np.nanmax(bank_size, axis=0) / mean))
+        summary["bank_migration"] = float(np.nanmean(moved / np.nansum(bank_size, axis=0)))
+
+    return summary
+
+
+# Modified z-score above which a batch is an outlier (Iglewicz and Hoaglin)
+OUTLIER_Z = 3.5
+
+
+def warm_up(times):
+    """
+    Number of warm-up batches, by the marginal standard error rule (MSER): the
+    truncation d (at most half of the batches) that minimizes the variance of the
+    mean of the remaining ones, var(times[d:]) / (N - d)
+    """
+    N = len(times)
+    best = (np.inf, 0)
+    for d in range(N // 2 + 1):
+        rest = times[d:]
+        if len(rest) < 2:
+            break
+        best = min(best, (np.var(rest) / len(rest), d))
+    return best[1]
+
+
+def outliers(times):
+    """Mask of the outlier batches: modified z-score, from the median absolute deviation"""
+    median = np.median(times)
+    MAD = np.median(np.abs(times - median))
+    if MAD == 0.0:
+        return np.zeros(len(times), dtype=bool)
+    return 0.6745 * np.abs(times - median) / MAD > OUTLIER_Z
+
+
+def batch_summary(file_name, N_particle):
+    """
+    Per-batch times of a fixed-source run: warm-up, steady-state batch time, jitter,
+    and outliers. The slowest rank sets the pace of every batch. The batches after the
+    warm-up are the steady state; their coefficient of variation is the jitter, and the
+    steady-state batch time and throughput are from the stable batches (the steady
+    state without its outliers).
+    """
+    with h5py.File(file_name, "r") as f:
+        if "batch_time" not in f:
+            return {}
+        batch_time_rank = f["batch_time"][()]
+    batch_time = np.nanmax(batch_time_rank, axis=0)
+    if len(batch_time) < 2:
+        return {}
+
+    N_warm_up = warm_up(batch_time)
+    steady = batch_time[N_warm_up:]
+    outlier = outliers(steady)
+    stable = steady[~outlier]
+
+    summary = {}
+    summary["batch_time"] = batch_time.tolist()
+    summary["first_batch_time"] = float(batch_time[0])
+    summary["warm_up_batches"] = int(N_warm_up)
+    summary["warm_up_time"] = float(np.sum(batch_time[:N_warm_up] - np.mean(stable)))
+    summary["batch_time_steady"] = float(np.mean(stable))
+    summary["batch_time_cv"] = float(np.std(steady) / np.mean(steady))
+    summary["outlier_batches"] = (np.flatnonzero(outlier) + N_warm_up).tolist()
+    summary["tracking_rate_steady"] = float(N_particle / np.mean(stable) * 1e-3)
+
+    # Drift over the stable batches (e.g. bank growth), relative per batch
+    index = np.arange(N_warm_up, len(batch_time))[~outlier]
+    if len(stable) > 2:
+        slope = np.polyfit(index, stable, 1)[0]
+        summary["batch_time_drift"] = float(slope / np.mean(stable))
+
+    # Imbalance between the ranks (max/mean), and the slowest rank of every batch
+    if batch_time_rank.shape[0] > 1:
+        mean = np.nanmean(batch_time_rank, axis=0)
+        summary["rank_imbalance"] = float(np.mean(batch_time / mean))
+        summary["slowest_rank"] = np.nanargmax(batch_time_rank, axis=0).tolist()
+
+    return summary
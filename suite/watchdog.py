@@ -0,0 +1,239 @@
+import argparse
+import glob
+import os
+import re
+import sys
+import tempfile
+import time
+import yaml
+
+
+# ======================================================================================
+# Walltime watchdog
+# ======================================================================================
+# Job scripts run sweeps of increasingly large runs. They export the end of their
+# allocation,
+#
+#   export SUITE_DEADLINE=$(( $(date +%s) + <time limit [s]> ))    (see deadline())
+#
+# and guard every run with
+#
+#   if python -m suite.watchdog output_1000 --N_particle=1000; then
+#       <run command> || failed=1
+#   fi
+#   ...
+#   exit ${failed:-0}    (see job_exit())
+#
+# which skips the run if it is not predicted to end before the deadline, from the wall
+# time of the largest run completed so far (scaled with the particle count), or if it
+# was completed by an earlier job (a requeued job resumes its sweep). A job fails if any
+# of its runs fails, so that the controller requeues it (see suite/controller.py). The
+# outcome of every run goes to its own file in the run directory,
+#
+#   output_1000-status.yaml:  {status: completed | skipped | failed, N_particle,
+#                              wall_time, error}
+#
+# written by the watchdog (skipped, or running) and the run wrapper (completed, failed,
+# or terminated by the scheduler); a run left "running" was killed without notice. The
+# jobs of a sweep run concurrently in the same directory, hence one file per run, each
+# written by one run only (read_status() merges them). MC/DC runs cannot be
+# checkpointed, so runs that do not fit are skipped. A sweep the drivers do not submit
+# at all (e.g. for missing cross-section data) has a "sweep" entry saying why (see
+# mark_sweep()), and all its runs are reported as skipped. The drivers clear the
+# statuses of a sweep when they write it.
+
+# Status file of a run: <prefix><STATUS_SUFFIX>
+STATUS_SUFFIX = "-status.yaml"
+
+# Status entry of a whole sweep
+SWEEP = "sweep"
+
+# Safety factor and margin [s] of the predictions
+SAFETY = 1.2
+MARGIN = 60.0
+
+
+def time_limit(text):
+    """Time limit [h] of a job time, e.g. "24:00:00" (Slurm), "12:00" (LSF), "24h" (Flux)"""
+    if text.endswith("h"):
+        return float(text[:-1])
+    fields = [float(field) for field in text.split(":")]
+    return fields[0] + fields[1] / 60.0 + (fields[2] / 3600.0 if len(fields) > 2 else 0.0)
+
+
+def deadline(hours):
+    """Job script line exporting the deadline of a job with the time limit [h]"""
+    return "export SUITE_DEADLINE=$(( $(date +%%s) + %i ))\n" % int(hours * 3600)
+
+
+def guard(prefix, N, commands):
+    """
+    Job script lines running the commands only if the watchdog lets them run; a failed
+    command fails the job (see job_exit())
+    """
+    return "if python -m suite.watchdog %s --N_particle=%i; then\n%sfi\n" % (
+        prefix,
+        N,
+        "".join("    %s || failed=1\n" % line for line in commands.splitlines()),
+    )
+
+
+def job_exit():
+    """Last job script line: the exit status of the guarded commands"""
+    return "exit ${failed:-0}\n"
+
+
+def status_file(prefix, directory="."):
+    return os.path.join(directory, prefix + STATUS_SUFFIX)
+
+
+def read_status(directory="."):
+    """Status entries of the runs of a directory: prefix -> entry"""
+    status = {}
+    for file_name in glob.glob(status_file("*", directory)):
+        with open(file_name, "r") as f:
+            entry = yaml.safe_load(f)
+        if entry is not None:
+            status[os.path.basename(file_name)[: -len(STATUS_SUFFIX)]] = entry
+    return status
+
+
+def write_status(prefix, entry, directory=".", update=False):
+    """Set (or update) the status entry of a run"""
+    file_name = status_file(prefix, directory)
+    if update and os.path.isfile(file_name):
+        with open(file_name, "r") as f:
+            entry = dict(yaml.safe_load(f) or {}, **entry)
+    # Atomic, as other runs of the sweep read it (see predict())
+    fd, temporary = tempfile.mkstemp(prefix=".status-", dir=directory)
+    with os.fdopen(fd, "w") as f:
+        yaml.dump(entry, f)
+    os.replace(temporary, file_name)
+
+
+def particle_count(command):
+    """The --N_particle of an MC/DC command (None if none)"""
+    for arg in command:
+        match = re.fullmatch(r"--N_particle=(\d+)", arg)
+        if match is not None:
+            return int(match.group(1))
+    return None
+
+
+def predict(status, N):
+    """Predicted wall time [s] of a run with N particles (None if nothing to go by)"""
+    completed = [
+        entry
+        for entry in status.values()
+        if entry["status"] == "completed" and entry.get("N_particle") is not None
+    ]
+    if len(completed) == 0:
+        return None
+    largest = max(completed, key=lambda entry: entry["N_particle"])
+    return largest["wall_time"] * N / largest["N_particle"]
+
+
+def remaining_time():
+    """Time [s] left before the deadline (None if there is none)"""
+    if "SUITE_DEADLINE" not in os.environ:
+        return None
+    return float(os.environ["SUITE_DEADLINE"]) - time.time()
+
+
+def mark_sweep(error=None, directory="."):
+    """
+    Record whether the runs of a sweep are submitted: error is why none is (e.g. missing
+    data), None if they are; the statuses of earlier submissions are cleared
+    """
+    for file_name in glob.glob(status_file("*", directory)):
+        os.remove(file_name)
+    if error is not None:
+        write_status(SWEEP, {"status": "skipped", "error": error}, directory)
+
+
+def skipped_sweep(directory):
+    """Why the runs of a sweep were not submitted (None if they were)"""
+    file_name = status_file(SWEEP, directory)
+    if not os.path.isfile(file_name):
+        return None
+    with open(file_name, "r") as f:
+        entry = yaml.safe_load(f)
+    return entry["error"] if entry["status"] == "skipped" else None
+
+
+def sweep_status(directory, prefixes):
+    """
+    Outcome of the runs of a sweep: {"completed": [...], "skipped": {prefix: reason},
+    "failed": {prefix: error}, "missing": [...]} (missing: no record, e.g. the job never
+    ran or was killed without one)
+    """
+    status = read_status(directory)
+    result = {"completed": [], "skipped": {}, "failed": {}, "missing": []}
+    for prefix in prefixes:
+        if prefix not in status:
+            if skipped_sweep(directory) is not None:
+                result["skipped"][prefix] = skipped_sweep(directory)
+            else:
+                result["missing"].append(prefix)
+        elif status[prefix]["status"] == "running":
+            result["failed"][prefix] = "killed while running"
+        elif status[prefix]["status"] == "failed":
+            result["failed"][prefix] = status[prefix].get("error")
+        elif status[prefix]["status"] == "skipped":
+            result["skipped"][prefix] = status[prefix].get("error")
+        else:
+            result[status[prefix]["status"]].append(prefix)
+    return result
+
+
+def completed(prefix, directory="."):
+    """Whether the run was completed (e.g. by an earlier attempt of a requeued job)"""
+    file_name = status_file(prefix, directory)
+    if not os.path.isfile(file_name):
+        return False
+    with open(file_name, "r") as f:
+        return (yaml.safe_load(f) or {}).get("status") == "completed"
+
+
+def fits(prefix, N, margin=MARGIN):
+    """
+    Whether the run is to be run: not completed yet, and predicted to end before the
+    deadline; sets its status
+    """
+    if completed(prefix):
+        print("[DONE] %s: completed by an earlier job" % prefix)
+        return False
+    remaining = remaining_time()
+    predicted = predict(read_status(), N)
+    if remaining is not None and (
+        remaining < margin or (predicted is not None and SAFETY * predicted + margin > remaining)
+    ):
+        write_status(
+            prefix,
+            {
+                "status": "skipped",
+                "N_particle": N,
+                "predicted_time": predicted,
+                "remaining_time": remaining,
+                "error": "not enough time left",
+            },
+        )
+        print("[SKIP] %s: predicted %s s, %.0f s left" % (prefix, predicted, remaining))
+        return False
+    write_status(prefix, {"status": "running", "N_particle": N})
+    return True
+
+
+# ======================================================================================
+# Command line
+# ======================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check whether the next run fits")
+    parser.add_argument("prefix", type=str, help="output prefix of the run, e.g. output_1000")
+    parser.add_argument("--N_particle", type=int, required=True)
+    parser.add_argument("--margin", type=float, default=MARGIN, help="[s]")
+    args = parser.parse_args()
+
+    if not fits(args.prefix, args.N_particle, args.margin):
+        sys.exit(1)
@@ -0,0 +1,139 @@
+import argparse
+import glob
+import numpy as np
+import os
+import re
+import shutil
+import tempfile
+
+from suite.mgxs import collapse
+
+
+# ======================================================================================
+# Cross-section data provisioning
+# ======================================================================================
+# Libraries (e.g. MGXS-SHEM361) are stored once, uncompressed, one .npy file per array,
+# in a shared cache:
+#
+#   $MCDC_SUITE_CACHE/<name>/<array>.npy    (default: <suite root>/data/cache)
+#
+# and memory-mapped by the inputs, so that every rank shares the same pages instead of
+# decompressing its own copy. The maps are copy-on-write: an input modifying an array
+# gets private pages, and the cache is never written:
+#
+#   with library("MGXS-SHEM361") as data:
+#       SigmaC = data["SigmaC"]
+#
+# A missing library is built on first use from <name>.npz, looked up in the working
+# directory, $MCDC_SUITE_DATA, and <suite root>/data; collapsed libraries
+# <name>-G<groups> are built from the fine-group one (see suite/mgxs.py).
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cache_dir():
+    return os.environ.get("MCDC_SUITE_CACHE", os.path.join(ROOT, "data", "cache"))
+
+
+def search_dirs():
+    dirs = [os.getcwd()]
+    if "MCDC_SUITE_DATA" in os.environ:
+        dirs.append(os.environ["MCDC_SUITE_DATA"])
+    dirs.append(os.path.join(ROOT, "data"))
+    return dirs
+
+
+class Library:
+    """Memory-mapped (copy-on-write) arrays of a cached library"""
+
+    def __init__(self, path):
+        self.path = path
+        self.files = sorted(
+            os.path.basename(file_name)[:-4] for file_name in glob.glob("%s/*.npy" % path)
+        )
+
+    def __getitem__(self, key):
+        if key not in self.files:
+            raise KeyError("%s is not in %s" % (key, self.path))
+        return np.load(os.path.join(self.path, "%s.npy" % key), mmap_mode="c")
+
+    def __contains__(self, key):
+        return key in self.files
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+def library(name):
+    """The cached library, built first if needed"""
+    return Library(locate(name))
+
+
+def locate(name):
+    """Path of the cached library, built first if needed"""
+    path = os.path.join(cache_dir(), name)
+    if os.path.isdir(path):
+        return path
+
+    # Fine-group library from an NPZ file
+    for directory in search_dirs():
+        file_name = os.path.join(directory, "%s.npz" % name)
+        if os.path.isfile(file_name):
+            with np.load(file_name) as f:
+                store(name, {key: f[key] for key in f.files})
+            return path
+
+    # Collapsed library
+    match = re.fullmatch(r"(.+)-G(\d+)", name)
+    if match is not None:
+        base = library(match.group(1))
+        store(name, collapse({key: base[key] for key in base.files}, int(match.group(2))))
+        return path
+
+    raise FileNotFoundError(
+        "Cross-section library %s not found: put %s.npz in any of %s"
+        % (name, name, ", ".join(search_dirs()))
+    )
+
+
+def provision(names):
+    """Build or locate the libraries; returns the names that are not available"""
+    missing = []
+    for name in names:
+        try:
+            locate(name)
+        except FileNotFoundError as error:
+            print("[ERROR] %s" % error)
+            missing.append(name)
+    return missing
+
+
+def store(name, arrays):
+    """Write the arrays into the cache; concurrent builders of the same library are fine"""
+    path = os.path.join(cache_dir(), name)
+    os.makedirs(cache_dir(), exist_ok=True)
+    directory = tempfile.mkdtemp(prefix=".%s-" % name, dir=cache_dir())
+    os.chmod(directory, 0o755)
+    for key, value in arrays.items():
+        np.save(os.path.join(directory, "%s.npy" % key), np.asarray(value))
+    try:
+        os.rename(directory, path)
+    except OSError:
+        # Built by someone else in the meantime
+        shutil.rmtree(directory)
+
+
+# ======================================================================================
+# Command line
+# ======================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or locate cached cross-section libraries")
+    parser.add_argument("names", type=str, nargs="+", help="e.g. MGXS-SHEM361 MGXS-SHEM361-G8")
+    args = parser.parse_args()
+
+    for name in args.names:
+        print(locate(name))
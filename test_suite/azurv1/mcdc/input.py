@@ -2,57 +2,40 @@ import numpy as np
 import mcdc
 import sys
 
+from suite.spec import load, mcdc_model
+
 method = sys.argv[1]
-if method not in ["analog"]:
+if method not in ["analog", "implicit_capture", "weight_roulette", "population_control"]:
     print("[ERROR] Unsupported method: %s" % method)
-    exit()
+    exit(1)
 
 
 # ======================================================================================
-# Set model
+# Set model, tallies, and settings (see problem.yaml)
 # ======================================================================================
 # Infinite medium with isotropic plane surface at the center
 # Based on Ganapol LA-UR-01-1854 (AZURV1 benchmark)
 # Effective scattering ratio c = 1.1
 
-# Set materials
-m = mcdc.MaterialMG(
-    capture=np.array([1.0 / 3.0]),
-    scatter=np.array([[1.0 / 3.0]]),
-    fission=np.array([1.0 / 3.0]),
-    nu_p=np.array([2.3]),
-)
-
-# Set surfaces
-s1 = mcdc.Surface.PlaneX(x=-1e10, boundary_condition="reflective")
-s2 = mcdc.Surface.PlaneX(x=1e10, boundary_condition="reflective")
-
-# Set cells
-mcdc.Cell(region=+s1 & -s2, fill=m)
-
-# ======================================================================================
-# Set source
-# ======================================================================================
-# Isotropic pulse at x=t=0
-
-mcdc.Source(
-    position=[0.0, 0.0, 0.0],
-    isotropic=True,
-    energy_group=0,
-    time=0.0,
-)
+spec = load()
+mcdc_model(spec)
 
 # ======================================================================================
-# Set tallies, settings, and run MC/DC
+# Set techniques, and run MC/DC
 # ======================================================================================
 
-# Tallies
-mesh = mcdc.MeshStructured(x=np.linspace(-20.5, 20.5, 202))
-mcdc.TallyMesh(mesh=mesh, scores=["flux"], time=np.linspace(0.0, 20.0, 21))
-
-# Settings
-mcdc.settings.N_particle = 100000
-mcdc.settings.N_batch = 30
+# Techniques
+if method == "analog":
+    pass
+elif method == "implicit_capture":
+    mcdc.simulation.implicit_capture()
+elif method == "weight_roulette":
+    mcdc.simulation.implicit_capture()
+    mcdc.simulation.weight_roulette(weight_threshold=0.25, weight_target=1.0)
+elif method == "population_control":
+    # The population grows (c > 1): comb it back at every 2 time units
+    mcdc.settings.set_time_census(np.arange(2.0, spec["settings"]["time_cutoff"], 2.0))
+    mcdc.simulation.population_control()
 
 # Run
 mcdc.run()
@@ -2,89 +2,57 @@ import numpy as np
 import mcdc
 import sys
 
+from suite.spec import load, mcdc_model
+
 method = sys.argv[1]
-if method not in ["analog", "implicit_capture"]:
+if method not in [
+    "analog",
+    "implicit_capture",
+    "weight_roulette",
+    "weight_window",
+    "population_control",
+]:
     print("[error] unsupported method: %s" % method)
-    exit()
-
+    exit(1)
 
 # ======================================================================================
-# Set model
+# Set model, tallies, and settings (see problem.yaml)
 # ======================================================================================
 # Based on Kobayashi dog-leg benchmark problem
 # (PNE 2001, https://doi.org/10.1016/S0149-1970(01)00007-5)
 
-# Set materials
-m = mcdc.MaterialMG(capture=np.array([0.05]), scatter=np.array([[0.05]]))
-m_void = mcdc.MaterialMG(capture=np.array([5e-5]), scatter=np.array([[5e-5]]))
-
-# Set surfaces
-sx1 = mcdc.Surface.PlaneX(x=0.0, boundary_condition="reflective")
-sx2 = mcdc.Surface.PlaneX(x=10.0)
-sx3 = mcdc.Surface.PlaneX(x=30.0)
-sx4 = mcdc.Surface.PlaneX(x=40.0)
-sx5 = mcdc.Surface.PlaneX(x=60.0, boundary_condition="vacuum")
-sy1 = mcdc.Surface.PlaneY(y=0.0, boundary_condition="reflective")
-sy2 = mcdc.Surface.PlaneY(y=10.0)
-sy3 = mcdc.Surface.PlaneY(y=50.0)
-sy4 = mcdc.Surface.PlaneY(y=60.0)
-sy5 = mcdc.Surface.PlaneY(y=100.0, boundary_condition="vacuum")
-sz1 = mcdc.Surface.PlaneZ(z=0.0, boundary_condition="reflective")
-sz2 = mcdc.Surface.PlaneZ(z=10.0)
-sz3 = mcdc.Surface.PlaneZ(z=30.0)
-sz4 = mcdc.Surface.PlaneZ(z=40.0)
-sz5 = mcdc.Surface.PlaneZ(z=60.0, boundary_condition="vacuum")
-
-# Set cells
-# Source
-source_cell = mcdc.Cell(region=+sx1 & -sx2 & +sy1 & -sy2 & +sz1 & -sz2, fill=m)
-# Voids
-channel_1 = +sx1 & -sx2 & +sy2 & -sy3 & +sz1 & -sz2
-channel_2 = +sx1 & -sx3 & +sy3 & -sy4 & +sz1 & -sz2
-channel_3 = +sx3 & -sx4 & +sy3 & -sy4 & +sz1 & -sz3
-channel_4 = +sx3 & -sx4 & +sy3 & -sy5 & +sz3 & -sz4
-void_channel = channel_1 | channel_2 | channel_3 | channel_4
-void_cell = mcdc.Cell(region=void_channel, fill=m_void)
-# Shield
-box = +sx1 & -sx5 & +sy1 & -sy5 & +sz1 & -sz5
-shield_cell = mcdc.Cell(region=box & ~void_channel, fill=m)
-
-# ======================================================================================
-# Set source
-# ======================================================================================
-# The source pulses in t=[0,5]
-
-mcdc.Source(
-    x=[0.0, 10.0],
-    y=[0.0, 10.0],
-    z=[0.0, 10.0],
-    isotropic=True,
-    energy_group=0,
-    time=[0.0, 50.0],
-)
+spec = load()
+mcdc_model(spec)
 
 # ======================================================================================
-# Set tallies, settings, techniques, and run MC/DC
+# Set techniques, and run MC/DC
 # ======================================================================================
 
-# Tallies
-time_grid = np.linspace(0.0, 200.0, 101)
-mcdc.TallyCell(cell=source_cell, scores=["flux"], time=time_grid)
-mcdc.TallyCell(cell=void_cell, scores=["flux"], time=time_grid)
-mcdc.TallyCell(cell=shield_cell, scores=["flux"], time=time_grid)
-mesh = mcdc.MeshUniform(x=(0.0, 1.0, 60), y=(0.0, 1.0, 100), z=(0.0, 1.0, 60))
-mcdc.TallyMesh(mesh=mesh, scores=["flux"], time=time_grid)
-mcdc.TallyGlobal(scores=["density"], time=time_grid)
-
-# Settings
-mcdc.settings.N_particle = 1000
-mcdc.settings.N_batch = 30
-
 # Techniques
 if method == "analog":
     pass
 elif method == "implicit_capture":
     mcdc.simulation.implicit_capture()
+elif method == "weight_roulette":
+    mcdc.simulation.implicit_capture()
+    mcdc.simulation.weight_roulette(weight_threshold=0.25, weight_target=1.0)
+elif method == "weight_window":
+    # Window centers follow the uncollided attenuation in the shield, exp(-SigmaT r),
+    # with r the distance from the source corner, on a 5 cm mesh
+    x = np.linspace(0.0, 60.0, 13)
+    y = np.linspace(0.0, 100.0, 21)
+    z = np.linspace(0.0, 60.0, 13)
+    xc, yc, zc = np.meshgrid(
+        0.5 * (x[1:] + x[:-1]), 0.5 * (y[1:] + y[:-1]), 0.5 * (z[1:] + z[:-1]), indexing="ij"
+    )
+    r = np.maximum(np.sqrt(xc**2 + yc**2 + zc**2) - 10.0, 0.0)
+    window = np.maximum(np.exp(-0.1 * r), 1e-8)
+    mcdc.simulation.implicit_capture()
+    mcdc.simulation.weight_window(x=x, y=y, z=z, window=window)
+elif method == "population_control":
+    # Comb the population at every 20 time units
+    mcdc.settings.set_time_census(np.arange(20.0, spec["settings"]["time_cutoff"], 20.0))
+    mcdc.simulation.population_control()
 
 # Run
 mcdc.run()
@@ -2,10 +2,12 @@ import mcdc
 import numpy as np
 import sys
 
+from suite.xsdata import library
+
 method = sys.argv[1]
-if method not in ["analog"]:
+if method not in ["analog", "implicit_capture", "weight_roulette", "population_control"]:
     print("[ERROR] Unsupported method: %s" % method)
-    exit()
+    exit(1)
 
 
 # =============================================================================
@@ -50,8 +52,21 @@ mcdc.settings.active_bank_buffer = 10000
 
 # Tally
 t_grid = np.insert(np.logspace(-9, -4, 200), 0, 0.0)
-energies = np.load("MGXS-SHEM361.npz")['E']
+energies = library("MGXS-SHEM361")["E"]
 
 mcdc.TallyGlobal(scores=['flux'], time=t_grid, energy=energies)
 
+# Technique
+if method == "analog":
+    pass
+elif method == "implicit_capture":
+    mcdc.simulation.implicit_capture()
+elif method == "weight_roulette":
+    mcdc.simulation.implicit_capture()
+    mcdc.simulation.weight_roulette(weight_threshold=0.25, weight_target=1.0)
+elif method == "population_control":
+    # Comb the population at every decade of the logarithmic tally time grid
+    mcdc.settings.set_time_census(t_grid[40:-1:40])
+    mcdc.simulation.population_control()
+
 mcdc.run()
@@ -1,9 +1,18 @@
+import argparse
 import openmc
 import numpy as np
 import sys
 
+from suite.xsdata import library
+
 N = int(sys.argv[1])
 
+# Tallies: "native", or "matched" to score on the time grid of the MC/DC model (see
+# parity.py)
+parser = argparse.ArgumentParser()
+parser.add_argument("--tallies", type=str, default="native", choices=["native", "matched"])
+args, unargs = parser.parse_known_args()
+
 ###############################################################################
 # Create materials for the problem
 
@@ -51,8 +60,11 @@ settings.export_to_xml()
 # Define tallies
 
 # Create a mesh filter that can be used in a tally
-time_filter = openmc.TimeFilter(np.insert(np.logspace(-8, 2, 50), 0, 0.0))
-with np.load("MGXS-SHEM361.npz") as data:
+if args.tallies == "native":
+    time_filter = openmc.TimeFilter(np.insert(np.logspace(-8, 2, 50), 0, 0.0))
+else:
+    time_filter = openmc.TimeFilter(np.insert(np.logspace(-9, -4, 200), 0, 0.0))
+with library("MGXS-SHEM361") as data:
     E = data["E"]
 energy_filter = openmc.EnergyFilter(E)
 
@@ -0,0 +1,67 @@
+import argparse
+import mcdc
+import numpy as np
+import sys
+
+from suite.xsdata import library
+
+method = sys.argv[1]
+if method not in ["analog"]:
+    print("[ERROR] Unsupported method: %s" % method)
+    exit(1)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--N_inactive", type=int, default=10)
+parser.add_argument("--N_active", type=int, default=20)
+args, unargs = parser.parse_known_args()
+
+
+# =============================================================================
+# Set model
+# =============================================================================
+# The infinite 2D SMR pincell, k-eigenvalue
+
+# Material
+fuel = mcdc.Material(
+    nuclide_composition={
+        'U235': 0.0001654509603995036,
+        'U238': 0.022801089905717036,
+        'O16': 0.04593308173223308,
+    }
+)
+moderator = mcdc.Material(
+    nuclide_composition={
+        'H1': 0.05129627050184732,
+        'O16': 0.024622209840886707,
+        'B10': 4.103701640147785e-05,
+    }
+)
+
+# Geometry
+radius = 0.45720
+cylinder = mcdc.Surface.CylinderZ(radius=radius)
+pitch = 1.25984
+x0 = mcdc.Surface.PlaneX(x=-pitch/2, boundary_condition='reflective')
+x1 = mcdc.Surface.PlaneX(x=pitch/2, boundary_condition='reflective')
+y0 = mcdc.Surface.PlaneY(y=-pitch/2, boundary_condition='reflective')
+y1 = mcdc.Surface.PlaneY(y=pitch/2, boundary_condition='reflective')
+#
+mcdc.Cell(-cylinder, fill=fuel)
+mcdc.Cell(+x0 & -x1 & +y0 & -y1 & +cylinder, fill=moderator)
+
+# Initial fission source: uniform over the box bounding the fuel, 2 MeV
+mcdc.Source(x=[-radius, radius], y=[-radius, radius], isotropic=True, energy=2e6)
+
+# Setting
+mcdc.settings.N_particle = 1000
+mcdc.settings.active_bank_buffer = 10000
+mcdc.settings.set_eigenmode(
+    N_inactive=args.N_inactive, N_active=args.N_active, gyration_radius="infinite-z"
+)
+
+# Tally
+energies = library("MGXS-SHEM361")["E"]
+
+mcdc.TallyGlobal(scores=['flux'], energy=energies)
+
+mcdc.run()
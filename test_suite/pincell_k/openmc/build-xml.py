@@ -0,0 +1,81 @@
+import argparse
+import openmc
+import numpy as np
+import sys
+
+from suite.xsdata import library
+
+N = int(sys.argv[1])
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--N_inactive", type=int, default=10)
+parser.add_argument("--N_active", type=int, default=20)
+args, unargs = parser.parse_known_args()
+
+###############################################################################
+# Create materials for the problem
+
+# Materials
+fuel = openmc.Material()
+fuel.add_nuclide('U235', 0.0001654509603995036)
+fuel.add_nuclide('U238', 0.022801089905717036)
+fuel.add_nuclide('O16', 0.04593308173223308)
+#
+moderator = openmc.Material()
+moderator.add_nuclide('H1', 0.05129627050184732)
+moderator.add_nuclide('O16', 0.024622209840886707)
+moderator.add_nuclide('B10', 4.103701640147785e-05)
+#
+materials = openmc.Materials([fuel, moderator])
+materials.export_to_xml()
+
+###############################################################################
+# Define problem geometry
+
+radius = 0.45720
+cylinder = openmc.ZCylinder(r=radius, name='Fuel OR')
+pitch = 1.25984
+box = openmc.model.RectangularPrism(pitch, pitch, boundary_type='reflective')
+#
+fuel_cell = openmc.Cell(fill=fuel, region=-cylinder)
+moderator_cell = openmc.Cell(fill=moderator, region=+cylinder & -box)
+#
+geometry = openmc.Geometry([fuel_cell, moderator_cell])
+geometry.export_to_xml()
+
+###############################################################################
+# Define problem settings
+
+settings = openmc.Settings()
+settings.run_mode = "eigenvalue"
+settings.inactive = args.N_inactive
+settings.batches = args.N_inactive + args.N_active
+settings.particles = N
+
+# Initial fission source: uniform over the box bounding the fuel, 2 MeV
+space = openmc.stats.Box((-radius, -radius, -1.0), (radius, radius, 1.0))
+energy = openmc.stats.delta_function(2e6)
+settings.source = openmc.IndependentSource(space=space, energy=energy)
+
+# Shannon entropy
+entropy_mesh = openmc.RegularMesh()
+entropy_mesh.lower_left = (-pitch / 2, -pitch / 2, -1e10)
+entropy_mesh.upper_right = (pitch / 2, pitch / 2, 1e10)
+entropy_mesh.dimension = (8, 8, 1)
+settings.entropy_mesh = entropy_mesh
+settings.export_to_xml()
+
+###############################################################################
+# Define tallies
+
+with library("MGXS-SHEM361") as data:
+    E = data["E"]
+energy_filter = openmc.EnergyFilter(E)
+
+tally = openmc.Tally(name="spectrum")
+tally.filters = [energy_filter]
+tally.scores = ['flux']
+
+# Instantiate a Tallies collection and export to XML
+tallies = openmc.Tallies([tally])
+tallies.export_to_xml()
@@ -0,0 +1,206 @@
+import argparse
+import openmc
+import numpy as np
+import sys
+
+from suite.xsdata import library
+
+N = int(sys.argv[1])
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--nuclides", type=int, default=3)
+parser.add_argument("--tallies", type=str, default="native", choices=["native", "matched"])
+args, unargs = parser.parse_known_args()
+
+###############################################################################
+# Create materials for the problem
+
+# Dilution of the alloy number densities in the moderator
+DILUTION = 1e-3
+
+# SMR structural alloys (from smr/mcdc/input.py)
+ALLOYS = {}
+ALLOYS["m5"] = {  # SMR M5, 9 nuclides
+    'Zr90': 0.021826659699624183,
+    'Zr91': 0.004759866313504049,
+    'Zr92': 0.007275553233208061,
+    'Zr94': 0.007373126250329802,
+    'Zr96': 0.0011878454258298875,
+    'Nb93': 0.00042910080334290177,
+    'O16': 5.7790773120342736e-05,
+    'O17': 2.195494260303957e-08,
+    'O18': 1.15880388345964e-07,
+}
+ALLOYS["inconel"] = {  # SMR Inconel, 17 nuclides
+    'Si28': 0.0005675748458998167,
+    'Si29': 2.881983126575598e-05,
+    'Si30': 1.8998161560800606e-05,
+    'Cr50': 0.0007823874015570459,
+    'Cr52': 0.015087561698097418,
+    'Cr53': 0.0017108083743585282,
+    'Cr54': 0.00042585641630822467,
+    'Mn55': 0.0007820073144981398,
+    'Fe54': 0.0014797392701973641,
+    'Fe56': 0.02322874201694273,
+    'Fe57': 0.0005364529531388864,
+    'Fe58': 7.139204007422978e-05,
+    'Ni58': 0.02931978281911652,
+    'Ni60': 0.011293927856516,
+    'Ni61': 0.0004909392240540197,
+    'Ni62': 0.0015653290762693152,
+    'Ni64': 0.00039864316797716485,
+}
+ALLOYS["zircaloy4"] = {  # SMR Zircaloy-4, 26 nuclides
+    'O16': 0.00030744435226246966,
+    'O17': 1.1679932181228452e-07,
+    'O18': 6.164785312704674e-07,
+    'Cr50': 3.296180328418399e-06,
+    'Cr52': 6.356355428793489e-05,
+    'Cr53': 7.207596771153883e-06,
+    'Cr54': 1.7941233963793304e-06,
+    'Fe54': 8.669830240139012e-06,
+    'Fe56': 0.00013609779373633635,
+    'Fe57': 3.143091576474185e-06,
+    'Fe58': 4.1828778921182414e-07,
+    'Zr90': 0.02182757976935886,
+    'Zr91': 0.004760066934270842,
+    'Zr92': 0.007275859888090276,
+    'Zr94': 0.00737343710204759,
+    'Zr96': 0.0011878955606900586,
+    'Sn112': 4.673521272730707e-06,
+    'Sn114': 3.1799215898767953e-06,
+    'Sn115': 1.6381414619925706e-06,
+    'Sn116': 7.005463783334945e-05,
+    'Sn117': 3.7002724807551606e-05,
+    'Sn118': 0.00011669348891480064,
+    'Sn119': 4.138716226578583e-05,
+    'Sn120': 0.00015697249778294243,
+    'Sn122': 2.230763257260888e-05,
+    'Sn124': 2.789658616579101e-05,
+}
+ALLOYS["carbon_steel"] = {  # SMR Carbon Steel, 50 nuclides
+    'C12': 0.0010442103094126405,
+    'C13': 1.1697344995776637e-05,
+    'Mn55': 0.0006412591519223605,
+    'P31': 3.7913297334043665e-05,
+    'S32': 3.480801497243693e-05,
+    'S33': 2.742025443981405e-07,
+    'S34': 1.536752373542364e-06,
+    'S36': 5.339824353827618e-09,
+    'Si28': 0.000617015163486909,
+    'Si29': 3.1330269529323576e-05,
+    'Si30': 2.0653053682821572e-05,
+    'Ni58': 0.0004086181311418285,
+    'Ni60': 0.00015739897264761742,
+    'Ni61': 6.842024358597134e-06,
+    'Ni62': 2.1815367655114368e-05,
+    'Ni64': 5.555730998971823e-06,
+    'Cr50': 1.373827831539271e-05,
+    'Cr52': 0.00026492901252833927,
+    'Cr53': 3.004082318358793e-05,
+    'Cr54': 7.477796751321481e-06,
+    'Mo92': 4.4822291310606895e-05,
+    'Mo94': 2.810993160790809e-05,
+    'Mo95': 4.856742618745322e-05,
+    'Mo96': 5.1015226914058824e-05,
+    'Mo97': 2.9318533259312206e-05,
+    'Mo98': 7.432746922042984e-05,
+    'Mo100': 2.9814212142465947e-05,
+    'V50': 1.1526145240679119e-07,
+    'V51': 4.5989319455791894e-05,
+    'Nb93': 5.055917738603357e-06,
+    'Cu63': 0.00010223019587827225,
+    'Cu65': 4.56081209267397e-05,
+    'Ca40': 1.704268333890243e-05,
+    'Ca42': 1.1374564024217834e-07,
+    'Ca43': 2.3733634358428184e-08,
+    'Ca44': 3.6672860192375593e-07,
+    'Ca46': 7.032187772753565e-10,
+    'Ca48': 3.287547867637643e-08,
+    'B10': 2.5832795133853293e-06,
+    'B11': 1.0450421269107751e-05,
+    'Ti46': 1.214386179605987e-06,
+    'Ti47': 1.0951555387252844e-06,
+    'Ti48': 1.0851460531518844e-05,
+    'Ti49': 7.963429398385609e-07,
+    'Ti50': 7.624873257424189e-07,
+    'Al27': 4.352299802675485e-05,
+    'Fe54': 0.004743658379473851,
+    'Fe56': 0.07446529191498036,
+    'Fe57': 0.0017197283316076073,
+    'Fe58': 0.0002288642708527182,
+}
+
+# Moderator compositions, keyed by their number of nuclides
+water = {
+    'H1': 0.05129627050184732,
+    'O16': 0.024622209840886707,
+    'B10': 4.103701640147785e-05,
+}
+moderators = {len(water): water}
+for alloy in ALLOYS.values():
+    composition = dict(water)
+    for nuclide, density in alloy.items():
+        composition[nuclide] = composition.get(nuclide, 0.0) + DILUTION * density
+    moderators[len(composition)] = composition
+
+# Materials
+fuel = openmc.Material()
+fuel.add_nuclide('U235', 0.0001654509603995036)
+fuel.add_nuclide('U238', 0.022801089905717036)
+fuel.add_nuclide('O16', 0.04593308173223308)
+#
+moderator = openmc.Material()
+for nuclide, density in moderators[args.nuclides].items():
+    moderator.add_nuclide(nuclide, density)
+#
+materials = openmc.Materials([fuel, moderator])
+materials.export_to_xml()
+
+###############################################################################
+# Define problem geometry
+
+cylinder = openmc.ZCylinder(r=0.45720, name='Fuel OR')
+pitch = 1.25984
+box = openmc.model.RectangularPrism(pitch, pitch, boundary_type='reflective')
+#
+fuel_cell = openmc.Cell(fill=fuel, region=-cylinder)
+moderator_cell = openmc.Cell(fill=moderator, region=+cylinder & -box)
+#
+geometry = openmc.Geometry([fuel_cell, moderator_cell])
+geometry.export_to_xml()
+
+###############################################################################
+# Define problem settings
+
+settings = openmc.Settings()
+settings.run_mode = "fixed source"
+settings.batches = 30
+settings.particles = N
+settings.cutoff = {"time_neutron": 1.0}
+space = openmc.stats.Point()  # At the origin (0, 0, 0)
+energy = openmc.stats.delta_function(14.1e6)  # At 14.1 MeV
+settings.source = openmc.IndependentSource(space=space, energy=energy)
+settings.export_to_xml()
+
+###############################################################################
+# Define tallies
+
+# Create a mesh filter that can be used in a tally ("matched": on the time grid of the
+# MC/DC model, see parity.py)
+if args.tallies == "native":
+    time_filter = openmc.TimeFilter(np.insert(np.logspace(-8, 2, 50), 0, 0.0))
+else:
+    time_filter = openmc.TimeFilter(np.insert(np.logspace(-9, -4, 200), 0, 0.0))
+with library("MGXS-SHEM361") as data:
+    E = data["E"]
+energy_filter = openmc.EnergyFilter(E)
+
+# Now use the mesh filter in a tally and indicate what scores are desired
+tally = openmc.Tally(name="TD spectrum")
+tally.filters = [time_filter, energy_filter]
+tally.scores = ['flux']
+
+# Instantiate a Tallies collection and export to XML
+tallies = openmc.Tallies([tally])
+tallies.export_to_xml()
@@ -2,10 +2,12 @@ import numpy as np
 import mcdc
 import sys
 
+from suite.xsdata import library
+
 method = sys.argv[1]
-if method not in ["analog"]:
+if method not in ["analog", "implicit_capture", "weight_roulette", "population_control"]:
     print("[ERROR] Unsupported method: %s" % method)
-    exit()
+    exit(1)
 
 
 # =============================================================================
@@ -14,7 +16,7 @@ if method not in ["analog"]:
 # The infinite homogenous medium is modeled with reflecting slab
 
 # Load material data
-with np.load("MGXS-SHEM361.npz") as data:
+with library("MGXS-SHEM361") as data:
     SigmaC = data["SigmaC"] * 1.5  # /cm
     SigmaS = data["SigmaS"]
     SigmaF = data["SigmaF"]
@@ -56,13 +58,14 @@ mcdc.Source(
 )
 
 # =============================================================================
-# Set tally, setting, and run mcdc
+# Set tally, setting, technique, and run mcdc
 # =============================================================================
 
 # Tally
+time_grid = np.insert(np.logspace(-8, 1, 100), 0, 0.0)
 mcdc.TallyGlobal(
     scores=["flux"],
-    time=np.insert(np.logspace(-8, 1, 100), 0, 0.0),
+    time=time_grid,
     energy="all_groups",
 )
 
@@ -71,5 +74,18 @@ mcdc.settings.N_particle = 1000
 mcdc.settings.N_batch = 30
 mcdc.settings.active_bank_buffer = 10000
 
+# Technique
+if method == "analog":
+    pass
+elif method == "implicit_capture":
+    mcdc.simulation.implicit_capture()
+elif method == "weight_roulette":
+    mcdc.simulation.implicit_capture()
+    mcdc.simulation.weight_roulette(weight_threshold=0.25, weight_target=1.0)
+elif method == "population_control":
+    # Comb the population at every decade of the logarithmic tally time grid
+    mcdc.settings.set_time_census(time_grid[11:-1:11])
+    mcdc.simulation.population_control()
+
 # Run
 mcdc.run()
@@ -3,6 +3,8 @@ import numpy as np
 import h5py
 import sys
 
+from suite.xsdata import library
+
 N = int(sys.argv[1])
 
 # ===============================================================================
@@ -10,7 +12,7 @@ N = int(sys.argv[1])
 # ===============================================================================
 
 # Load material data
-with np.load("MGXS-SHEM361.npz") as data:
+with library("MGXS-SHEM361") as data:
     SigmaT = data["SigmaT"]
     SigmaC = data["SigmaC"]
     SigmaS = data["SigmaS"]
@@ -0,0 +1,84 @@
+import argparse
+import numpy as np
+import mcdc
+import sys
+
+from suite.xsdata import library
+
+method = sys.argv[1]
+if method not in ["analog"]:
+    print("[ERROR] Unsupported method: %s" % method)
+    exit(1)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--groups", type=int, default=361)
+args, unargs = parser.parse_known_args()
+
+
+# =============================================================================
+# Set model
+# =============================================================================
+# The shem361 infinite homogenous medium with the library collapsed into fewer
+# groups. The collapsed libraries are built from MGXS-SHEM361 on first use (see
+# suite/xsdata.py and suite/mgxs.py).
+
+# Load material data
+with library("MGXS-SHEM361-G%i" % args.groups) as data:
+    SigmaC = data["SigmaC"] * 1.5  # /cm
+    SigmaS = data["SigmaS"]
+    SigmaF = data["SigmaF"]
+    nu_p = data["nu_p"]
+    nu_d = data["nu_d"]
+    chi_p = data["chi_p"]
+    chi_d = data["chi_d"]
+    G = data["G"]
+    speed = data["v"]
+    lamd = data["lamd"]
+
+# Set material
+m = mcdc.MaterialMG(
+    capture=SigmaC,
+    scatter=SigmaS,
+    fission=SigmaF,
+    nu_p=nu_p,
+    chi_p=chi_p,
+    nu_d=nu_d,
+    chi_d=chi_d,
+    decay_rate=lamd,
+    speed=speed,
+)
+
+# Set surfaces
+s1 = mcdc.Surface.PlaneX(x=-1e10, boundary_condition="reflective")
+s2 = mcdc.Surface.PlaneX(x=1e10, boundary_condition="reflective")
+
+# Set cells
+c = mcdc.Cell(region=+s1 & -s2, fill=m)
+
+# =============================================================================
+# Set source
+# =============================================================================
+# At highest group
+
+mcdc.Source(
+    position=(0.0, 0.0, 0.0), isotropic=True, energy_group=np.array([[G - 1], [1.0]])
+)
+
+# =============================================================================
+# Set tally, setting, and run mcdc
+# =============================================================================
+
+# Tally
+mcdc.TallyGlobal(
+    scores=["flux"],
+    time=np.insert(np.logspace(-8, 1, 100), 0, 0.0),
+    energy="all_groups",
+)
+
+# Setting
+mcdc.settings.N_particle = 1000
+mcdc.settings.N_batch = 30
+mcdc.settings.active_bank_buffer = 10000
+
+# Run
+mcdc.run()
@@ -0,0 +1,53 @@
+import argparse
+import mcdc
+import numpy as np
+import sys
+
+method = sys.argv[1]
+if method not in ["analog"]:
+    print("[ERROR] Unsupported method: %s" % method)
+    exit(1)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--N_inactive", type=int, default=10)
+parser.add_argument("--N_active", type=int, default=20)
+args, unargs = parser.parse_known_args()
+
+# Materials and geometry of the SMR core (shared with smr/mcdc)
+from model import *
+
+# =============================================================================
+# Set initial fission source
+# =============================================================================
+# Uniform over the active core, 1 MeV
+
+xmax_core = 96.76637999999998
+mcdc.Source(
+    x=[-xmax_core, xmax_core],
+    y=[-xmax_core, xmax_core],
+    z=[config['bottom'], config['top']],
+    energy=1e6,
+    isotropic=True,
+)
+
+# =============================================================================
+# Set tally and parameter, and then run mcdc
+# =============================================================================
+
+# Tally: assembly-wise fission rate, 10 axial levels
+mesh = mcdc.MeshStructured(
+    x=np.linspace(-xmax_core, xmax_core, 10),
+    y=np.linspace(-xmax_core, xmax_core, 10),
+    z=np.linspace(config['bottom'], config['top'], 11),
+)
+mcdc.TallyMesh(mesh=mesh, scores=["fission"])
+
+# Setting
+mcdc.settings.N_particle = 100000
+mcdc.settings.active_bank_buffer = 10000
+mcdc.settings.set_eigenmode(
+    N_inactive=args.N_inactive, N_active=args.N_active, gyration_radius="all"
+)
+
+# Run
+mcdc.run()
@@ -0,0 +1 @@
+../../smr/mcdc/model.py
\ No newline at end of file
@@ -0,0 +1,75 @@
+import h5py
+import numpy as np
+import pytest
+
+from suite.instrument import TALLY_MIN_SIZE, TallyOutput
+
+
+# A tally group as MC/DC writes it: large mean and sdev datasets, a small grid
+MEAN = np.arange(2 * TALLY_MIN_SIZE, dtype=np.float64).reshape(2, TALLY_MIN_SIZE)
+SDEV = np.full((2, TALLY_MIN_SIZE), 0.5)
+GRID = np.linspace(0.0, 1.0, 11)
+
+
+def write_tally(file_name, mode):
+    """Write a tally group through the given tally output mode"""
+    with TallyOutput(mode), h5py.File(file_name, "w") as f:
+        f.create_dataset("tallies/mesh_tally_0/grid/t", data=GRID)
+        mean = f.create_dataset("tallies/mesh_tally_0/flux/mean", data=MEAN)
+        mean.attrs["unit"] = "cm^-2"
+        f["tallies/mesh_tally_0/flux/sdev"] = SDEV
+        # Created first, filled in afterwards
+        square = f.create_dataset("tallies/mesh_tally_0/flux/square", shape=MEAN.shape, dtype="f8")
+        square[...] = MEAN**2
+        square.attrs["unit"] = "cm^-4"
+
+
+def test_full(tmp_path):
+    file_name = tmp_path / "output.h5"
+    write_tally(file_name, "full")
+    with h5py.File(file_name, "r") as f:
+        assert np.array_equal(f["tallies/mesh_tally_0/flux/mean"][()], MEAN)
+        assert np.array_equal(f["tallies/mesh_tally_0/flux/sdev"][()], SDEV)
+        assert np.array_equal(f["tallies/mesh_tally_0/flux/square"][()], MEAN**2)
+        assert f["tallies/mesh_tally_0/flux/mean"].attrs["unit"] == "cm^-2"
+
+
+def test_compressed(tmp_path):
+    file_name = tmp_path / "output.h5"
+    write_tally(file_name, "compressed")
+    with h5py.File(file_name, "r") as f:
+        mean = f["tallies/mesh_tally_0/flux/mean"]
+        assert mean.compression == "gzip"
+        assert np.array_equal(mean[()], MEAN)
+        assert np.array_equal(f["tallies/mesh_tally_0/flux/square"][()], MEAN**2)
+        assert f["tallies/mesh_tally_0/grid/t"].compression is None
+
+
+def test_summary(tmp_path):
+    file_name = tmp_path / "output.h5"
+    write_tally(file_name, "summary")
+    with h5py.File(file_name, "r") as f:
+        mean = f["tallies/mesh_tally_0/flux/mean"]
+        assert mean[()] == pytest.approx(np.sum(MEAN))
+        assert tuple(mean.attrs["shape"]) == MEAN.shape
+        assert mean.attrs["max"] == np.max(MEAN)
+        assert mean.attrs["unit"] == "cm^-2"
+        sdev = f["tallies/mesh_tally_0/flux/sdev"]
+        assert sdev[()] == pytest.approx(np.sqrt(np.sum(SDEV**2)))
+        # Datasets filled in after their creation are written as they are
+        assert np.array_equal(f["tallies/mesh_tally_0/flux/square"][()], MEAN**2)
+        assert np.array_equal(f["tallies/mesh_tally_0/grid/t"][()], GRID)
+
+
+def test_none(tmp_path):
+    file_name = tmp_path / "output.h5"
+    write_tally(file_name, "none")
+    with h5py.File(file_name, "r") as f:
+        assert "flux" not in f["tallies/mesh_tally_0"]
+        assert np.array_equal(f["tallies/mesh_tally_0/grid/t"][()], GRID)
+
+
+def test_restored(tmp_path):
+    create_dataset = h5py.Group.create_dataset
+    write_tally(tmp_path / "output.h5", "summary")
+    assert h5py.Group.create_dataset is create_dataset
@@ -0,0 +1,105 @@
+import h5py
+import numpy as np
+import os
+import pickle
+import pytest
+import subprocess
+import sys
+import yaml
+
+pytest.importorskip("mcdc")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A small model; every execution of the input is counted in "executed"
+INPUT = """
+import numpy as np
+import mcdc
+
+with open("executed", "a") as f:
+    f.write("input.py\\n")
+
+material = mcdc.MaterialMG(capture=np.array([1.0]))
+s1 = mcdc.Surface.PlaneX(x=0.0, boundary_condition="vacuum")
+s2 = mcdc.Surface.PlaneX(x=2.0, boundary_condition="vacuum")
+cell = mcdc.Cell(region=+s1 & -s2, fill=material)
+mcdc.Source(position=[1.0, 0.0, 0.0], isotropic=True, energy_group=0)
+# The cell tally (mcdc.Tally in the MC/DC versions without TallyCell)
+TallyCell = mcdc.TallyCell if hasattr(mcdc, "TallyCell") else mcdc.Tally
+TallyCell(cell=cell, scores=["flux"])
+mcdc.settings.N_batch = 2
+mcdc.run()
+"""
+
+
+def run(directory, output, snapshot=True):
+    """Run the input through the run wrapper; returns the run record"""
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [ROOT] + [path for path in [os.environ.get("PYTHONPATH")] if path]
+    )
+    environment["MCDC_SUITE_SNAPSHOTS"] = str(directory / "snapshots")
+    command = [sys.executable, "-m", "suite.run"] + (["--snapshot"] if snapshot else [])
+    command += ["input.py", "--mode=python", "--N_particle=50", "--output=%s" % output]
+    command += ["--no-progress_bar"]
+    result = subprocess.run(command, cwd=directory, env=environment, capture_output=True)
+    assert result.returncode == 0, result.stderr.decode()
+    with open(directory / ("%s-run.yaml" % output), "r") as f:
+        return yaml.safe_load(f)
+
+
+def executions(directory):
+    with open(directory / "executed", "r") as f:
+        return len(f.readlines())
+
+
+def tallies(file_name):
+    result = {}
+    with h5py.File(file_name, "r") as f:
+        f["tallies"].visititems(
+            lambda name, item: result.update({name: item[()]})
+            if isinstance(item, h5py.Dataset)
+            else None
+        )
+    return result
+
+
+@pytest.fixture
+def directory(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    return tmp_path
+
+
+def test_round_trip(directory):
+    # The first run executes the input and saves its snapshot
+    record = run(directory, "output_1")
+    assert record["snapshot"]["status"] == "saved"
+    assert executions(directory) == 1
+
+    # The next ones restore it without executing the input, to the same results
+    record = run(directory, "output_2")
+    assert record["snapshot"]["status"] == "loaded"
+    assert executions(directory) == 1
+    run(directory, "output_3", snapshot=False)
+    assert executions(directory) == 2
+    restored, executed = tallies(directory / "output_2.h5"), tallies(directory / "output_3.h5")
+    assert len(executed) > 0
+    for name in executed:
+        assert np.array_equal(restored[name], executed[name])
+
+
+def test_mismatch(directory):
+    run(directory, "output_1")
+    (file_name,) = (directory / "snapshots").glob("*.pkl")
+    with open(file_name, "rb") as f:
+        snapshot = pickle.load(f)
+    snapshot["digest"] = "0" * 64
+    with open(file_name, "wb") as f:
+        pickle.dump(snapshot, f)
+
+    # The snapshot is not used: the input is executed, and its snapshot saved again
+    record = run(directory, "output_2")
+    assert record["snapshot"]["status"] == "saved"
+    assert "fallback" in record["snapshot"]
+    assert executions(directory) == 2
+    assert run(directory, "output_3")["snapshot"]["status"] == "loaded"